@@ -4,6 +4,9 @@
 import os
 import json
 import time
+from src.log import get_logger
+
+log = get_logger("config")
 
 class Config:
     def __init__(self):
@@ -12,7 +15,25 @@ class Config:
             "openai_api_key": "",
             "first_run": True,
             "last_pet_type": None,
-            "last_pet_name": None
+            "last_pet_name": None,
+            "display_backend": "sdl",
+            "framebuffer_device": "/dev/fb1",
+            "font_backend": "ttf",
+            "ai_backend": "openai",
+            "ai_backend_url": "",
+            "record_session": "",
+            "idle_dim_timeout": 60,
+            "idle_off_timeout": 180,
+            "thermal_limit": 70.0,
+            "cpu_limit": 0.85,
+            "sprite_format": "alpha",
+            "mirror_port": 0,
+            "sync_url": "",
+            "log_level": "info",
+            "log_levels": {},
+            "log_file": "",
+            "logical_resolution": 0,
+            "present_thread": False
         }
         self.config = self.default_config.copy()
         self.load()
@@ -28,7 +49,7 @@ class Config:
                         if key in self.config:
                             self.config[key] = value
         except Exception as e:
-            print(f"Error loading config: {e}")
+            log.error("Error loading config: %s", e)
             # Use default config if loading fails
             self.config = self.default_config.copy()
             
@@ -38,7 +59,7 @@ class Config:
             with open(self.config_path, 'w') as f:
                 json.dump(self.config, f)
         except Exception as e:
-            print(f"Error saving config: {e}")
+            log.error("Error saving config: %s", e)
             
     def get(self, key, default=None):
         """Get a configuration value"""
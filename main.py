@@ -13,103 +13,178 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import game modules
 from src.constants import *
 from src.display import Display
+from src.framebuffer_display import FramebufferDisplay
+from src.indexed_sprites import set_sprite_format
 from src.input import InputHandler
+from src.power import Backlight, PowerManager
 from src.ai_integration import AIHandler
+from src.ai_backends import create_backend
+from src.instrumentation import StartupTimer, report_gauges
+from src.governor import Governor
+from src.mirror import ScreenMirror
+from src.pet_sync import PetSyncAgent
+from src.presenter import FramePresenter
+from src.latency import LatencyTracker
+from src.session_recording import SessionRecorder
+from src import clock
+from src.log import get_logger, configure_logging, install_crash_handler, dump_log, flush_log
 from config import Config
-from src.pet import Pet
-from src.screens import ScreenType
-from src.screens.adoption import AdoptionScreen
-from src.screens.main_screen import MainScreen
-from src.screens.stats_screen import StatsScreen
-from src.screens.conversation import ConversationScreen
-from src.screens.game_over import GameOverScreen
+from src.game import Game
+
+log = get_logger("main")
 
 def main():
-    print("Starting MalinaPet...")
+    # Crashes during startup, before the main loop's try, are logged and dumped too
+    install_crash_handler()
+    log.info("Starting MalinaPet...")
+    startup = StartupTimer()
     
     # Initialize configuration
-    config = Config()
+    with startup.stage("config"):
+        config = Config()
+        configure_logging(config.get("log_level", LOG_LEVEL), config.get("log_levels"),
+                          config.get("log_file"))
+    
+    # Optionally record input and random seeds for replays (before anything uses random)
+    recorder = None
+    if config.get("record_session"):
+        recorder = SessionRecorder(config.get("record_session"))
+        log.info("Recording session to %s", config.get("record_session"))
     
     # Initialize display
-    display = Display()
-    screen = display.initialize()
+    with startup.stage("display"):
+        font_backend = config.get("font_backend", FONT_BACKEND_TTF)
+        display = None
+        if config.get("display_backend") == DISPLAY_BACKEND_FRAMEBUFFER:
+            display = FramebufferDisplay(config.get("framebuffer_device", FRAMEBUFFER_DEVICE), font_backend)
+            if not display.is_supported():
+                log.warning("Falling back to the SDL display")
+                display = None
+        if display is None:
+            display = Display(font_backend)
+        screen = display.initialize()
+        # Optionally lay out and draw at e.g. 128x128 and scale up to a larger panel
+        if config.get("logical_resolution"):
+            size = config.get("logical_resolution")
+            display.use_logical_size((size, size))
+        set_sprite_format(config.get("sprite_format", SPRITE_FORMAT_ALPHA))
+    
+    # Optionally push frames to the panel from a separate thread (helps slow SPI panels)
+    presenter = None
+    if config.get("present_thread"):
+        if display.present_thread_safe:
+            presenter = FramePresenter(display)
+            presenter.start()
+        else:
+            log.warning("present_thread needs the framebuffer display, presenting on the main thread")
+    
+    # Optionally stream the screen to a viewer for support and QA (0 = off)
+    mirror = None
+    if config.get("mirror_port"):
+        mirror = ScreenMirror(port=config.get("mirror_port"))
+        mirror.start()
+        display.frame_listeners.append(mirror.capture)
+    
+    # Warm up asset files in the background while the rest of startup runs
+    display.prefetch_assets()
     
     # Initialize input handler
-    input_handler = InputHandler()
+    with startup.stage("input"):
+        input_handler = InputHandler()
+        input_handler.recorder = recorder
+        # Press-to-present latency per screen and button (reported with the gauges)
+        input_handler.latency = display.latency = LatencyTracker().register()
+        power = PowerManager(display, input_handler, Backlight(),
+                             config.get("idle_dim_timeout", IDLE_DIM_TIMEOUT),
+                             config.get("idle_off_timeout", IDLE_OFF_TIMEOUT))
+    
+    # Initialize AI handler (the connection check runs in the background)
+    with startup.stage("ai handler"):
+        api_key = config.get("openai_api_key", "")
+        backend = create_backend(config.get("ai_backend", AI_BACKEND_OPENAI), api_key,
+                                 config.get("ai_backend_url", ""))
+        ai_handler = AIHandler(api_key, backend)
+        ai_handler.recorder = recorder
+    
+    # Trade frame rate and AI concurrency for heat when the Pi runs hot or busy
+    governor = Governor(temp_limit=config.get("thermal_limit", GOVERNOR_TEMP_LIMIT),
+                        cpu_limit=config.get("cpu_limit", GOVERNOR_CPU_LIMIT))
+    governor.apply(display, ai_handler)
     
-    # Initialize AI handler
-    api_key = config.get("openai_api_key", "")
-    ai_handler = AIHandler(api_key)
+    # Optionally ship pet state changes to a collector in the background
+    sync_agent = None
+    if config.get("sync_url"):
+        sync_agent = PetSyncAgent(config.get("sync_url"))
+        sync_agent.start()
     
     # Game state
     running = True
-    current_screen_type = ScreenType.ADOPTION
-    pet = None
-    current_screen = None
+    game = Game(display, input_handler, ai_handler)
     
     # Create assets directory if it doesn't exist
-    os.makedirs(ASSETS_PATH, exist_ok=True)
-    os.makedirs(PETS_PATH, exist_ok=True)
-    os.makedirs(ICONS_PATH, exist_ok=True)
-    os.makedirs(INDICATORS_PATH, exist_ok=True)
-    os.makedirs(MESS_PATH, exist_ok=True)
-    os.makedirs(GAME_OVER_PATH, exist_ok=True)
-    os.makedirs(FONTS_PATH, exist_ok=True)
+    with startup.stage("asset dirs"):
+        os.makedirs(ASSETS_PATH, exist_ok=True)
+        os.makedirs(PETS_PATH, exist_ok=True)
+        os.makedirs(ICONS_PATH, exist_ok=True)
+        os.makedirs(INDICATORS_PATH, exist_ok=True)
+        os.makedirs(MESS_PATH, exist_ok=True)
+        os.makedirs(GAME_OVER_PATH, exist_ok=True)
+        os.makedirs(FONTS_PATH, exist_ok=True)
     
     # Main game loop
     try:
         while running:
             # Process inputs and events
+            if recorder is not None:
+                recorder.frame(clock.now())
             running = input_handler.update()
+            power.update()
+            if governor.update():
+                governor.apply(display, ai_handler)
             
-            # Initialize/switch screens if necessary
-            if current_screen is None:
-                if current_screen_type == ScreenType.ADOPTION:
-                    current_screen = AdoptionScreen(display, input_handler, ai_handler)
-                elif current_screen_type == ScreenType.MAIN:
-                    current_screen = MainScreen(display, input_handler, pet)
-                elif current_screen_type == ScreenType.STATS:
-                    current_screen = StatsScreen(display, input_handler, pet)
-                elif current_screen_type == ScreenType.CONVERSATION:
-                    current_screen = ConversationScreen(display, input_handler, pet, ai_handler)
-                elif current_screen_type == ScreenType.GAME_OVER:
-                    current_screen = GameOverScreen(display, input_handler, pet)
+            # With the backlight off only the simulation runs, and the CPU
+            # sleeps until a button is pressed or the pet's next timer is due
+            if power.is_off():
+                game.step(draw=False)
+                power.sleep(game.next_deadline())
+                continue
             
-            # Update current screen
-            result = current_screen.update()
+            # Update and draw the current screen, switching screens as needed
+            if game.step():
+                # Report boot time once the first frame has been presented
+                if not startup.reported:
+                    startup.mark("first frame")
+                    startup.report()
             
-            # Handle screen transitions
-            if result is not None:
-                next_screen_type, data = result
-                
-                if next_screen_type == ScreenType.ADOPTION:
-                    # Reset pet
-                    pet = None
-                elif next_screen_type == ScreenType.MAIN:
-                    # If coming from adoption screen, set the new pet
-                    if current_screen_type == ScreenType.ADOPTION and data is not None:
-                        pet = data
-                        
-                # Switch to the new screen
-                current_screen_type = next_screen_type
-                current_screen = None
-            else:
-                # Draw current screen
-                current_screen.draw()
+            if sync_agent is not None and game.pet is not None:
+                sync_agent.capture(game.pet)
             
             # Small delay to prevent maxing out CPU
             time.sleep(0.01)
             
     except KeyboardInterrupt:
-        print("Game terminated by user")
+        log.info("Game terminated by user")
     except Exception as e:
-        print(f"Error: {e}")
+        log.exception("Error: %s", e)
+        dump_log()
     finally:
         # Clean up
-        print("Cleaning up...")
+        log.info("Cleaning up...")
+        report_gauges()
+        power.cleanup()
         input_handler.cleanup()
+        if presenter is not None:
+            presenter.stop()
+        display.cleanup()
+        if mirror is not None:
+            mirror.stop()
+        if sync_agent is not None:
+            sync_agent.stop()
+        if recorder is not None:
+            recorder.close()
         pygame.quit()
-        print("MalinaPet terminated")
+        log.info("MalinaPet terminated")
+        flush_log()
 
 if __name__ == "__main__":
     main()
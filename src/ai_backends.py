@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# MalinaPet - AI service backends (chat, image, health)
+
+import json
+import urllib.request
+from src.constants import *
+
+
+class AIBackend:
+    """Interface the AIHandler talks to, so the AI service can be swapped out"""
+
+    name = "none"
+    last_usage = 0  # Tokens reported for the last call (0 if unknown)
+
+    def is_configured(self):
+        """Check if the backend has what it needs to make requests"""
+        return False
+
+    def chat(self, messages, max_tokens):
+        """Send chat messages and return the reply text"""
+        raise NotImplementedError
+
+    def chat_stream(self, messages, max_tokens):
+        """Send chat messages and yield the reply text as it arrives"""
+        yield self.chat(messages, max_tokens)
+
+    def image(self, prompt):
+        """Generate an image and return its encoded bytes"""
+        raise NotImplementedError
+
+    def health(self):
+        """Check that the service is reachable"""
+        raise NotImplementedError
+
+
+class OpenAIBackend(AIBackend):
+    name = "openai"
+
+    def __init__(self, api_key, model=DEFAULT_AI_MODEL, image_model=DEFAULT_IMAGE_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self.image_model = image_model
+        self.client = None
+
+    def get_client(self):
+        """Create the OpenAI client on first use (importing openai is slow)"""
+        if self.client is None:
+            from openai import OpenAI
+            self.client = OpenAI(api_key=self.api_key)
+        return self.client
+
+    def is_configured(self):
+        """Check if an API key is set"""
+        return bool(self.api_key)
+
+    def chat(self, messages, max_tokens):
+        """Send chat messages and return the reply text"""
+        response = self.get_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens
+        )
+        self.last_usage = response.usage.total_tokens if response.usage else 0
+        return response.choices[0].message.content
+
+    def chat_stream(self, messages, max_tokens):
+        """Send chat messages and yield the reply text as it arrives"""
+        stream = self.get_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def image(self, prompt):
+        """Generate an image with DALL-E and download it"""
+        response = self.get_client().images.generate(
+            model=self.image_model,
+            prompt=prompt,
+            n=1,  # Generate 1 image
+            size="1024x1024",  # Standard size
+            response_format="url"  # Get URL to download
+        )
+
+        import requests
+        return requests.get(response.data[0].url).content
+
+    def health(self):
+        """Check the connection with a tiny chat request"""
+        self.chat([
+            {"role": "system", "content": "Just respond with 'OK' to test the connection."},
+            {"role": "user", "content": "Test connection"}
+        ], 10)
+        return True
+
+
+class HTTPBackend(AIBackend):
+    """Talks to an OpenAI-compatible HTTP endpoint using only the standard library.
+
+    Used with the local stand-in server (src/ai_stub_server.py) so the AI paths
+    can be exercised without the live service or the openai package.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url, api_key="", model=DEFAULT_AI_MODEL, image_model=DEFAULT_IMAGE_MODEL, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.image_model = image_model
+        self.timeout = timeout
+
+    def open(self, path, payload=None):
+        """Start a request and return the open response"""
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(self.base_url + path, data=data)
+        request.add_header("Content-Type", "application/json")
+        if self.api_key:
+            request.add_header("Authorization", f"Bearer {self.api_key}")
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def request(self, path, payload=None):
+        """Make a request and return the response body"""
+        with self.open(path, payload) as response:
+            return response.read()
+
+    def is_configured(self):
+        """Check if an endpoint is set"""
+        return bool(self.base_url)
+
+    def chat(self, messages, max_tokens):
+        """Send chat messages and return the reply text"""
+        body = self.request("/v1/chat/completions", {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens
+        })
+        reply = json.loads(body)
+        self.last_usage = reply.get("usage", {}).get("total_tokens", 0)
+        return reply["choices"][0]["message"]["content"]
+
+    def chat_stream(self, messages, max_tokens):
+        """Send chat messages and yield the reply text from server-sent events"""
+        with self.open("/v1/chat/completions", {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "stream": True
+        }) as response:
+            for line in response:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
+    def image(self, prompt):
+        """Generate an image and download it"""
+        body = self.request("/v1/images/generations", {
+            "model": self.image_model,
+            "prompt": prompt,
+            "n": 1,
+            "size": "1024x1024",
+            "response_format": "url"
+        })
+        url = json.loads(body)["data"][0]["url"]
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return response.read()
+
+    def health(self):
+        """Check the endpoint's health route"""
+        self.request("/health")
+        return True
+
+
+def create_backend(name, api_key="", url=""):
+    """Create the backend selected in the config"""
+    if name == AI_BACKEND_HTTP:
+        return HTTPBackend(url or AI_STUB_URL, api_key)
+    return OpenAIBackend(api_key)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# MalinaPet - Rate limiting, daily budgets and usage accounting for AI calls
+
+import os
+import json
+import time
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from src.constants import *
+from src.log import get_logger
+
+log = get_logger("ai")
+
+AI_ENDPOINT_CHAT = "chat"
+AI_ENDPOINT_IMAGE = "image"
+AI_ENDPOINT_HEALTH = "health"
+
+
+class AIBudgetExceeded(Exception):
+    """Raised instead of making an AI call that the budget does not allow"""
+
+
+def estimate_tokens(text):
+    """Roughly estimate the token count of a text (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def take(self, amount=1):
+        """Take tokens if enough are available"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+
+class EndpointStats:
+    """Counters plus a fixed-size window of recent latencies for one endpoint"""
+
+    def __init__(self, window=AI_USAGE_WINDOW):
+        self.calls = 0
+        self.errors = 0
+        self.tokens = 0
+        self.latencies = deque(maxlen=window)
+
+    def percentile(self, fraction):
+        """Get a latency percentile over the recent window"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        """Get the stats as a dict"""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "tokens": self.tokens,
+            "p50": round(self.percentile(0.5), 3),
+            "p90": round(self.percentile(0.9), 3)
+        }
+
+
+class AIBudget:
+    def __init__(self, path=AI_USAGE_PATH, limited=True):
+        self.path = path
+        self.limited = limited  # False only accounts usage (tools and load tests)
+        self.lock = threading.Lock()
+        chat_bucket = TokenBucket(AI_CHAT_PER_MINUTE / 60, AI_CHAT_BURST)
+        self.buckets = {
+            AI_ENDPOINT_CHAT: chat_bucket,
+            AI_ENDPOINT_IMAGE: TokenBucket(AI_IMAGES_PER_HOUR / 3600, AI_IMAGE_BURST),
+            # Connection checks can be chat requests, so they share the chat rate
+            AI_ENDPOINT_HEALTH: chat_bucket
+        }
+        self.stats = {endpoint: EndpointStats() for endpoint in self.buckets}
+        self.degraded_until = 0
+        self.daily = self.load_daily()
+
+        # Concurrent requests, limited further by the thermal governor
+        self.max_workers = AI_MAX_WORKERS
+        self.active_workers = 0
+        self.started_workers = 0  # Total slots taken, so callers can tell if a request ran
+
+    def today(self):
+        return time.strftime("%Y-%m-%d")
+
+    def load_daily(self):
+        """Load today's token and image usage"""
+        try:
+            with open(self.path, 'r') as f:
+                daily = json.load(f)
+            if daily.get("date") == self.today():
+                return daily
+        except (OSError, ValueError):
+            pass
+        return {"date": self.today(), "tokens": 0, "images": 0}
+
+    def save_daily(self):
+        """Persist today's usage so restarts don't reset the budget"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self.daily, f)
+        except Exception as e:
+            log.error("Error saving AI usage: %s", e)
+
+    def _check(self, endpoint):
+        """Take a rate limit token for a call, raising AIBudgetExceeded if it isn't allowed (lock held)"""
+        if self.daily["date"] != self.today():
+            self.daily = {"date": self.today(), "tokens": 0, "images": 0}
+
+        if not self.limited:
+            return
+        if time.time() < self.degraded_until:
+            raise AIBudgetExceeded("AI latency too high, using offline content")
+        if self.daily["tokens"] >= AI_DAILY_TOKEN_BUDGET:
+            raise AIBudgetExceeded("Daily AI token budget used up")
+        if endpoint == AI_ENDPOINT_IMAGE and self.daily["images"] >= AI_DAILY_IMAGE_BUDGET:
+            raise AIBudgetExceeded("Daily AI image budget used up")
+        if not self.buckets[endpoint].take():
+            raise AIBudgetExceeded(f"AI {endpoint} rate limit reached")
+
+    @contextmanager
+    def worker(self, endpoint):
+        """Hold a concurrent request slot for a call, raising AIBudgetExceeded if none is free or the call isn't allowed"""
+        with self.lock:
+            # Only spend a rate limit token once the call is sure to get a slot
+            if self.active_workers >= self.max_workers:
+                raise AIBudgetExceeded("AI worker limit reached")
+            self._check(endpoint)
+            self.active_workers += 1
+            self.started_workers += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.active_workers -= 1
+
+    def record(self, endpoint, latency, tokens=0, error=False):
+        """Record the outcome of a call"""
+        with self.lock:
+            stats = self.stats[endpoint]
+            stats.calls += 1
+            stats.tokens += tokens
+            stats.latencies.append(latency)
+            if error:
+                stats.errors += 1
+
+            self.daily["tokens"] += tokens
+            if endpoint == AI_ENDPOINT_IMAGE and not error:
+                self.daily["images"] += 1
+            self.save_daily()
+
+            # Back off to offline content for a while if the service got slow
+            if self.limited and len(stats.latencies) >= 3 and stats.percentile(0.9) > AI_LATENCY_LIMIT:
+                log.warning("AI %s p90 latency %.1fs, degrading to offline content", endpoint, stats.percentile(0.9))
+                self.degraded_until = time.time() + AI_DEGRADED_COOLDOWN
+                stats.latencies.clear()
+
+    def summary(self):
+        """Get usage per endpoint and for today"""
+        with self.lock:
+            return {
+                "daily": dict(self.daily),
+                "degraded": time.time() < self.degraded_until,
+                "workers": f"{self.active_workers}/{self.max_workers}",
+                "endpoints": {endpoint: stats.summary() for endpoint, stats in self.stats.items()}
+            }
+
+
+def unlimited_budget():
+    """Get a budget for tools that never throttles and keeps its usage out of the real file"""
+    return AIBudget(os.path.join(tempfile.gettempdir(), f"malinapet_ai_usage_{os.getpid()}.json"), limited=False)
@@ -4,29 +4,103 @@
 import os
 import time
 import random
-import openai
+import threading
+from contextlib import closing
 from src.constants import *
+from src.content_corpus import ContentCorpus
+from src.ai_backends import OpenAIBackend
+from src.ai_budget import (AIBudget, AIBudgetExceeded, AI_ENDPOINT_CHAT, AI_ENDPOINT_IMAGE,
+                           AI_ENDPOINT_HEALTH, estimate_tokens)
+from src.session_recording import next_seed
+from src.log import get_logger
+
+log = get_logger("ai")
+
+def filter_ascii(text):
+    """Drop non-ASCII characters the fonts can't draw"""
+    return ''.join(char for char in text if ord(char) < 128)
+
+
+class TextStream:
+    """Collects text chunks produced on a background thread for the UI to poll"""
+
+    def __init__(self, chunks, recorder=None):
+        self.recorder = recorder
+        self.lock = threading.Lock()
+        self.pending = []
+        self.text = ""
+        self.cancelled = False
+        self.start_time = time.time()
+        self.first_chunk_time = None
+        self.thread = threading.Thread(target=self._run, args=(chunks,), name="ai-stream", daemon=True)
+        self.thread.start()
+
+    def _run(self, chunks):
+        stream = chunks()
+        try:
+            for chunk in stream:
+                if self.cancelled:
+                    break
+                with self.lock:
+                    if self.first_chunk_time is None:
+                        self.first_chunk_time = time.time()
+                    self.pending.append(chunk)
+        except Exception as e:
+            log.error("Error in text stream: %s", e)
+        finally:
+            # Ends a cancelled request, freeing its connection and worker slot
+            stream.close()
+
+    def cancel(self):
+        """Stop the request at the next chunk, e.g. when the screen showing it is left"""
+        self.cancelled = True
+
+    def read(self):
+        """Get the text that arrived since the last read"""
+        with self.lock:
+            if not self.pending:
+                return ""
+            new_text = ''.join(self.pending)
+            self.pending = []
+        self.text += new_text
+        # Record the text on the frame it was shown in, so a replay shows it there too
+        if self.recorder is not None:
+            self.recorder.ai_result("text", new_text)
+        return new_text
+
 
 class AIHandler:
-    def __init__(self, api_key=None):
-        # Initialize OpenAI API
+    def __init__(self, api_key=None, backend=None, budget=None):
+        # Initialize the AI service backend (OpenAI unless another is given)
         self.api_key = api_key
+        self.backend = backend if backend is not None else OpenAIBackend(api_key)
         self.is_available = False
         self.last_check_time = 0
-        self.check_interval = 60  # Check internet connection every 60 seconds
 
-        # Import required modules for image generation
-        try:
-            import requests
-            from PIL import Image
-            self.requests = requests
-            self.Image = Image
-            self.image_libs_available = True
-        except ImportError:
-            print("Warning: requests and/or PIL libraries not available. Image generation will be disabled.")
-            self.image_libs_available = False
-
-        # Predefined offline responses
+        # Rate limits, daily budgets and usage accounting for API calls
+        self.budget = budget if budget is not None else AIBudget()
+        self.check_interval = 60  # Check the connection at most every 60 seconds (also after a failure)
+
+        # Image generation modules are imported on first use (see _load_image_libs)
+        self.requests = None
+        self.Image = None
+        self._image_libs_checked = False
+        self._image_libs_available = False
+
+        # Background connectivity check
+        self.ready = threading.Event()
+        self._init_thread = None
+
+        # Offline names, pet types and content draw from their own generators,
+        # so they don't disturb the game's random state (content is drawn on
+        # the ai-stream thread)
+        self.rng = random.Random(next_seed())
+        self.content = ContentCorpus(rng=random.Random(next_seed()))
+
+        # Optional SessionRecorder that logs the AI results the game receives
+        self.recorder = None
+
+        # Predefined offline responses, used if the corpus is missing
         self.offline_facts = [
             "The world's oldest known pet was a tortoise that lived to be 188 years old!",
             "Rabbits can't vomit.",
@@ -57,21 +131,73 @@ class AIHandler:
         # Try to initialize OpenAI API
         self.initialize()
 
-    def initialize(self):
+    @property
+    def image_libs_available(self):
+        """Check whether requests and PIL can be used for image generation"""
+        return self._load_image_libs()
+
+    def _load_image_libs(self):
+        """Import the image generation modules the first time they are needed"""
+        if not self._image_libs_checked:
+            self._image_libs_checked = True
+            try:
+                import requests
+                from PIL import Image
+                self.requests = requests
+                self.Image = Image
+                self._image_libs_available = True
+            except ImportError:
+                log.warning("requests and/or PIL libraries not available. Image generation will be disabled.")
+                self._image_libs_available = False
+        return self._image_libs_available
+
+    def initialize(self, background=True):
+        """Start the API connection check, in a background thread by default"""
+        self.ready.clear()
+        if background:
+            self._init_thread = threading.Thread(target=self._initialize, name="ai-init", daemon=True)
+            self._init_thread.start()
+        else:
+            self._initialize()
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the initial connection check has finished"""
+        return self.ready.wait(timeout)
+
+    def _initialize(self):
         """Initialize the OpenAI API with the provided key"""
-        if self.api_key:
+        try:
+            self._initialize_api()
+        finally:
+            self.ready.set()
+
+    def _initialize_api(self):
+        """Test the AI backend connection"""
+        if self.backend.is_configured():
             try:
-                # We'll initialize the client when needed
-                # in each API call rather than setting a global
-                print("API key found, will test connection")
+                # The backend creates its client on first use
+                log.info("AI backend %s configured, will test connection", self.backend.name)
                 self.is_available = self._check_connection()
             except Exception as e:
-                print(f"Failed to initialize API: {e}")
+                log.error("Failed to initialize API: %s", e)
                 self.is_available = False
         else:
-            print("No API key provided, AI features disabled")
+            log.info("No API key provided, AI features disabled")
             self.is_available = False
 
+    def available(self):
+        """Check if AI features can be offered, as the UI sees it (recorded for replays)"""
+        available = self.is_available
+        if self.recorder is not None:
+            self.recorder.ai_available(available)
+        return available
+
+    def _recorded(self, kind, result):
+        """Record an AI result handed to the game, so a replay gets the same one"""
+        if self.recorder is not None:
+            self.recorder.ai_result(kind, result)
+        return result
+
     def _check_connection(self):
         """Check if the internet and API connection is available"""
         current_time = time.time()
@@ -83,142 +209,214 @@ class AIHandler:
         self.last_check_time = current_time
 
         try:
-            # Try a simple API request to check connection with new API
-            from openai import OpenAI
-
-            # Create a client instance
-            client = OpenAI(api_key=self.api_key)
-
             # Test connection with a simple request
-            response = client.chat.completions.create(
-                model=DEFAULT_AI_MODEL,
-                messages=[
-                    {"role": "system", "content": "Just respond with 'OK' to test the connection."},
-                    {"role": "user", "content": "Test connection"}
-                ],
-                max_tokens=10
-            )
-            print("API connection successful")
-            return True
+            self._budgeted_health()
+            log.info("API connection successful")
+            self.is_available = True
+        except AIBudgetExceeded as e:
+            # Not checked this time; keep the last result until the next check
+            log.info("Skipping API connection check: %s", e)
         except Exception as e:
-            print(f"API connection failed: {e}")
-            return False
+            log.warning("API connection failed: %s", e)
+            self.is_available = False
+        return self.is_available
+
+    def _use_ai(self):
+        """Check if an AI call should be tried, probing a failed service again after check_interval"""
+        return self.ready.is_set() and self.backend.is_configured() and self._check_connection()
+
+    def _mark_unavailable(self):
+        """Fall back to offline content until the next connection check is due"""
+        self.is_available = False
+        self.last_check_time = time.time()
+
+    def _budgeted_health(self):
+        """Make a connection check through the rate limiter and record its cost"""
+        start = time.time()
+        try:
+            with self.budget.worker(AI_ENDPOINT_HEALTH):
+                self.backend.last_usage = 0
+                self.backend.health()
+        except AIBudgetExceeded:
+            raise
+        except Exception:
+            self.budget.record(AI_ENDPOINT_HEALTH, time.time() - start, error=True)
+            raise
+        self.budget.record(AI_ENDPOINT_HEALTH, time.time() - start, self.backend.last_usage)
+
+    def _budgeted_chat(self, messages, max_tokens):
+        """Make a chat call through the rate limiter and record its cost"""
+        start = time.time()
+        try:
+            with self.budget.worker(AI_ENDPOINT_CHAT):
+                reply = self.backend.chat(messages, max_tokens)
+        except AIBudgetExceeded:
+            raise
+        except Exception:
+            self.budget.record(AI_ENDPOINT_CHAT, time.time() - start, error=True)
+            raise
+        tokens = self.backend.last_usage or estimate_tokens(''.join(m["content"] for m in messages) + reply)
+        self.budget.record(AI_ENDPOINT_CHAT, time.time() - start, tokens)
+        return reply
+
+    def _budgeted_image(self, prompt):
+        """Make an image call through the rate limiter and record it"""
+        start = time.time()
+        try:
+            with self.budget.worker(AI_ENDPOINT_IMAGE):
+                image_data = self.backend.image(prompt)
+        except AIBudgetExceeded:
+            raise
+        except Exception:
+            self.budget.record(AI_ENDPOINT_IMAGE, time.time() - start, error=True)
+            raise
+        self.budget.record(AI_ENDPOINT_IMAGE, time.time() - start, estimate_tokens(prompt))
+        return image_data
 
     def generate_pet_name(self, pet_type):
         """Generate a pet name using AI or fallback to predefined names"""
-        if self.is_available and self._check_connection():
-            try:
-                # Import client here to avoid issues if not installed
-                from openai import OpenAI
-
-                # Create a client instance
-                client = OpenAI(api_key=self.api_key)
+        return self._recorded("name", self._generate_pet_name(pet_type))
 
-                # Generate name with the new API
-                response = client.chat.completions.create(
-                    model=DEFAULT_AI_MODEL,
-                    messages=[
+    def _generate_pet_name(self, pet_type):
+        if self._use_ai():
+            try:
+                # Generate name with the backend
+                name = self._budgeted_chat(
+                    [
                         {"role": "system",
                          "content": "You are a cute pet name generator. Generate a single short, cute name for a virtual pet. Just provide the name, nothing else."},
                         {"role": "user", "content": f"Generate a cute name for a {pet_type} virtual pet."}
                     ],
                     max_tokens=20
-                )
-
-                # Extract name from response (structure is different in API v1)
-                name = response.choices[0].message.content.strip()
+                ).strip()
 
                 # Ensure the name is not too long
                 if len(name) > 10:
                     name = name[:10]
                 return name
+            except AIBudgetExceeded as e:
+                log.info("Using offline pet name: %s", e)
             except Exception as e:
-                print(f"Error generating pet name: {e}")
-                self.is_available = False
+                log.error("Error generating pet name: %s", e)
+                self._mark_unavailable()
 
         # Fallback to predefined names
         prefixes = ["Pixel", "Bit", "Chip", "Nano", "Tiny", "Byte", "Spark", "Glitch", "Blip", "Dot"]
         suffixes = ["Bot", "Pet", "Friend", "Pal", "Buddy", "Mate", "Chum", "Companion", "Amigo", "Comrade"]
 
-        return f"{random.choice(prefixes)}{random.choice(suffixes)}"
+        return f"{self.rng.choice(prefixes)}{self.rng.choice(suffixes)}"
 
-    def generate_fun_fact(self, pet_type, pet_name):
-        """Generate a fun fact or joke from the pet using AI or fallback to predefined facts"""
-        if self.is_available and self._check_connection():
-            try:
-                from openai import OpenAI
+    def _fun_fact_messages(self, pet_type, pet_name):
+        """Build the chat messages asking the pet for a fun fact or joke"""
+        prompt = f"You are {pet_name}, a virtual {pet_type} pet. Share one cute, interesting, and short fun fact or joke. Keep it under 100 characters if possible. Make it fun for kids. Only use basic ASCII characters - no emojis or special Unicode characters. Just provide the fun fact or joke, nothing else."
 
-                # Create a client instance
-                client = OpenAI(api_key=self.api_key)
+        return [
+            {"role": "system",
+             "content": "You are a cute virtual pet that shares interesting facts or jokes with your owner. Only use basic ASCII characters - no emojis or special symbols."},
+            {"role": "user", "content": prompt}
+        ]
 
-                prompt = f"You are {pet_name}, a virtual {pet_type} pet. Share one cute, interesting, and short fun fact or joke. Keep it under 100 characters if possible. Make it fun for kids. Only use basic ASCII characters - no emojis or special Unicode characters. Just provide the fun fact or joke, nothing else."
+    def _offline_fun_fact(self, pet_type, pet_name):
+        """Pick an offline fact or joke, without repeats for this pet"""
+        rng = self.content.rng
+        kind = "fact" if rng.random() < 0.7 else "joke"  # 70% chance of fact, 30% chance of joke
+        text = self.content.sample(kind, pet_type, bag_key=f"{pet_type}:{pet_name}")
+        if text:
+            return text
 
-                response = client.chat.completions.create(
-                    model=DEFAULT_AI_MODEL,
-                    messages=[
-                        {"role": "system",
-                         "content": "You are a cute virtual pet that shares interesting facts or jokes with your owner. Only use basic ASCII characters - no emojis or special symbols."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=150
-                )
+        if kind == "fact":
+            return rng.choice(self.offline_facts)
+        else:
+            return rng.choice(self.offline_jokes)
 
-                fact = response.choices[0].message.content.strip()
+    def generate_fun_fact(self, pet_type, pet_name):
+        """Generate a fun fact or joke from the pet using AI or fallback to predefined facts"""
+        if self._use_ai():
+            try:
+                fact = self._budgeted_chat(
+                    self._fun_fact_messages(pet_type, pet_name),
+                    max_tokens=150
+                ).strip()
 
                 # Filter out any non-ASCII characters to prevent Unicode errors
-                fact = ''.join(char for char in fact if ord(char) < 128)
+                fact = filter_ascii(fact)
 
                 return fact
+            except AIBudgetExceeded as e:
+                log.info("Using offline fun fact: %s", e)
             except Exception as e:
-                print(f"Error generating fun fact: {e}")
-                self.is_available = False
+                log.error("Error generating fun fact: %s", e)
+                self._mark_unavailable()
+
+        # Fallback to offline facts/jokes
+        return self._offline_fun_fact(pet_type, pet_name)
+
+    def _fun_fact_chunks(self, pet_type, pet_name):
+        """Yield a fun fact or joke as it streams in, falling back to offline content"""
+        if self._use_ai():
+            received = []
+            messages = self._fun_fact_messages(pet_type, pet_name)
+            prompt_text = ''.join(m["content"] for m in messages)
+            start = time.time()
+            try:
+                with self.budget.worker(AI_ENDPOINT_CHAT), \
+                        closing(self.backend.chat_stream(messages, max_tokens=150)) as stream:
+                    for chunk in stream:
+                        # Filter each chunk on its own so text can be shown as it arrives
+                        chunk = filter_ascii(chunk)
+                        if not received:
+                            chunk = chunk.lstrip()
+                        if chunk:
+                            received.append(chunk)
+                            yield chunk
+                # Streams don't report usage, so estimate it
+                self.budget.record(AI_ENDPOINT_CHAT, time.time() - start,
+                                   estimate_tokens(prompt_text + ''.join(received)))
+            except AIBudgetExceeded as e:
+                log.info("Using offline fun fact: %s", e)
+            except GeneratorExit:
+                # Cancelled: the worker slot is free again, record what was used
+                self.budget.record(AI_ENDPOINT_CHAT, time.time() - start,
+                                   estimate_tokens(prompt_text + ''.join(received)))
+                raise
+            except Exception as e:
+                log.error("Error streaming fun fact: %s", e)
+                self.budget.record(AI_ENDPOINT_CHAT, time.time() - start, error=True)
+                self._mark_unavailable()
+            if received:
+                return
 
-        # Fallback to predefined facts/jokes
-        if random.random() < 0.7:  # 70% chance of fact, 30% chance of joke
-            return random.choice(self.offline_facts)
-        else:
-            return random.choice(self.offline_jokes)
+        # Fallback to offline facts/jokes
+        yield self._offline_fun_fact(pet_type, pet_name)
+
+    def stream_fun_fact(self, pet_type, pet_name):
+        """Start generating a fun fact in the background and return a TextStream"""
+        return TextStream(lambda: self._fun_fact_chunks(pet_type, pet_name), self.recorder)
 
     def generate_random_pet(self):
         """Generate a random pet type using AI or fallback to predefined pets"""
-        if self.is_available and self._check_connection() and self.image_libs_available:
+        return self._recorded("pet", self._generate_random_pet())
+
+    def _generate_random_pet(self):
+        if self._use_ai() and self.image_libs_available:
             try:
                 # First generate a random pet type
                 pet_ideas = ["Cat", "Dog", "Bird", "Dragon", "Fox", "Rabbit", "Frog", "Panda",
                              "Turtle", "Octopus", "Axolotl", "Owl", "Hamster", "Dinosaur"]
-                pet_type = random.choice(pet_ideas)
+                pet_type = self.rng.choice(pet_ideas)
 
                 # Then generate an image with DALL-E
-                print(f"Generating image for AI pet type: {pet_type}")
+                log.info("Generating image for AI pet type: %s", pet_type)
 
                 # DALL-E prompt for a simple standalone pixel art pet
                 prompt = f"""Generate pixel art {pet_type} pet isolated on black background"""
 
                 try:
-                    # Import the OpenAI client
-                    from openai import OpenAI
-
-                    # Create a client instance
-                    client = OpenAI(api_key=self.api_key)
-
-                    # Call DALL-E API with new client
-                    response = client.images.generate(
-                        model="dall-e-3",  # Use DALL-E 3
-                        prompt=prompt,
-                        n=1,  # Generate 1 image
-                        size="1024x1024",  # Standard size
-                        response_format="url"  # Get URL to download
-                    )
-
-                    # Get image URL from the updated response structure
-                    image_url = response.data[0].url
-
-                    # Use the properly imported requests and PIL libraries
+                    # Generate and download the image through the backend
                     from io import BytesIO
 
-                    # Download the image
-                    image_response = self.requests.get(image_url)
-                    image = self.Image.open(BytesIO(image_response.content))
+                    image_data = self._budgeted_image(prompt)
+                    image = self.Image.open(BytesIO(image_data))
 
                     # Create a new image with black background
                     black_bg = self.Image.new("RGBA", image.size, (0, 0, 0, 255))
@@ -238,13 +436,15 @@ class AIHandler:
                     image_path = os.path.join(PETS_PATH, f"{pet_type}Tami.png")
                     black_bg.save(image_path)
 
-                    print(f"Successfully created AI pet: {pet_type}")
+                    log.info("Successfully created AI pet: %s", pet_type)
                     return pet_type
+                except AIBudgetExceeded as e:
+                    log.info("Using an offline pet: %s", e)
                 except Exception as e:
-                    print(f"Error generating pet image with DALL-E: {e}")
+                    log.error("Error generating pet image with DALL-E: %s", e)
             except Exception as e:
-                print(f"Error in AI pet generation: {e}")
-                self.is_available = False
+                log.error("Error in AI pet generation: %s", e)
+                self._mark_unavailable()
 
         # Fallback to predefined pets if AI generation fails
-        return random.choice(PET_TYPES)
\ No newline at end of file
+        return self.rng.choice(PET_TYPES)
\ No newline at end of file
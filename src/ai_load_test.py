@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# MalinaPet - UI responsiveness load test against the local AI stub
+#
+# Drives the adoption and conversation screens headlessly while the stub
+# server answers slowly or fails, and reports frame times:
+#     python -m src.ai_load_test --latency 1.0 --error-rate 0.3 --rounds 5
+
+import sys
+import time
+import argparse
+from src.constants import *
+from src.display import Display
+from src.instrumentation import percentile
+from src.headless import ScriptedInput
+from src.ai_backends import HTTPBackend
+from src.ai_budget import unlimited_budget, AI_ENDPOINT_CHAT
+from src.ai_integration import AIHandler
+from src.ai_stub_server import StubSettings, start_stub_server
+from src.screens import ScreenType
+from src.screens.adoption import AdoptionScreen
+from src.screens.conversation import ConversationScreen
+
+
+def run_screen(create_screen, input_handler, frame_times, busy_frames, budget, max_frames):
+    """Run a screen until it transitions, recording each frame's duration.
+
+    busy_frames gets whether an AI request was in flight during each frame.
+    Returns the transition result and the screen.
+    """
+    def measure(frame):
+        started = budget.started_workers
+        busy = budget.active_workers > 0
+        start = time.perf_counter()
+        result = frame()
+        frame_times.append(time.perf_counter() - start)
+        busy_frames.append(busy or budget.active_workers > 0 or budget.started_workers != started)
+        return result
+
+    # Creating the screen happens inside a frame of the main loop too
+    screen = measure(create_screen)
+
+    def step():
+        input_handler.update()
+        result = screen.update()
+        if result is None:
+            screen.draw()
+        return result
+
+    for _ in range(max_frames):
+        result = measure(step)
+        elapsed = frame_times[-1]
+        if result is not None:
+            return result, screen
+
+        # Pace frames like the real loop, outside the measured time
+        time.sleep(max(0.0, 1.0 / FPS - elapsed))
+    return None, screen
+
+
+def run_load_test(settings, rounds=3, conversation_frames=30, check_interval=1.0):
+    """Adopt a pet and talk to it repeatedly.
+
+    After a failed call the AI handler probes the stub again every
+    check_interval seconds, so one error doesn't end the test's AI traffic.
+    Returns per-frame durations, whether an AI request was in flight in each
+    frame, the time until the first conversation text arrived and the number
+    of AI calls made.
+    """
+    server = start_stub_server(settings, port=0)
+    url = f"http://{AI_STUB_HOST}:{server.server_address[1]}"
+
+    display = Display()
+    display.initialize_headless()
+
+    ai_handler = AIHandler(backend=HTTPBackend(url, timeout=5), budget=unlimited_budget())
+    ai_handler.check_interval = check_interval
+    ai_handler.wait_until_ready()
+    print(f"AI available at start: {ai_handler.is_available}")
+    budget = ai_handler.budget
+
+    frame_times = []
+    busy_frames = []
+    first_text_times = []
+    try:
+        for _ in range(rounds):
+            # Adopt: move around the grid and confirm on frame 5
+            adoption_input = ScriptedInput([(1, "right"), (2, "down"), (5, "press")])
+            result, _ = run_screen(lambda: AdoptionScreen(display, adoption_input, ai_handler),
+                                   adoption_input, frame_times, busy_frames, budget, 20)
+            pet = result[1] if result and result[0] == ScreenType.MAIN else None
+            if pet is None:
+                continue
+
+            # Talk to the pet, then leave the conversation
+            pet.set_need("needs_conversation", True)
+            talk_input = ScriptedInput([(conversation_frames, "down")])
+            _, screen = run_screen(lambda: ConversationScreen(display, talk_input, pet, ai_handler),
+                                   talk_input, frame_times, busy_frames, budget, conversation_frames + 1)
+            stream = screen.text_stream
+            if stream.first_chunk_time is not None:
+                first_text_times.append(stream.first_chunk_time - stream.start_time)
+    finally:
+        server.shutdown()
+
+    summary = budget.summary()
+    print(f"AI usage: {summary}")
+    return frame_times, busy_frames, first_text_times, summary["endpoints"][AI_ENDPOINT_CHAT]["calls"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure UI responsiveness under a slow or flaky AI service")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--check-interval", type=float, default=1.0,
+                        help="seconds before a failed AI service is probed again")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.jitter, args.error_rate, args.max_rps)
+    frame_times, busy_frames, first_text_times, ai_calls = run_load_test(
+        settings, args.rounds, check_interval=args.check_interval)
+
+    budget = 1.0 / FPS
+    stalls = [t for t in frame_times if t > budget]
+    print(f"Frames: {len(frame_times)}  requests: {settings.requests}  "
+          f"errors: {settings.errors}  throttled: {settings.throttled}")
+    print(f"Frame time p50 {percentile(frame_times, 0.5) * 1000:.1f} ms  "
+          f"p95 {percentile(frame_times, 0.95) * 1000:.1f} ms  "
+          f"max {max(frame_times) * 1000:.1f} ms")
+    print(f"Frames with an AI request in flight: {sum(busy_frames)}")
+    print(f"Frames over the {budget * 1000:.0f} ms budget: {len(stalls)} "
+          f"({sum(stalls):.2f} s of UI stalled)")
+    if first_text_times:
+        print(f"Time to first conversation text: p50 {percentile(first_text_times, 0.5) * 1000:.0f} ms  "
+              f"max {max(first_text_times) * 1000:.0f} ms")
+
+    # Without AI calls the numbers above only measure the offline content
+    if not ai_calls:
+        sys.exit("FAIL: no AI chat call reached the stub, so the UI was never under AI load")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# MalinaPet - Local stand-in for the AI service
+#
+# Serves canned OpenAI-compatible responses with configurable latency, errors
+# and throughput limits:
+#     python -m src.ai_stub_server --latency 0.8 --jitter 0.4 --error-rate 0.2 --max-rps 2
+
+import json
+import time
+import random
+import struct
+import zlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.constants import *
+
+STUB_NAMES = ["Mochi", "Pebble", "Noodle", "Biscuit", "Sprout", "Waffle"]
+STUB_FACTS = [
+    "Stub fact: octopuses have three hearts!",
+    "Stub joke: what do frogs order? French flies!",
+    "Stub fact: cats sleep about 70 percent of their lives.",
+]
+
+
+def make_png(size=(8, 8), color=(0, 200, 0, 255)):
+    """Build a small solid-color PNG without any imaging library"""
+    width, height = size
+    rows = b"".join(b"\0" + bytes(color) * width for _ in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data +
+                struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+class StubSettings:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, max_rps=0.0, token_delay=0.05):
+        self.latency = latency  # Base delay per request in seconds
+        self.jitter = jitter  # Extra random delay of up to this many seconds
+        self.error_rate = error_rate  # Fraction of requests that fail with a 500
+        self.max_rps = max_rps  # Requests per second before answering 429 (0 = unlimited)
+        self.token_delay = token_delay  # Delay between streamed chunks in seconds
+        self.lock = threading.Lock()
+        self.tokens = max_rps
+        self.last_refill = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+
+    def take_token(self):
+        """Take a request token from the throughput bucket"""
+        if self.max_rps <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.max_rps, self.tokens + (now - self.last_refill) * self.max_rps)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    settings = StubSettings()
+
+    def log_message(self, format, *args):
+        # Keep the console quiet; the load test prints its own summary
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, text):
+        """Send the text as server-sent events, one word at a time"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            chunk = word if i == len(words) - 1 else word + " "
+            event = {"choices": [{"index": 0, "delta": {"content": chunk}}]}
+            self.wfile.write(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+            time.sleep(self.settings.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def simulate_conditions(self):
+        """Apply latency, throttling and random failures; return False if the request failed"""
+        settings = self.settings
+        settings.requests += 1
+        time.sleep(settings.latency + random.uniform(0, settings.jitter))
+
+        if not settings.take_token():
+            settings.throttled += 1
+            self.send_json(429, {"error": {"message": "Rate limit reached"}})
+            return False
+        if random.random() < settings.error_rate:
+            settings.errors += 1
+            self.send_json(500, {"error": {"message": "Stub failure"}})
+            return False
+        return True
+
+    def do_GET(self):
+        if self.path == "/health":
+            if self.simulate_conditions():
+                self.send_json(200, {"status": "ok"})
+        elif self.path.startswith("/images/"):
+            body = make_png()
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            payload = {}
+
+        if self.path == "/v1/chat/completions":
+            if not self.simulate_conditions():
+                return
+            system = payload.get("messages", [{}])[0].get("content", "")
+            text = random.choice(STUB_NAMES) if "name generator" in system else random.choice(STUB_FACTS)
+            if payload.get("stream"):
+                self.send_stream(text)
+                return
+            self.send_json(200, {
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 40, "completion_tokens": len(text) // 4, "total_tokens": 40 + len(text) // 4}
+            })
+        elif self.path == "/v1/images/generations":
+            if not self.simulate_conditions():
+                return
+            host, port = self.server.server_address[:2]
+            self.send_json(200, {"data": [{"url": f"http://{host}:{port}/images/pet.png"}]})
+        else:
+            self.send_json(404, {"error": {"message": "Not found"}})
+
+
+def start_stub_server(settings=None, host=AI_STUB_HOST, port=AI_STUB_PORT):
+    """Start the stub server on a background thread and return it"""
+    handler = type("ConfiguredStubRequestHandler", (StubRequestHandler,),
+                   {"settings": settings or StubSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="ai-stub", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the MalinaPet AI service")
+    parser.add_argument("--host", default=AI_STUB_HOST)
+    parser.add_argument("--port", type=int, default=AI_STUB_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="base delay per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="requests per second before 429s")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="delay between streamed chunks (s)")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.jitter, args.error_rate, args.max_rps, args.token_delay)
+    server = start_stub_server(settings, args.host, args.port)
+    print(f"AI stub server listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
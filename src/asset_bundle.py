@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# MalinaPet - Precompiled asset bundle (texture atlas of pre-scaled sprites)
+#
+# Build the bundle after changing any art:
+#     python -m src.asset_bundle
+
+import os
+import sys
+import json
+import mmap
+import struct
+import pygame
+from src.constants import *
+from src.indexed_sprites import prepare_sprite
+from src.log import get_logger
+
+log = get_logger("assets")
+
+BUNDLE_MAGIC = b"MPATLAS2"
+BUNDLE_HEADER = struct.Struct("<8sIIII")  # magic, index length, data offset, atlas width, atlas height
+BUNDLE_ALIGNMENT = 4096  # Pixel data starts on a page boundary so it maps cleanly
+
+
+def variant_key(size):
+    """Get the index key for a sprite size"""
+    return f"{size[0]}x{size[1]}"
+
+
+def source_stamp(path):
+    """Get the (mtime, size) recorded for a source PNG, to tell when the bundle is stale"""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def pack_shelves(sprites, atlas_width):
+    """Place (name, size, surface) sprites on shelves and return positions and atlas height"""
+    placements = []
+    x, y, shelf_height = 0, 0, 0
+
+    for name, size, surface in sorted(sprites, key=lambda sprite: sprite[1][1], reverse=True):
+        if x + size[0] > atlas_width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        placements.append((name, size, surface, (x, y)))
+        x += size[0]
+        shelf_height = max(shelf_height, size[1])
+
+    return placements, y + shelf_height
+
+
+def build_bundle(assets_path=ASSETS_PATH, output_path=ASSET_BUNDLE_PATH, atlas_width=ASSET_ATLAS_WIDTH):
+    """Pack every asset variant into a single raw RGBA atlas file"""
+    sprites = []
+    sources = {}
+    for folder, sizes in ASSET_BUNDLE_VARIANTS.items():
+        folder_path = os.path.join(assets_path, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for file in sorted(os.listdir(folder_path)):
+            if not file.lower().endswith(".png"):
+                continue
+            image = pygame.image.load(os.path.join(folder_path, file))
+            sources[f"{folder}/{file}"] = source_stamp(os.path.join(folder_path, file))
+            for size in sizes:
+                sprites.append((f"{folder}/{file}", tuple(size), pygame.transform.scale(image, size)))
+
+    placements, atlas_height = pack_shelves(sprites, atlas_width)
+    atlas = pygame.Surface((atlas_width, max(1, atlas_height)), pygame.SRCALPHA)
+    index = {"sources": sources, "sprites": {}}
+    for name, size, surface, (x, y) in placements:
+        atlas.blit(surface, (x, y))
+        index["sprites"].setdefault(name, {})[variant_key(size)] = [x, y, size[0], size[1]]
+
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+    data_offset = BUNDLE_HEADER.size + len(index_bytes)
+    data_offset += -data_offset % BUNDLE_ALIGNMENT
+
+    with open(output_path, "wb") as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(index_bytes), data_offset,
+                                   atlas.get_width(), atlas.get_height()))
+        f.write(index_bytes)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(pygame.image.tostring(atlas, "RGBA"))
+
+    print(f"Built asset bundle {output_path}: {len(placements)} sprites, "
+          f"{atlas.get_width()}x{atlas.get_height()} atlas")
+    return output_path
+
+
+class AssetBundle:
+    def __init__(self, path=ASSET_BUNDLE_PATH):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_length, data_offset, width, height = BUNDLE_HEADER.unpack_from(self.map, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+
+        start = BUNDLE_HEADER.size
+        index = json.loads(self.map[start:start + index_length].decode("utf-8"))
+        self.sources = index["sources"]
+        self.sprites = index["sprites"]
+        self.stale = set()  # Sources changed since the bundle was built
+
+        # The atlas surface reads its pixels straight from the mapped file;
+        # only sprites that are used get copied out in the display format
+        pixels = memoryview(self.map)[data_offset:data_offset + width * height * 4]
+        self.atlas = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+        self.converted = {}
+
+    def is_current(self, name, path):
+        """Check that a sprite's source PNG hasn't changed since the bundle was built"""
+        if name in self.stale:
+            return False
+        try:
+            current = source_stamp(path)
+        except OSError:
+            current = None
+        if current != self.sources.get(name):
+            self.stale.add(name)
+            log.warning("Asset bundle is stale for %s, loading the PNG (rebuild with python -m src.asset_bundle)",
+                        name)
+            return False
+        return True
+
+    def get(self, name, size, path):
+        """Get a sprite variant in the display format, or None if it is not bundled or is stale"""
+        rect = self.sprites.get(name, {}).get(variant_key(size))
+        if rect is None or not self.is_current(name, path):
+            return None
+        key = (name, variant_key(size))
+        if key not in self.converted:
+            sprite = self.atlas.subsurface(rect)
+            if pygame.display.get_surface() is None:
+                return sprite
+            self.converted[key] = sprite.convert_alpha()
+        return self.converted[key]
+
+
+_bundle = None
+_bundle_checked = False
+
+
+def get_bundle():
+    """Get the shared asset bundle, or None if it has not been built"""
+    global _bundle, _bundle_checked
+    if not _bundle_checked:
+        _bundle_checked = True
+        if os.path.exists(ASSET_BUNDLE_PATH):
+            try:
+                _bundle = AssetBundle(ASSET_BUNDLE_PATH)
+            except Exception as e:
+                log.error("Error opening asset bundle: %s", e)
+    return _bundle
+
+
+def load_asset(path, size, bundled=True):
+    """Load an asset at the given size, from the bundle if possible, else from its PNG.
+
+    Generated assets (e.g. AI pet images) pass bundled=False, since their PNG
+    can replace a bundled sprite with the same name.
+    """
+    bundle = get_bundle() if bundled else None
+    if bundle is not None:
+        image = bundle.get(os.path.relpath(path, ASSETS_PATH), tuple(size), path)
+        if image is not None:
+            return prepare_sprite(image, (path, tuple(size)))
+
+    # The PNG's stamp is part of the key, so a rewritten file (e.g. a new AI pet) isn't served stale
+    stamp = tuple(source_stamp(path))
+    image = pygame.image.load(path).convert_alpha()
+    return prepare_sprite(pygame.transform.scale(image, size), (path, tuple(size)) + stamp)
+
+
+if __name__ == "__main__":
+    build_bundle(*sys.argv[1:2])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# MalinaPet - Prebaked bitmap font renderer
+
+import os
+import json
+import pygame
+from src.constants import *
+from src.log import get_logger
+
+log = get_logger("display")
+
+# Printable ASCII (the AI text is already filtered down to ASCII)
+GLYPHS = ''.join(chr(code) for code in range(32, 127))
+
+
+class BitmapFont:
+    """Drop-in replacement for pygame.font.Font that blits glyphs from an atlas.
+
+    The atlas is baked once per (font, size) from a TrueType font and cached on
+    disk. Text is measured by summing per-glyph advances (no kerning) and
+    rendered by blitting glyph sub-surfaces, so FreeType is not involved after
+    the first run.
+    """
+
+    def __init__(self, atlas, advances, height):
+        self.atlas = atlas
+        self.advances = advances  # Glyph -> (x offset in atlas, width)
+        self.height = height
+        self.tinted = {WHITE: atlas}  # Color -> atlas tinted in that color
+        self.fallback = self.advances.get('?', (0, 0))
+
+    @classmethod
+    def bake(cls, font):
+        """Render every glyph of a pygame font into a single white atlas"""
+        surfaces = [font.render(glyph, True, WHITE) for glyph in GLYPHS]
+        height = max(surface.get_height() for surface in surfaces)
+        atlas = pygame.Surface((sum(surface.get_width() for surface in surfaces), height), pygame.SRCALPHA)
+
+        advances = {}
+        x = 0
+        for glyph, surface in zip(GLYPHS, surfaces):
+            atlas.blit(surface, (x, 0))
+            advances[glyph] = (x, surface.get_width())
+            x += surface.get_width()
+
+        return cls(atlas, advances, height)
+
+    @classmethod
+    def load(cls, font, name, size, cache_path=FONT_CACHE_PATH):
+        """Load the atlas for (name, size) from disk, baking and saving it if needed"""
+        base = os.path.join(cache_path, f"{name}-{size}")
+        try:
+            with open(f"{base}.json", 'r') as f:
+                metrics = json.load(f)
+            atlas = pygame.image.load(f"{base}.png").convert_alpha()
+            advances = {glyph: tuple(entry) for glyph, entry in metrics["advances"].items()}
+            return cls(atlas, advances, metrics["height"])
+        except Exception:
+            pass
+
+        bitmap_font = cls.bake(font)
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            pygame.image.save(bitmap_font.atlas, f"{base}.png")
+            with open(f"{base}.json", 'w') as f:
+                json.dump({"height": bitmap_font.height, "advances": bitmap_font.advances}, f)
+        except Exception as e:
+            log.error("Error saving font atlas: %s", e)
+        bitmap_font.atlas = bitmap_font.atlas.convert_alpha()
+        bitmap_font.tinted = {WHITE: bitmap_font.atlas}
+        return bitmap_font
+
+    def get_atlas(self, color):
+        """Get the atlas tinted in the given color"""
+        color = tuple(color)[:3]
+        atlas = self.tinted.get(color)
+        if atlas is None:
+            atlas = self.atlas.copy()
+            atlas.fill(color + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+            self.tinted[color] = atlas
+        return atlas
+
+    def size(self, text):
+        """Get the (width, height) of the text without kerning"""
+        advances = self.advances
+        fallback = self.fallback
+        return sum(advances.get(glyph, fallback)[1] for glyph in text), self.height
+
+    def render(self, text, antialias=True, color=WHITE, background=None):
+        """Render the text by blitting glyphs from the atlas"""
+        atlas = self.get_atlas(color)
+        surface = pygame.Surface((max(1, self.size(text)[0]), self.height), pygame.SRCALPHA)
+        if background is not None:
+            surface.fill(background)
+
+        blits = []
+        x = 0
+        for glyph in text:
+            offset, width = self.advances.get(glyph, self.fallback)
+            blits.append((atlas, (x, 0), (offset, 0, width, self.height)))
+            x += width
+        surface.blits(blits, doreturn=False)
+        return surface
+
+    def get_height(self):
+        """Get the line height in pixels"""
+        return self.height
+
+    def get_linesize(self):
+        """Get the recommended line spacing in pixels"""
+        return self.height
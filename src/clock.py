@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# MalinaPet - Game clock (real time, or virtual time for replays)
+
+import time
+
+_source = time.time
+
+
+def now():
+    """Get the current game time in seconds"""
+    return _source()
+
+
+def set_source(source):
+    """Replace the time source (pass None to go back to real time)"""
+    global _source
+    _source = source if source is not None else time.time
+
+
+class VirtualClock:
+    """Time source that only moves when advanced, for deterministic replays"""
+
+    def __init__(self, start):
+        self.time = start
+
+    def advance(self, seconds):
+        self.time += seconds
+
+    def __call__(self):
+        return self.time
+
+
+class ScaledClock:
+    """Time source running speed times faster than real time, for simulations"""
+
+    def __init__(self, speed):
+        self.speed = speed
+        self.start = time.time()
+
+    def __call__(self):
+        return self.start + (time.time() - self.start) * self.speed
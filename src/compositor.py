@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# MalinaPet - Layered compositor with cached static layers
+
+import pygame
+from src.constants import *
+
+
+class Layer:
+    def __init__(self, name, render, key, above_sprites):
+        self.name = name
+        self.render = render  # Called with a surface to draw the layer onto
+        self.key = key  # Returns a value that changes whenever the layer must be redrawn
+        self.above_sprites = above_sprites
+
+
+class LayerCompositor:
+    """Bakes static layers into cached surfaces and batches dynamic sprites.
+
+    Layers below the sprites are flattened into one opaque surface and layers
+    above them into one transparent surface. Each flattened surface is rebuilt
+    only when one of its layers' keys changes, so a frame costs two large blits
+    plus a single Surface.blits batch for the sprites.
+    """
+
+    def __init__(self, size, background=BLACK):
+        self.size = size
+        self.background = background
+        self.layers = []
+        self.below = None
+        self.above = None
+        self.below_keys = None
+        self.above_keys = None
+
+    def add_layer(self, name, render, key=lambda: None, above_sprites=False):
+        """Add a static layer (layers are drawn in the order they are added)"""
+        self.layers.append(Layer(name, render, key, above_sprites))
+        self.invalidate()
+
+    def invalidate(self):
+        """Force the cached layers to be rebuilt on the next draw"""
+        self.below_keys = None
+        self.above_keys = None
+
+    def bake(self, above_sprites):
+        """Flatten the layers on one side of the sprites into a single surface"""
+        layers = [layer for layer in self.layers if layer.above_sprites == above_sprites]
+        if above_sprites and not layers:
+            return None
+
+        if above_sprites:
+            surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(self.size)
+            surface.fill(self.background)
+
+        for layer in layers:
+            layer.render(surface)
+
+        return surface.convert_alpha() if above_sprites else surface.convert()
+
+    def draw(self, target, sprites=()):
+        """Draw the cached layers and a batch of (surface, position) sprites"""
+        below_keys = tuple(layer.key() for layer in self.layers if not layer.above_sprites)
+        above_keys = tuple(layer.key() for layer in self.layers if layer.above_sprites)
+
+        if below_keys != self.below_keys:
+            self.below = self.bake(False)
+            self.below_keys = below_keys
+        if above_keys != self.above_keys:
+            self.above = self.bake(True)
+            self.above_keys = above_keys
+
+        target.blit(self.below, (0, 0))
+        if sprites:
+            target.blits(sprites, doreturn=False)
+        if self.above is not None:
+            target.blit(self.above, (0, 0))
@@ -27,6 +27,7 @@ MESS_SIZE = (25, 25)  # Mess image size
 ICON_SIZE = (30, 30)  # Menu icon size
 ARROW_SIZE = (20, 20)  # Direction arrow size
 STAT_BAR_SIZE = (50, 10)  # Size of the stat bars
+PET_THUMBNAIL_SIZE = (30, 30)  # Small pet preview size
 
 # Button GPIO pins (for Waveshare 1.44inch LCD HAT)
 KEY_UP_PIN     = 6 
@@ -37,6 +38,19 @@ KEY_PRESS_PIN  = 13  # Joystick press
 KEY1_PIN       = 21
 KEY2_PIN       = 20
 KEY3_PIN       = 16
+BACKLIGHT_PIN  = 24  # LCD backlight
+
+# Idle power saving
+IDLE_DIM_TIMEOUT = 60  # seconds without input before dimming the backlight
+IDLE_OFF_TIMEOUT = 180  # seconds without input before turning the backlight off
+IDLE_DIM_FPS = 5  # Frame rate while dimmed
+IDLE_DIM_BRIGHTNESS = 20  # Backlight duty cycle (%) while dimmed
+BACKLIGHT_PWM_FREQUENCY = 1000  # Hz
+POWER_SAVE_TICK = 5  # seconds between simulation ticks while the backlight is off and no pet timer is known
+POWER_MIN_SLEEP = 0.1  # Shortest wait while the backlight is off, even if a deadline is already due
+POWER_ACTIVE = "active"
+POWER_DIM = "dim"
+POWER_OFF = "off"
 
 # Pet types
 PET_TYPES = ["Cat", "Rat", "Raccoon", "Froggy", "Chicken", "Mario"]
@@ -46,6 +60,21 @@ MAX_STAT = 100
 MIN_STAT = 0
 STAT_DECREASE_AMOUNT = 5
 
+# Stat history archive levels: (stat ticks averaged per point, points kept)
+STAT_HISTORY_LEVELS = [
+    (1, 240),   # 4 hours at full resolution
+    (10, 288),  # 48 hours of 10 minute averages
+    (60, 168),  # 1 week of hourly averages
+]
+STAT_HISTORY_LABELS = ["4h", "48h", "7d"]
+
+# Stats screen pages
+STATS_PAGE_BARS = 0
+STATS_PAGE_GRAPHS = 1
+STATS_BAR_WIDTH = 70
+STATS_BAR_HEIGHT = 12
+STATS_BAR_SPACING = 12  # Between stat rows
+
 # Pet state constants
 STATE_NORMAL = "normal"
 STATE_EATING = "eating"
@@ -59,6 +88,14 @@ STAT_HAPPINESS = "Happiness"
 STAT_ENERGY = "Energy"
 STAT_HEALTH = "Health"
 
+# Pet change events
+PET_EVENT_STAT = "stat"  # A stat changed value
+PET_EVENT_STATE = "state"  # The pet's state changed
+PET_EVENT_NEED = "need"  # A need indicator turned on or off
+PET_EVENT_MESS_ADDED = "mess_added"
+PET_EVENT_MESS_CLEARED = "mess_cleared"
+PET_EVENT_DIED = "died"
+
 # Time constants
 MILLISECONDS_PER_HOUR = 3600000
 HOURS_PER_DAY = 24
@@ -71,6 +108,119 @@ INDICATORS_PATH = f"{ASSETS_PATH}/indicators"
 MESS_PATH = f"{ASSETS_PATH}/mess"
 GAME_OVER_PATH = f"{ASSETS_PATH}/game_over"
 FONTS_PATH = f"{ASSETS_PATH}/fonts"
+CONTENT_PATH = f"{ASSETS_PATH}/content"
+CONTENT_CORPUS_PATH = f"{CONTENT_PATH}/corpus.tsv"
+
+# Asset bundle (built with "python -m src.asset_bundle")
+ASSET_BUNDLE_PATH = f"{ASSETS_PATH}/bundle.atlas"
+ASSET_ATLAS_WIDTH = 256
+ASSET_BUNDLE_VARIANTS = {
+    "pets": [PET_SIZE, PET_THUMBNAIL_SIZE],
+    "icons": [ICON_SIZE],
+    "indicators": [ARROW_SIZE],
+    "mess": [MESS_SIZE],
+    "game_over": [PET_SIZE],
+}
+
+# Remote screen mirroring
+MIRROR_HOST = "127.0.0.1"
+MIRROR_PORT = 8766
+MIRROR_TILE_SIZE = 16  # Pixels per side of a diffed tile
+MIRROR_MAX_FPS = 10  # Frames captured per second at most
+MIRROR_SEND_TIMEOUT = 2.0  # seconds before a stalled viewer is dropped
+
+# Multi-pet host (kiosk/server mode)
+PET_HOST_HOST = "127.0.0.1"
+PET_HOST_PORT = 8767
+PET_HOST_ACTIONS = ["eat", "sleep", "wake", "play", "clean", "heal"]
+
+# Pet state sync to a collector
+SYNC_QUEUE_PATH = "/home/anna/Desktop/MalinaPet/sync_queue"
+SYNC_CAPTURE_INTERVAL = 1.0  # seconds between captured deltas
+SYNC_BATCH_SIZE = 50  # Deltas per batch
+SYNC_FLUSH_INTERVAL = 30  # seconds before a partial batch is sent anyway
+SYNC_QUEUE_MAX_BATCHES = 500  # Oldest batches are dropped beyond this
+SYNC_BACKOFF_MIN = 2  # seconds
+SYNC_BACKOFF_MAX = 300
+SYNC_TIMEOUT = 10
+SYNC_STOP_TIMEOUT = 1.0  # seconds to wait for a send in flight at shutdown (queued batches stay on disk)
+SYNC_COLLECTOR_HOST = "127.0.0.1"
+SYNC_COLLECTOR_PORT = 8768
+
+# Logging (records go to a ring buffer; a background thread writes them out)
+LOG_LEVEL = "info"  # debug, info, warning or error
+LOG_BUFFER_SIZE = 1000  # Recent records kept in memory for crash dumps
+LOG_PENDING_MAX = 2000  # Unwritten records beyond this are dropped
+LOG_WRITE_INTERVAL = 0.5  # seconds between writes (warnings and errors go out at once)
+LOG_RATE_INTERVAL = 10.0  # seconds per rate limit window
+LOG_RATE_BURST = 5  # Records per call site per window
+LOG_CRASH_PATH = "/home/anna/Desktop/MalinaPet/crash.log"
+
+# Sprite storage (indexed = 8-bit palette with colorkey transparency)
+SPRITE_FORMAT_ALPHA = "alpha"
+SPRITE_FORMAT_INDEXED = "indexed"
+SPRITE_PALETTE_SIZE = 255  # Colors per sprite; palette index 0 is the colorkey
+SPRITE_COLORKEY = (255, 0, 255)
+SPRITE_ALPHA_THRESHOLD = 128  # Pixels less opaque than this become transparent
+SPRITE_RLE_MIN_TRANSPARENT = 0.2  # Transparent fraction at which RLEACCEL is used
+SPRITE_BLIT_REPEATS = 2000  # Blits per sprite when measuring
+
+# Display probing (tried in order; the last mode that worked is cached)
+DISPLAY_MODES = ["directfb", "fbcon", "default", "windowed"]
+DISPLAY_PROBE_CACHE_PATH = "/home/anna/Desktop/MalinaPet/display_cache.json"
+DISPLAY_PROBE_WATCH_FILES = ["/proc/device-tree/model", "/boot/config.txt", "/boot/firmware/config.txt"]
+
+# Input-to-photon latency (press edge to the frame on the panel)
+LATENCY_BUCKETS_MS = [8, 16, 33, 50, 67, 100, 150, 250, 500]  # Histogram bucket upper edges
+LATENCY_SAMPLES = 512  # Recent latencies kept per screen and button
+LATENCY_EDGE_MAX = 0.5  # seconds; older GPIO edges aren't used to tag a press
+LATENCY_BUDGET_P95_MS = 100  # Budgets checked by "python -m src.latency_check"
+LATENCY_BUDGET_MAX_MS = 150
+
+# Frame presenter thread (optional; overlaps the panel transfer with the next frame)
+PRESENTER_SAMPLES = 256  # Recent transfer times kept for the gauge
+
+# Display backends ("sdl" probes SDL drivers, "framebuffer" writes RGB565 directly)
+DISPLAY_BACKEND_SDL = "sdl"
+DISPLAY_BACKEND_FRAMEBUFFER = "framebuffer"
+FRAMEBUFFER_DEVICE = "/dev/fb1"  # fbtft device of the SPI LCD, or a plain file stand-in
+
+# Font backends ("ttf" renders through FreeType, "bitmap" blits prebaked glyph atlases)
+FONT_BACKEND_TTF = "ttf"
+FONT_BACKEND_BITMAP = "bitmap"
+FONT_CACHE_PATH = "/home/anna/Desktop/MalinaPet/font_cache"
 
 # OpenAI API configuration
 DEFAULT_AI_MODEL = "gpt-3.5-turbo"
+DEFAULT_IMAGE_MODEL = "dall-e-3"
+
+# AI backends ("http" talks to any OpenAI-compatible endpoint, e.g. the local stub server)
+AI_BACKEND_OPENAI = "openai"
+AI_BACKEND_HTTP = "http"
+AI_STUB_HOST = "127.0.0.1"
+AI_STUB_PORT = 8765
+AI_STUB_URL = f"http://{AI_STUB_HOST}:{AI_STUB_PORT}"
+
+# AI request budget (beyond these limits the handler falls back to offline content)
+AI_CHAT_PER_MINUTE = 6  # Sustained chat request rate
+AI_CHAT_BURST = 3  # Chat requests allowed back to back
+AI_IMAGES_PER_HOUR = 4
+AI_IMAGE_BURST = 1
+AI_DAILY_TOKEN_BUDGET = 20000
+AI_DAILY_IMAGE_BUDGET = 10
+AI_LATENCY_LIMIT = 5.0  # p90 seconds before degrading to offline content
+AI_DEGRADED_COOLDOWN = 300  # Seconds to stay offline after latency got too high
+AI_USAGE_WINDOW = 32  # Recent calls kept per endpoint for latency stats
+AI_USAGE_PATH = "/home/anna/Desktop/MalinaPet/ai_usage.json"
+AI_MAX_WORKERS = 2  # AI requests allowed in flight at once
+
+# Thermal/load governor
+GOVERNOR_TEMP_PATH = "/sys/class/thermal/thermal_zone0/temp"
+GOVERNOR_STAT_PATH = "/proc/stat"
+GOVERNOR_INTERVAL = 2.0  # seconds between readings
+GOVERNOR_TEMP_LIMIT = 70.0  # °C
+GOVERNOR_CPU_LIMIT = 0.85  # Busy fraction of all cores
+GOVERNOR_TEMP_HYSTERESIS = 5.0  # °C below the limit before speeding up again
+GOVERNOR_CPU_HYSTERESIS = 0.15
+GOVERNOR_RECOVER_TIME = 10.0  # seconds of headroom needed before speeding up
+GOVERNOR_LEVELS = [(FPS, AI_MAX_WORKERS), (20, 1), (12, 1), (6, 0)]  # (frame rate, AI workers)
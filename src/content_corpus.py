@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# MalinaPet - Indexed offline content corpus with no-repeat sampling
+
+import os
+import json
+import mmap
+import random
+from array import array
+from src.constants import *
+from src.log import get_logger
+
+log = get_logger("content")
+
+ANY_PET = "*"
+
+
+class ContentCorpus:
+    """Offline facts and jokes stored in a tab-separated file on disk.
+
+    Each line is "kind<TAB>pet type<TAB>text". The file is memory-mapped and
+    only an index of line offsets per (kind, pet type) is kept in memory, so the
+    corpus can hold thousands of entries without raising RSS. The index is
+    cached next to the corpus and rebuilt when the corpus changes.
+    """
+
+    def __init__(self, path=CONTENT_CORPUS_PATH, rng=None):
+        self.path = path
+        self.rng = rng if rng is not None else random.Random()
+        self.index_path = f"{path}.idx"
+        self.file = None
+        self.map = None
+        self.index = None  # (kind, pet type) -> array of line offsets
+        self.bags = {}  # (bag key, kind) -> offsets left to draw
+        self.last_drawn = {}  # (bag key, kind) -> offset drawn last
+        self.is_available = True
+
+    def open(self):
+        """Map the corpus and load its index on first use"""
+        if self.map is not None or not self.is_available:
+            return self.map is not None
+
+        try:
+            self.file = open(self.path, 'rb')
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            log.warning("Content corpus not available: %s", e)
+            self.is_available = False
+            return False
+
+        self.index = self.load_index()
+        if self.index is None:
+            self.index = self.build_index()
+            self.save_index()
+        return True
+
+    def corpus_signature(self):
+        """Get the size and mtime used to tell if the cached index is current"""
+        info = os.fstat(self.file.fileno())
+        return [info.st_size, int(info.st_mtime)]
+
+    def load_index(self):
+        """Load the cached index if it matches the corpus file"""
+        try:
+            with open(self.index_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if cached.get("signature") != self.corpus_signature():
+            return None
+
+        index = {}
+        for category, offsets in cached["categories"].items():
+            kind, pet_type = category.split("\t")
+            index[(kind, pet_type)] = array('I', offsets)
+        return index
+
+    def build_index(self):
+        """Scan the corpus once and record where each category's lines start"""
+        index = {}
+        offset = 0
+        size = len(self.map)
+        while offset < size:
+            end = self.map.find(b"\n", offset)
+            if end == -1:
+                end = size
+            line = self.map[offset:end]
+            if line and not line.startswith(b"#"):
+                fields = line.split(b"\t", 2)
+                if len(fields) == 3:
+                    key = (fields[0].decode('ascii'), fields[1].decode('ascii'))
+                    index.setdefault(key, array('I')).append(offset)
+            offset = end + 1
+        return index
+
+    def save_index(self):
+        """Cache the index next to the corpus"""
+        categories = {f"{kind}\t{pet_type}": offsets.tolist()
+                      for (kind, pet_type), offsets in self.index.items()}
+        try:
+            with open(self.index_path, 'w') as f:
+                json.dump({"signature": self.corpus_signature(), "categories": categories}, f)
+        except OSError as e:
+            log.error("Error saving content index: %s", e)
+
+    def entry(self, offset):
+        """Read the text of the line starting at offset"""
+        end = self.map.find(b"\n", offset)
+        if end == -1:
+            end = len(self.map)
+        return self.map[offset:end].split(b"\t", 2)[2].decode('ascii', 'ignore').strip()
+
+    def count(self, kind, pet_type=ANY_PET):
+        """Get the number of entries available to a pet type"""
+        if not self.open():
+            return 0
+        total = len(self.index.get((kind, ANY_PET), ()))
+        if pet_type != ANY_PET:
+            total += len(self.index.get((kind, pet_type), ()))
+        return total
+
+    def sample(self, kind, pet_type, bag_key=None):
+        """Draw an entry from a shuffle-bag so nothing repeats until the bag is empty"""
+        if not self.open():
+            return None
+
+        key = (bag_key or pet_type, kind)
+        bag = self.bags.get(key)
+        if not bag:
+            bag = list(self.index.get((kind, ANY_PET), ()))
+            if pet_type != ANY_PET:
+                bag.extend(self.index.get((kind, pet_type), ()))
+            if not bag:
+                return None
+            self.rng.shuffle(bag)
+            # Don't start a new bag with the entry that ended the previous one
+            if len(bag) > 1 and bag[-1] == self.last_drawn.get(key):
+                bag[0], bag[-1] = bag[-1], bag[0]
+            self.bags[key] = bag
+
+        offset = bag.pop()
+        self.last_drawn[key] = offset
+        return self.entry(offset)
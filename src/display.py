@@ -4,106 +4,231 @@
 import os
 import pygame
 import subprocess
+import threading
 from src.constants import *
+from src.display_probe import DisplayProbeCache
+from src.bitmap_font import BitmapFont
+from src.log import get_logger
+
+log = get_logger("display")
 
 class Display:
-    def __init__(self):
+    def __init__(self, font_backend=FONT_BACKEND_TTF):
+        self.font_backend = font_backend
         self.width = SCREEN_WIDTH
         self.height = SCREEN_HEIGHT
         self.screen = None
         self.font = None
         self.small_font = None
         self.clock = None
+        self.fps = FPS  # Frame rate limit (0 = unlimited)
+        self.fps_cap = FPS  # Upper limit set by the thermal governor
+
+        # Pre-rendered stat bars keyed by (width, height, border, fill, segments)
+        self.stat_bar_cache = {}
+
+        # Callables given each presented frame (e.g. the screen mirror)
+        self.frame_listeners = []
+
+        # With a logical size the UI renders to self.screen at that size and
+        # is scaled up by a whole factor onto the panel when presented
+        self.panel = None
+        self.panel_area = None
+
+        # Optional FramePresenter that puts frames on the panel from its own thread.
+        # SDL must flip on the thread that handles events, so only backends that
+        # present without SDL (the framebuffer) can use one
+        self.presenter = None
+        self.present_thread_safe = False
+
+        # Optional LatencyTracker, told when frames answering button presses are on the panel
+        self.latency = None
         
     def initialize(self):
         """Initialize the display and pygame"""
-        print("Initializing pygame...")
+        log.info("Initializing pygame...")
         pygame.init()
         self.clock = pygame.time.Clock()
         
-        # Try to detect actual screen resolution
-        try:
-            # Use fbset to get display resolution
-            output = subprocess.check_output(['fbset', '-s']).decode('utf-8')
-            for line in output.split('\n'):
-                if 'geometry' in line:
-                    parts = line.split()
-                    self.width = int(parts[1])
-                    self.height = int(parts[2])
-                    print(f"Detected screen resolution: {self.width}x{self.height}")
-                    break
-        except:
-            # Default to 1.44" LCD resolution if detection fails
-            print(f"Using default resolution: {self.width}x{self.height}")
-        
-        # Initialize the display with different drivers until one works
-        print("Setting up display...")
-        try:
-            # Try with directfb driver first
-            os.environ['SDL_VIDEODRIVER'] = 'directfb'
-            pygame.display.init()
-            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            screen_width, screen_height = self.screen.get_size()
-            print(f"Fullscreen resolution with directfb: {screen_width}x{screen_height}")
-            pygame.display.set_caption("MalinaPet")
-            print("DirectFB display initialized successfully")
-        except Exception as e:
-            print(f"DirectFB initialization failed: {e}")
+        # Try the display mode that worked last time before probing them all
+        probe_cache = DisplayProbeCache()
+        cached = probe_cache.load()
+        screen_width, screen_height = 0, 0
+        mode = None
+
+        if cached is not None:
+            self.width = cached["width"]
+            self.height = cached["height"]
+            log.info("Using cached display mode %s at %dx%d", cached['mode'], self.width, self.height)
             try:
-                # Try with fbcon driver next
-                os.environ['SDL_VIDEODRIVER'] = 'fbcon'
-                pygame.display.quit()
-                pygame.display.init()
-                self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                screen_width, screen_height = self.screen.get_size()
-                print(f"Fullscreen resolution with fbcon: {screen_width}x{screen_height}")
-                print("FBcon display initialized successfully")
+                screen_width, screen_height = self.open_mode(cached["mode"])
+                mode = cached["mode"]
             except Exception as e:
-                print(f"FBcon initialization failed: {e}")
+                log.warning("Cached display mode %s failed: %s", cached['mode'], e)
+                probe_cache.invalidate()
+
+        if mode is None:
+            self.detect_resolution()
+
+            # Initialize the display with different drivers until one works
+            log.info("Setting up display...")
+            for candidate in DISPLAY_MODES:
                 try:
-                    # Finally try the default driver
-                    os.environ.pop('SDL_VIDEODRIVER', None)
-                    pygame.display.quit()
-                    pygame.display.init()
-                    self.screen = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
-                    screen_width, screen_height = self.screen.get_size()
-                    print(f"Default driver resolution: {screen_width}x{screen_height}")
+                    screen_width, screen_height = self.open_mode(candidate)
+                    mode = candidate
+                    break
                 except Exception as e:
-                    print(f"Default display initialization failed: {e}")
-                    # Last resort - try windowed mode
-                    self.screen = pygame.display.set_mode((self.width, self.height))
-                    screen_width, screen_height = self.screen.get_size()
-                    print(f"Windowed mode resolution: {screen_width}x{screen_height}")
+                    log.warning("%s display initialization failed: %s", candidate, e)
+                    if candidate == DISPLAY_MODES[-1]:
+                        raise
+
+        log.info("Display mode %s: %dx%d", mode, screen_width, screen_height)
         
         # Update dimensions based on actual screen size
         if screen_width != 0 and screen_height != 0:
             self.width = screen_width
             self.height = screen_height
+
+        if cached is None or cached["mode"] != mode:
+            probe_cache.save(mode, self.width, self.height)
             
         # Now that display is initialized, we can set mouse visibility
         try:
             pygame.mouse.set_visible(False)  # Hide mouse cursor
         except Exception as e:
-            print(f"Could not hide mouse cursor: {e}")
+            log.warning("Could not hide mouse cursor: %s", e)
             
         # Initialize fonts
+        self.init_fonts()
+            
+        log.info("Display initialized with dimensions %dx%d", self.width, self.height)
+        return self.screen
+
+    def initialize_headless(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        """Initialize an offscreen display for tools and benchmarks (no frame limit)"""
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.init()
+        self.clock = pygame.time.Clock()
+        self.fps = 0
+        self.width, self.height = size
+        self.screen = pygame.display.set_mode(size)
+        self.init_fonts()
+        return self.screen
+
+    def init_fonts(self):
+        """Load the display fonts sized for the current height"""
+        font_size = max(10, self.height // 12)
+        small_font_size = max(8, self.height // 16)
         try:
             # Try to load a pixel-style font for 8-bit/16-bit look
             font_path = os.path.join(FONTS_PATH, "Qadang.ttf")
             if os.path.exists(font_path):
-                self.font = pygame.font.Font(font_path, max(10, self.height // 12))
-                self.small_font = pygame.font.Font(font_path, max(8, self.height // 16))
+                font_name = "Qadang"
+                self.font = pygame.font.Font(font_path, font_size)
+                self.small_font = pygame.font.Font(font_path, small_font_size)
             else:
                 # Fallback to default monospace font
-                self.font = pygame.font.SysFont("monospace", max(10, self.height // 12))
-                self.small_font = pygame.font.SysFont("monospace", max(8, self.height // 16))
+                font_name = "monospace"
+                self.font = pygame.font.SysFont("monospace", font_size)
+                self.small_font = pygame.font.SysFont("monospace", small_font_size)
         except Exception as e:
-            print(f"Font initialization failed: {e}. Using default.")
-            self.font = pygame.font.Font(None, max(10, self.height // 12))
-            self.small_font = pygame.font.Font(None, max(8, self.height // 16))
-            
-        print(f"Display initialized with dimensions {self.width}x{self.height}")
-        return self.screen
+            log.warning("Font initialization failed: %s. Using default.", e)
+            font_name = "default"
+            self.font = pygame.font.Font(None, font_size)
+            self.small_font = pygame.font.Font(None, small_font_size)
+
+        # Optionally swap the TrueType fonts for prebaked glyph atlases
+        if self.font_backend == FONT_BACKEND_BITMAP:
+            try:
+                self.font = BitmapFont.load(self.font, font_name, font_size)
+                self.small_font = BitmapFont.load(self.small_font, font_name, small_font_size)
+            except Exception as e:
+                log.warning("Bitmap font initialization failed: %s. Using TrueType.", e)
+
+    def detect_resolution(self):
+        """Read the framebuffer resolution with fbset"""
+        try:
+            # Use fbset to get display resolution
+            output = subprocess.check_output(['fbset', '-s']).decode('utf-8')
+            for line in output.split('\n'):
+                if 'geometry' in line:
+                    parts = line.split()
+                    self.width = int(parts[1])
+                    self.height = int(parts[2])
+                    log.info("Detected screen resolution: %dx%d", self.width, self.height)
+                    break
+        except:
+            # Default to 1.44" LCD resolution if detection fails
+            log.info("Using default resolution: %dx%d", self.width, self.height)
+
+    def open_mode(self, mode):
+        """Open the display in one of DISPLAY_MODES and return its size"""
+        if mode in ("directfb", "fbcon"):
+            os.environ['SDL_VIDEODRIVER'] = mode
+            pygame.display.quit()
+            pygame.display.init()
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        elif mode == "default":
+            os.environ.pop('SDL_VIDEODRIVER', None)
+            pygame.display.quit()
+            pygame.display.init()
+            self.screen = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
+        else:
+            # Last resort - windowed mode
+            os.environ.pop('SDL_VIDEODRIVER', None)
+            pygame.display.quit()
+            pygame.display.init()
+            self.screen = pygame.display.set_mode((self.width, self.height))
+
+        pygame.display.set_caption("MalinaPet")
+        return self.screen.get_size()
+
+    def prefetch_assets(self, path=ASSETS_PATH):
+        """Read asset files in a background thread so later loads hit the page cache"""
+        def warm_up():
+            for root, _, files in os.walk(path):
+                for name in files:
+                    try:
+                        with open(os.path.join(root, name), 'rb') as f:
+                            while f.read(65536):
+                                pass
+                    except OSError:
+                        pass
+
+        thread = threading.Thread(target=warm_up, name="asset-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def use_logical_size(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        """Render the UI at a logical size and integer-scale it to the panel; returns the scale"""
+        panel = self.panel if self.panel is not None else self.screen
+        scale = min(panel.get_width() // size[0], panel.get_height() // size[1])
+        if scale < 2:
+            return 1
+        scaled = pygame.Rect((0, 0), (size[0] * scale, size[1] * scale))
+        scaled.center = panel.get_rect().center
+        self.panel = panel
+        self.panel_area = panel.subsurface(scaled)
+        self.screen = pygame.Surface(size).convert()
+        self.width, self.height = size
+        self.init_fonts()
+        log.info("Rendering at %dx%d, scaled %dx to the panel", size[0], size[1], scale)
+        return scale
+
+    def present_surface(self, frame):
+        """Get the surface to put on the panel, scaling the logical frame up if in use"""
+        if self.panel is None:
+            return frame
+        pygame.transform.scale(frame, self.panel_area.get_size(), self.panel_area)
+        return self.panel
+
+    def present(self, frame):
+        """Put a finished frame on the panel (on the presenter thread, if there is one)"""
+        surface = self.present_surface(frame)
+        window = pygame.display.get_surface()
+        if surface is not window:
+            window.blit(surface, (0, 0))
+        pygame.display.flip()
 
     def load_image(self, path, size=None):
         """Load and scale an image"""
@@ -113,7 +238,7 @@ class Display:
                 image = pygame.transform.scale(image, size)
             return image
         except Exception as e:
-            print(f"Error loading image {path}: {e}")
+            log.error("Error loading image %s: %s", path, e)
             # Create a placeholder colored rectangle
             surf = pygame.Surface(size if size else (30, 30))
             surf.fill(RED)  # Red indicates missing image
@@ -168,28 +293,66 @@ class Display:
             # Simple case - no wrapping needed
             return font.render(text, True, color)
             
-    def draw_stat_bar(self, x, y, value, max_value=100, width=STAT_BAR_SIZE[0], height=STAT_BAR_SIZE[1], border_color=WHITE, fill_color=GREEN):
-        """Draw a stat bar with the given value"""
+    def get_stat_bar_sprites(self, width=STAT_BAR_SIZE[0], height=STAT_BAR_SIZE[1], border_color=WHITE, fill_color=GREEN, segments=10):
+        """Get the pre-rendered stat bar surfaces for 0..segments filled segments"""
+        key = (width, height, border_color, fill_color, segments)
+        sprites = self.stat_bar_cache.get(key)
+        if sprites is None:
+            sprites = [self.render_stat_bar(filled, width, height, border_color, fill_color, segments)
+                       for filled in range(segments + 1)]
+            self.stat_bar_cache[key] = sprites
+        return sprites
+
+    def render_stat_bar(self, filled, width, height, border_color, fill_color, segments):
+        """Render a stat bar with the given number of filled segments"""
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
         # Draw border
-        pygame.draw.rect(self.screen, border_color, (x, y, width, height), 1)
-        
-        # Calculate fill width
-        fill_width = int((value / max_value) * (width - 2))
-        
+        pygame.draw.rect(surface, border_color, (0, 0, width, height), 1)
+
         # Draw segments (vertical lines) for the filled part
-        segment_width = (width - 2) / 10  # 10 segments for 0-100%
-        
-        for i in range(int(value / 10)):
-            segment_x = x + 1 + int(i * segment_width)
-            pygame.draw.line(self.screen, fill_color, 
-                            (segment_x, y + 1), 
-                            (segment_x, y + height - 2), 
+        segment_width = (width - 2) / segments
+
+        for i in range(filled):
+            segment_x = 1 + int(i * segment_width)
+            pygame.draw.line(surface, fill_color,
+                            (segment_x, 1),
+                            (segment_x, height - 2),
                             2)
 
+        return surface.convert_alpha()
+
+    def draw_stat_bar(self, x, y, value, max_value=100, width=STAT_BAR_SIZE[0], height=STAT_BAR_SIZE[1], border_color=WHITE, fill_color=GREEN, segments=10, surface=None):
+        """Draw a stat bar with the given value (on the screen unless another surface is given)"""
+        sprites = self.get_stat_bar_sprites(width, height, border_color, fill_color, segments)
+        filled = max(0, min(segments, int(value * segments / max_value)))
+        (surface or self.screen).blit(sprites[filled], (x, y))
+
+    def frame_rate(self):
+        """Get the frame rate to run at (0 = unlimited)"""
+        return min(self.fps, self.fps_cap) if self.fps else 0
+
+    def notify_frame(self):
+        """Pass the presented frame to the frame listeners"""
+        for listener in self.frame_listeners:
+            listener(self.screen)
+
     def update(self):
-        """Update the display"""
-        pygame.display.flip()
-        self.clock.tick(FPS)
+        """Present the frame drawn into self.screen and wait for the next frame time"""
+        self.notify_frame()
+        tags = self.latency.take_frame() if self.latency is not None else None
+        if self.presenter is not None:
+            # The panel transfer overlaps with building the next frame
+            self.presenter.submit(tags)
+        else:
+            self.present(self.screen)
+            if tags:
+                self.latency.presented(tags)
+        self.clock.tick(self.frame_rate())
+        
+    def cleanup(self):
+        """Release display resources (nothing to do for SDL)"""
+        pass
         
     def clear(self, color=BLACK):
         """Clear the screen with the specified color"""
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# MalinaPet - Cache of the last working display driver and geometry
+
+import os
+import json
+import glob
+import hashlib
+from src.constants import *
+from src.log import get_logger
+
+log = get_logger("display")
+
+
+class DisplayProbeCache:
+    def __init__(self, path=DISPLAY_PROBE_CACHE_PATH):
+        self.path = path
+        # Taken before any driver is tried, since probing changes SDL_VIDEODRIVER
+        self.current_fingerprint = self.fingerprint()
+
+    def fingerprint(self):
+        """Build a fingerprint of the display hardware and configuration"""
+        parts = [os.environ.get('SDL_VIDEODRIVER', '')]
+
+        # Framebuffer devices present
+        parts.extend(sorted(glob.glob('/dev/fb*')))
+
+        # Board model and boot configuration (size and mtime are enough to spot edits)
+        for path in DISPLAY_PROBE_WATCH_FILES:
+            try:
+                info = os.stat(path)
+                parts.append(f"{path}:{info.st_size}:{int(info.st_mtime)}")
+            except OSError:
+                parts.append(f"{path}:missing")
+
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def load(self):
+        """Get the cached probe result, or None if missing or stale"""
+        try:
+            with open(self.path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("fingerprint") != self.current_fingerprint:
+            log.info("Display probe cache is stale, running full probe")
+            return None
+        if entry.get("mode") not in DISPLAY_MODES:
+            return None
+        return entry
+
+    def save(self, mode, width, height):
+        """Store the display mode and geometry that worked"""
+        entry = {
+            "fingerprint": self.current_fingerprint,
+            "mode": mode,
+            "width": width,
+            "height": height
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(entry, f)
+        except Exception as e:
+            log.error("Error saving display probe cache: %s", e)
+
+    def invalidate(self):
+        """Remove the cached probe result"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
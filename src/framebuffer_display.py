@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# MalinaPet - Direct RGB565 framebuffer display backend
+
+import os
+import re
+import mmap
+import pygame
+from src.constants import *
+from src.display import Display
+from src.log import get_logger
+
+log = get_logger("display")
+
+
+def read_sysfs(path):
+    """Read a sysfs attribute as a stripped string"""
+    with open(path, 'r') as f:
+        return f.read().strip()
+
+
+class FramebufferDisplay(Display):
+    """Display that renders offscreen and writes RGB565 rows straight to a framebuffer.
+
+    The target can be a framebuffer device such as /dev/fb1 (SPI panels driven
+    by fbtft show up this way) or a plain file, which acts as a stand-in panel
+    when testing without hardware.
+    """
+
+    def __init__(self, device=FRAMEBUFFER_DEVICE, font_backend=FONT_BACKEND_TTF):
+        super().__init__(font_backend)
+        self.device = device
+        self.fb_file = None
+        self.fb_map = None
+        self.stride = 0
+        self.previous_frame = None
+        self.np = None
+        self.fb_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.sysfs_path = f"/sys/class/graphics/{os.path.basename(device)}"
+        self.present_thread_safe = True  # Frames go to the mmap, not through SDL
+
+    def is_supported(self):
+        """Check the framebuffer takes 16 bit pixels, the RGB565 rows this backend writes"""
+        try:
+            bits_per_pixel = int(read_sysfs(f"{self.sysfs_path}/bits_per_pixel"))
+        except (OSError, ValueError):
+            # Plain file stand-in or missing sysfs entries
+            return True
+        if bits_per_pixel != 16:
+            log.warning("%s uses %d bits per pixel, only 16 (RGB565) is supported",
+                        self.device, bits_per_pixel)
+            return False
+        return True
+
+    def initialize(self):
+        """Set up an offscreen surface and map the framebuffer (no SDL driver probe)"""
+        log.info("Initializing framebuffer display on %s...", self.device)
+
+        # NumPy is only needed by this backend, so import it here
+        import numpy
+        self.np = numpy
+
+        # The dummy driver still lets convert()/convert_alpha() work for sprites
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.init()
+        self.clock = pygame.time.Clock()
+
+        self.width, self.height = self.read_geometry()
+        self.fb_size = (self.width, self.height)  # Stays the panel size if the UI is scaled
+        self.screen = pygame.display.set_mode((self.width, self.height))
+        self.open_framebuffer()
+
+        self.init_fonts()
+        log.info("Framebuffer display initialized with dimensions %dx%d", self.width, self.height)
+        return self.screen
+
+    def read_geometry(self):
+        """Get the visible framebuffer size from sysfs, falling back to the LCD size"""
+        try:
+            self.stride = int(read_sysfs(f"{self.sysfs_path}/stride"))
+            width, height = read_sysfs(f"{self.sysfs_path}/virtual_size").split(',')
+        except (OSError, ValueError):
+            # Plain file stand-in or missing sysfs entries
+            self.stride = SCREEN_WIDTH * 2
+            return SCREEN_WIDTH, SCREEN_HEIGHT
+
+        # The virtual size can be taller than the panel (room for panning), so
+        # use the current video mode, e.g. "U:320x240p-0", when there is one
+        for attribute in ("mode", "modes"):
+            try:
+                match = re.search(r"(\d+)x(\d+)", read_sysfs(f"{self.sysfs_path}/{attribute}"))
+            except OSError:
+                continue
+            if match:
+                return int(match.group(1)), int(match.group(2))
+        return int(width), int(height)
+
+    def open_framebuffer(self):
+        """Memory-map the framebuffer device or stand-in file"""
+        size = self.stride * self.fb_size[1]
+        if not os.path.exists(self.device):
+            # Create a stand-in file the size of the panel
+            with open(self.device, 'wb') as f:
+                f.truncate(size)
+
+        self.fb_file = open(self.device, 'r+b')
+        if os.fstat(self.fb_file.fileno()).st_size < size and not self.device.startswith("/dev/"):
+            self.fb_file.truncate(size)
+        self.fb_map = mmap.mmap(self.fb_file.fileno(), size, mmap.MAP_SHARED,
+                                mmap.PROT_READ | mmap.PROT_WRITE)
+        self.previous_frame = None
+
+    def to_rgb565(self, frame):
+        """Convert a frame (scaled to the panel) to a (height, width) RGB565 array"""
+        np = self.np
+        rgb = pygame.surfarray.array3d(self.present_surface(frame)).astype(np.uint16)
+        pixels = ((rgb[..., 0] & 0xF8) << 8) | ((rgb[..., 1] & 0xFC) << 3) | (rgb[..., 2] >> 3)
+        # surfarray is indexed (x, y); the framebuffer is row-major
+        return np.ascontiguousarray(pixels.T).astype('<u2')
+
+    def changed_row_ranges(self, frame):
+        """Get (first, last) row ranges that differ from the previous frame"""
+        np = self.np
+        if self.previous_frame is None:
+            return [(0, self.fb_size[1] - 1)]
+
+        rows = np.flatnonzero((frame != self.previous_frame).any(axis=1))
+        if len(rows) == 0:
+            return []
+
+        # Split into runs of consecutive rows
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]]))
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def write_rows(self, frame, first, last):
+        """Write a run of rows into the mapped framebuffer"""
+        row_bytes = self.fb_size[0] * 2
+        if self.stride == row_bytes:
+            start = first * self.stride
+            self.fb_map[start:start + (last - first + 1) * row_bytes] = frame[first:last + 1].tobytes()
+        else:
+            for row in range(first, last + 1):
+                start = row * self.stride
+                self.fb_map[start:start + row_bytes] = frame[row].tobytes()
+
+    def present(self, frame):
+        """Push the rows of a frame that changed to the framebuffer"""
+        pixels = self.to_rgb565(frame)
+        for first, last in self.changed_row_ranges(pixels):
+            self.write_rows(pixels, first, last)
+        self.previous_frame = pixels
+
+    def cleanup(self):
+        """Unmap and close the framebuffer"""
+        if self.fb_map is not None:
+            self.fb_map.close()
+            self.fb_map = None
+        if self.fb_file is not None:
+            self.fb_file.close()
+            self.fb_file = None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# MalinaPet - Screen management for one frame of the game loop
+
+from src.screens import ScreenType
+from src.screens.adoption import AdoptionScreen
+from src.screens.main_screen import MainScreen
+from src.screens.stats_screen import StatsScreen
+from src.screens.conversation import ConversationScreen
+from src.screens.game_over import GameOverScreen
+
+
+class Game:
+    def __init__(self, display, input_handler, ai_handler):
+        self.display = display
+        self.input = input_handler
+        self.ai_handler = ai_handler
+
+        # Game state
+        self.current_screen_type = ScreenType.ADOPTION
+        self.current_screen = None
+        self.pet = None
+
+    def create_screen(self, screen_type):
+        """Create the screen object for a screen type"""
+        if screen_type == ScreenType.ADOPTION:
+            return AdoptionScreen(self.display, self.input, self.ai_handler)
+        elif screen_type == ScreenType.MAIN:
+            return MainScreen(self.display, self.input, self.pet)
+        elif screen_type == ScreenType.STATS:
+            return StatsScreen(self.display, self.input, self.pet)
+        elif screen_type == ScreenType.CONVERSATION:
+            return ConversationScreen(self.display, self.input, self.pet, self.ai_handler)
+        elif screen_type == ScreenType.GAME_OVER:
+            return GameOverScreen(self.display, self.input, self.pet)
+
+    def next_deadline(self):
+        """Get when the pet next needs an update, or None without a pet"""
+        if self.pet is None or not self.pet.is_alive():
+            return None
+        return self.pet.next_deadline()
+
+    def step(self, draw=True):
+        """Update the current screen and draw it; return True if a frame was drawn"""
+        # Initialize/switch screens if necessary
+        if self.current_screen is None:
+            self.current_screen = self.create_screen(self.current_screen_type)
+
+        # The pet's timers run whatever screen is showing, so its next
+        # deadline is always in the future once the frame is done
+        if self.pet is not None and self.pet.is_alive():
+            self.pet.update()
+
+        # Update current screen; presses it saw are answered by the next presented frame
+        result = self.current_screen.update()
+        if self.display.latency is not None:
+            self.display.latency.updated(self.current_screen_type.name.lower())
+
+        # Handle screen transitions
+        if result is not None:
+            next_screen_type, data = result
+
+            if next_screen_type == ScreenType.ADOPTION:
+                # Reset pet
+                self.pet = None
+            elif next_screen_type == ScreenType.MAIN:
+                # If coming from adoption screen, set the new pet
+                if self.current_screen_type == ScreenType.ADOPTION and data is not None:
+                    self.pet = data
+
+            # Switch to the new screen
+            self.current_screen_type = next_screen_type
+            self.current_screen = None
+            return False
+
+        # Draw current screen (skipped while the screen is off)
+        if not draw:
+            return False
+        self.current_screen.draw()
+        return True
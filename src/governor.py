@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# MalinaPet - Thermal- and load-aware frame rate governor
+#
+# Reads the CPU temperature and load and steps through GOVERNOR_LEVELS, which
+# trade frame rate and AI request concurrency for heat. Readings come from
+# files, so any path can be pointed at a fake for testing:
+#     python -m src.governor --temp-path /tmp/temp --stat-path /tmp/stat
+
+import time
+import argparse
+from src.constants import *
+from src.instrumentation import register_gauge
+from src.log import get_logger
+
+log = get_logger("governor")
+
+
+def read_temperature(path):
+    """Read a thermal zone in °C, or None if it can't be read"""
+    try:
+        with open(path, 'r') as f:
+            return int(f.read().strip()) / 1000
+    except (OSError, ValueError):
+        return None
+
+
+def read_cpu_times(path):
+    """Read (busy, total) jiffies of all cores from /proc/stat, or None"""
+    try:
+        with open(path, 'r') as f:
+            fields = f.readline().split()
+    except OSError:
+        return None
+    if not fields or fields[0] != "cpu":
+        return None
+    times = [int(value) for value in fields[1:9]]
+    idle = times[3] + times[4]  # idle + iowait
+    return sum(times) - idle, sum(times)
+
+
+class Governor:
+    def __init__(self, temp_path=GOVERNOR_TEMP_PATH, stat_path=GOVERNOR_STAT_PATH,
+                 temp_limit=GOVERNOR_TEMP_LIMIT, cpu_limit=GOVERNOR_CPU_LIMIT, levels=GOVERNOR_LEVELS):
+        self.temp_path = temp_path
+        self.stat_path = stat_path
+        self.temp_limit = temp_limit
+        self.cpu_limit = cpu_limit
+        self.levels = levels
+
+        self.level = 0
+        self.temperature = None
+        self.cpu_load = None
+        self.last_cpu_times = read_cpu_times(stat_path)
+        self.last_sample = 0
+        self.headroom_since = None  # When readings last dropped below the hysteresis band
+
+        register_gauge("governor", self.state)
+
+    @property
+    def fps(self):
+        return self.levels[self.level][0]
+
+    @property
+    def ai_workers(self):
+        return self.levels[self.level][1]
+
+    def sample(self):
+        """Take a temperature and CPU load reading"""
+        self.temperature = read_temperature(self.temp_path)
+
+        cpu_times = read_cpu_times(self.stat_path)
+        if cpu_times is not None and self.last_cpu_times is not None:
+            busy = cpu_times[0] - self.last_cpu_times[0]
+            total = cpu_times[1] - self.last_cpu_times[1]
+            if total > 0:
+                self.cpu_load = busy / total
+        self.last_cpu_times = cpu_times
+
+    def over_budget(self):
+        return ((self.temperature is not None and self.temperature > self.temp_limit) or
+                (self.cpu_load is not None and self.cpu_load > self.cpu_limit))
+
+    def has_headroom(self):
+        return ((self.temperature is None or self.temperature < self.temp_limit - GOVERNOR_TEMP_HYSTERESIS) and
+                (self.cpu_load is None or self.cpu_load < self.cpu_limit - GOVERNOR_CPU_HYSTERESIS))
+
+    def update(self, now=None):
+        """Sample if due and pick a level; return True if the level changed"""
+        now = time.monotonic() if now is None else now
+        if now - self.last_sample < GOVERNOR_INTERVAL:
+            return False
+        self.last_sample = now
+        self.sample()
+
+        # Slow down at once when over budget, but only speed up again after
+        # the readings have stayed well under it for a while
+        previous = self.level
+        if self.over_budget():
+            self.headroom_since = None
+            self.level = min(self.level + 1, len(self.levels) - 1)
+        elif self.has_headroom():
+            if self.headroom_since is None:
+                self.headroom_since = now
+            elif now - self.headroom_since >= GOVERNOR_RECOVER_TIME:
+                self.headroom_since = now
+                self.level = max(self.level - 1, 0)
+        else:
+            self.headroom_since = None
+
+        if self.level != previous:
+            log.info("Governor: %s", self.describe())
+            return True
+        return False
+
+    def apply(self, display, ai_handler):
+        """Apply the current level to the display and the AI handler"""
+        display.fps_cap = self.fps
+        ai_handler.budget.max_workers = self.ai_workers
+
+    def state(self):
+        """Get the governor state for instrumentation"""
+        return {
+            "level": self.level,
+            "fps": self.fps,
+            "ai_workers": self.ai_workers,
+            "temperature": self.temperature,
+            "cpu_load": None if self.cpu_load is None else round(self.cpu_load, 2)
+        }
+
+    def describe(self):
+        temperature = "n/a" if self.temperature is None else f"{self.temperature:.1f}C"
+        cpu_load = "n/a" if self.cpu_load is None else f"{self.cpu_load * 100:.0f}%"
+        return (f"level {self.level} ({self.fps} fps, {self.ai_workers} AI workers), "
+                f"temperature {temperature}, CPU {cpu_load}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show what the governor would do with the current readings")
+    parser.add_argument("--temp-path", default=GOVERNOR_TEMP_PATH)
+    parser.add_argument("--stat-path", default=GOVERNOR_STAT_PATH)
+    parser.add_argument("--temp-limit", type=float, default=GOVERNOR_TEMP_LIMIT)
+    parser.add_argument("--cpu-limit", type=float, default=GOVERNOR_CPU_LIMIT)
+    args = parser.parse_args()
+
+    governor = Governor(args.temp_path, args.stat_path, args.temp_limit, args.cpu_limit)
+    try:
+        while True:
+            governor.update()
+            print(governor.describe())
+            time.sleep(GOVERNOR_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
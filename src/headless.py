@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# MalinaPet - Scripted input for running screens without hardware
+
+import time
+
+
+class ScriptedInput:
+    """Stands in for InputHandler, pressing buttons on scheduled frames"""
+
+    def __init__(self, script=None, edge_lead=None):
+        self.script = {}  # Frame number -> set of pressed buttons
+        self.frame = 0
+        self.pressed = set()
+
+        # Optional LatencyTracker; edge_lead() gives how long before the
+        # frame's poll each simulated button edge happened (0 if not set)
+        self.latency = None
+        self.edge_lead = edge_lead
+        for frame, button in script or []:
+            self.press_at(frame, button)
+
+    def press_at(self, frame, button):
+        """Schedule a button press on a frame"""
+        self.script.setdefault(frame, set()).add(button)
+
+    def update(self):
+        """Advance to the next frame"""
+        self.pressed = self.script.pop(self.frame, set())
+        self.frame += 1
+        if self.latency is not None:
+            now = time.perf_counter()
+            for button in self.pressed:
+                self.latency.press(button, now - (self.edge_lead() if self.edge_lead else 0))
+        return True
+
+    def is_pressed(self, button):
+        """Check if a button is pressed on the current frame"""
+        return button in self.pressed
+
+    def get_input_state(self):
+        """Get the pressed buttons on the current frame"""
+        return {button: True for button in self.pressed}
+
+    def cleanup(self):
+        """Nothing to release"""
+        pass
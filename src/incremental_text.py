@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# MalinaPet - Word-wrapped text that grows as it streams in
+
+from src.constants import *
+
+
+class IncrementalText:
+    """Word-wrapped text block that can be appended to a chunk at a time.
+
+    Lines that are followed by a line break can't change any more, so they are
+    rendered once and kept. Only the last line is re-wrapped and re-rendered
+    when more text arrives. Wrapping matches Display.render_text.
+    """
+
+    def __init__(self, font, color=WHITE, max_width=None):
+        self.font = font
+        self.color = color
+        self.max_width = max_width
+        self.line_height = font.get_height()
+        self.lines = []  # Rendered surfaces of finished lines
+        self.tail = ""  # Text of the last, still growing line
+        self.tail_surface = None
+        self.text = ""
+
+    def append(self, text):
+        """Add text, re-wrapping only the last line"""
+        if not text:
+            return
+        self.text += text
+
+        words = (self.tail + text).split(' ')
+        current_line = []
+        for word in words:
+            test_line = ' '.join(current_line + [word])
+            if self.max_width is None or self.font.size(test_line)[0] <= self.max_width or not current_line:
+                current_line.append(word)
+            else:
+                # The line is finished once a word has to move to the next one
+                self.lines.append(self.font.render(' '.join(current_line), True, self.color))
+                current_line = [word]
+
+        self.tail = ' '.join(current_line)
+        self.tail_surface = self.font.render(self.tail, True, self.color) if self.tail else None
+
+    def get_height(self):
+        """Get the height of all lines"""
+        return self.line_height * (len(self.lines) + (1 if self.tail_surface else 0))
+
+    def draw(self, surface, pos):
+        """Draw the text block with its top left corner at pos"""
+        x, y = pos
+        blits = [(line, (x, y + i * self.line_height)) for i, line in enumerate(self.lines)]
+        if self.tail_surface is not None:
+            blits.append((self.tail_surface, (x, y + len(self.lines) * self.line_height)))
+        surface.blits(blits, doreturn=False)
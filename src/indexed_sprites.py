@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# MalinaPet - Optional 8-bit palette sprites with colorkey transparency
+#
+# Pixel art has few colors and hard-edged transparency, so sprites can be
+# stored with one byte per pixel instead of four. Compare both formats with:
+#     python -m src.indexed_sprites
+
+import os
+import sys
+import time
+import pygame
+from src.constants import *
+from src.log import get_logger
+
+log = get_logger("assets")
+
+_sprite_format = SPRITE_FORMAT_ALPHA
+_cache = {}
+
+
+def set_sprite_format(sprite_format):
+    """Choose how loaded sprites are stored (SPRITE_FORMAT_ALPHA or SPRITE_FORMAT_INDEXED)"""
+    global _sprite_format
+    if sprite_format not in (SPRITE_FORMAT_ALPHA, SPRITE_FORMAT_INDEXED):
+        log.warning("Unknown sprite format %s, using %s", sprite_format, SPRITE_FORMAT_ALPHA)
+        sprite_format = SPRITE_FORMAT_ALPHA
+    _sprite_format = sprite_format
+    _cache.clear()
+
+
+def prepare_sprite(surface, key):
+    """Get a sprite in the configured format; indexed sprites are cached by key"""
+    if _sprite_format != SPRITE_FORMAT_INDEXED:
+        return surface
+    if key not in _cache:
+        _cache[key] = to_indexed(surface)
+    return _cache[key]
+
+
+def median_cut(color_counts, max_colors):
+    """Reduce {color: count} to a palette of at most max_colors.
+
+    Returns the palette and a mapping from each color to its palette index.
+    """
+    boxes = [list(color_counts)]
+    while len(boxes) < max_colors:
+        # Split the box with the widest channel range at its weighted median
+        best = None
+        for i, box in enumerate(boxes):
+            if len(box) < 2:
+                continue
+            for channel in range(3):
+                values = [color[channel] for color in box]
+                spread = max(values) - min(values)
+                if best is None or spread > best[0]:
+                    best = (spread, i, channel)
+        if best is None or best[0] == 0:
+            break
+
+        _, i, channel = best
+        box = sorted(boxes[i], key=lambda color: color[channel])
+        half = sum(color_counts[color] for color in box) / 2
+        running = 0
+        for split, color in enumerate(box):
+            running += color_counts[color]
+            if running >= half:
+                break
+        split = min(max(split, 1), len(box) - 1)
+        boxes[i:i + 1] = [box[:split], box[split:]]
+
+    palette = []
+    mapping = {}
+    for index, box in enumerate(boxes):
+        total = sum(color_counts[color] for color in box)
+        palette.append(tuple(round(sum(color[c] * color_counts[color] for color in box) / total)
+                             for c in range(3)))
+        for color in box:
+            mapping[color] = index
+    return palette, mapping
+
+
+def to_indexed(surface):
+    """Quantize a sprite to an 8-bit palette surface with a transparent colorkey"""
+    width, height = surface.get_size()
+    data = pygame.image.tobytes(surface, "RGBA")
+
+    # Index 0 is the colorkey; pixels under the alpha threshold become transparent
+    color_counts = {}
+    pixels = []
+    for i in range(0, len(data), 4):
+        if data[i + 3] < SPRITE_ALPHA_THRESHOLD:
+            pixels.append(None)
+        else:
+            color = (data[i], data[i + 1], data[i + 2])
+            color_counts[color] = color_counts.get(color, 0) + 1
+            pixels.append(color)
+
+    palette, mapping = median_cut(color_counts, SPRITE_PALETTE_SIZE) if color_counts else ([], {})
+    indices = bytes(0 if color is None else mapping[color] + 1 for color in pixels)
+
+    indexed = pygame.image.frombytes(indices, (width, height), "P")
+    indexed.set_palette([SPRITE_COLORKEY] + palette)
+
+    # RLE only pays off when there are long transparent runs to skip
+    transparent = pixels.count(None) / max(1, len(pixels))
+    flags = pygame.RLEACCEL if transparent >= SPRITE_RLE_MIN_TRANSPARENT else 0
+    indexed.set_colorkey(0, flags)
+    return indexed
+
+
+def sprite_bytes(surface):
+    """Estimate the pixel memory of a surface (plus its palette)"""
+    size = surface.get_pitch() * surface.get_height()
+    if surface.get_bitsize() == 8:
+        size += 256 * 4
+    return size
+
+
+def blit_time(surface, target, repeats=SPRITE_BLIT_REPEATS):
+    """Get the average time to blit a sprite onto the target in microseconds"""
+    target.blit(surface, (0, 0))  # RLE encoding happens on the first blit
+    start = time.perf_counter()
+    for _ in range(repeats):
+        target.blit(surface, (0, 0))
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def report(assets_path=ASSETS_PATH):
+    """Print memory and blit time of every sprite variant in both formats"""
+    target = pygame.display.get_surface()
+    totals = [0, 0, 0.0, 0.0]
+    print(f"{'sprite':<32} {'size':>7} {'colors':>6} {'bytes':>13} {'blit us':>13}")
+    for folder, sizes in ASSET_BUNDLE_VARIANTS.items():
+        folder_path = os.path.join(assets_path, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for file in sorted(os.listdir(folder_path)):
+            if not file.lower().endswith(".png"):
+                continue
+            image = pygame.image.load(os.path.join(folder_path, file)).convert_alpha()
+            for size in sizes:
+                alpha = pygame.transform.scale(image, size)
+                indexed = to_indexed(alpha)
+                alpha_bytes, indexed_bytes = sprite_bytes(alpha), sprite_bytes(indexed)
+                alpha_time, indexed_time = blit_time(alpha, target), blit_time(indexed, target)
+                colors = len(set(pygame.image.tobytes(indexed, "P")) - {0})
+                rle = "rle" if indexed.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK) else ""
+                print(f"{folder + '/' + file:<32} {size[0]:>3}x{size[1]:<3} {colors:>6} "
+                      f"{alpha_bytes:>6}>{indexed_bytes:<6} {alpha_time:>6.1f}>{indexed_time:<6.1f}{rle}")
+                totals[0] += alpha_bytes
+                totals[1] += indexed_bytes
+                totals[2] += alpha_time
+                totals[3] += indexed_time
+
+    if totals[0]:
+        print(f"Memory: {totals[0]} -> {totals[1]} bytes ({(1 - totals[1] / totals[0]) * 100:.0f}% saved)")
+        print(f"Blit time: {totals[2]:.1f} -> {totals[3]:.1f} us for one of each "
+              f"({(1 - totals[3] / totals[2]) * 100:.0f}% saved)")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    report(*sys.argv[1:2])
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 # MalinaPet - Input handling (joystick and buttons)
 
+import time
 import pygame
+import threading
 import RPi.GPIO as GPIO
 from src.constants import *
+from src.log import get_logger
+
+log = get_logger("input")
 
 class InputHandler:
     def __init__(self):
@@ -20,6 +25,18 @@ class InputHandler:
         GPIO.setup(KEY2_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         GPIO.setup(KEY3_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
+        # Map GPIO pins to button names
+        self.button_map = {
+            KEY_UP_PIN: "up",
+            KEY_DOWN_PIN: "down",
+            KEY_LEFT_PIN: "left",
+            KEY_RIGHT_PIN: "right",
+            KEY_PRESS_PIN: "press",
+            KEY1_PIN: "key1",
+            KEY2_PIN: "key2",
+            KEY3_PIN: "key3"
+        }
+
         # Initialize button states
         self.button_states = {
             "up": False,
@@ -42,11 +59,50 @@ class InputHandler:
 
         # Store raw button states
         self.raw_states = {button: False for button in self.button_states}
+
+        # Optional SessionRecorder that logs presses and releases
+        self.recorder = None
+
+        # Optional LatencyTracker given each accepted press with its GPIO edge time
+        self.latency = None
+        self.edge_times = {}
+
+        # Set from GPIO interrupts so power-save mode can sleep until a button is pressed
+        self.press_event = threading.Event()
+        for pin in self.button_map:
+            GPIO.add_event_detect(pin, GPIO.FALLING, callback=self.on_edge, bouncetime=50)
         
     def cleanup(self):
         """Clean up GPIO resources"""
         GPIO.cleanup()
 
+    def on_edge(self, pin):
+        """GPIO interrupt callback for a button going down"""
+        self.edge_times[self.button_map[pin]] = time.perf_counter()
+        self.press_event.set()
+
+    def edge_time(self, button):
+        """Get when a button's press edge came in (now, if no recent edge was seen)"""
+        now = time.perf_counter()
+        edge_time = self.edge_times.pop(button, None)
+        if edge_time is None or now - edge_time > LATENCY_EDGE_MAX:
+            return now
+        return edge_time
+
+    def wait_for_press(self, timeout):
+        """Sleep until a button is pressed or the timeout passes; return True if pressed"""
+        self.press_event.clear()
+        # A button may already be held down, which gives no new edge
+        if any(GPIO.input(pin) == 0 for pin in self.button_map):
+            return True
+        return self.press_event.wait(timeout)
+
+    def ignore_current_presses(self):
+        """Treat buttons pressed right now as already handled (e.g. a press that woke the screen)"""
+        current_time = pygame.time.get_ticks()
+        for button in self.last_pressed:
+            self.last_pressed[button] = current_time
+
     def update(self):
         """Update button states and handle events"""
         for event in pygame.event.get():
@@ -71,34 +127,28 @@ class InputHandler:
                         # Activate button
                         self.button_states[button_name] = True
                         self.last_pressed[button_name] = current_time
+                        if self.recorder is not None:
+                            self.recorder.button(button_name, True)
+                        if self.latency is not None:
+                            self.latency.press(button_name, self.edge_time(button_name))
                         return True
             # If button is active in our state and physically released
             elif not current_state:
                 # Deactivate button
                 self.button_states[button_name] = False
                 self.last_released[button_name] = current_time
+                if self.recorder is not None:
+                    self.recorder.button(button_name, False)
 
             return False
 
-        # Map GPIO pins to button names
-        button_map = {
-            KEY_UP_PIN: "up",
-            KEY_DOWN_PIN: "down",
-            KEY_LEFT_PIN: "left",
-            KEY_RIGHT_PIN: "right",
-            KEY_PRESS_PIN: "press",
-            KEY1_PIN: "key1",
-            KEY2_PIN: "key2",
-            KEY3_PIN: "key3"
-        }
-
         # Check all buttons with improved debouncing
-        for pin, button_name in button_map.items():
+        for pin, button_name in self.button_map.items():
             check_button(pin, button_name)
 
         # Check for KEY3 to exit the game
         if self.is_pressed("key3"):
-            print("KEY3 pressed - exiting game")
+            log.info("KEY3 pressed - exiting game")
             return False
 
         return True
@@ -107,7 +157,7 @@ class InputHandler:
         """Check if a button is pressed"""
         # Additional debug for conversation screen navigation issues
         if button == "up" and self.button_states.get(button, False):
-            print(f"UP button detected as pressed: {self.button_states.get(button, False)}")
+            log.debug("UP button detected as pressed")
 
         return self.button_states.get(button, False)
         
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# MalinaPet - Timing instrumentation
+
+import time
+from contextlib import contextmanager
+from src.log import get_logger
+
+log = get_logger("perf")
+
+
+def percentile(values, fraction):
+    """Get a percentile from a list of values"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class StartupTimer:
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.stages = []
+        self.reported = False
+
+    @contextmanager
+    def stage(self, name):
+        """Time a named startup stage"""
+        stage_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - stage_start))
+
+    def mark(self, name):
+        """Record a stage that ends now and started at the previous stage's end"""
+        elapsed = time.perf_counter() - self.start_time
+        accounted = sum(duration for _, duration in self.stages)
+        self.stages.append((name, max(0.0, elapsed - accounted)))
+
+    def total(self):
+        """Get the time since the timer was created in seconds"""
+        return time.perf_counter() - self.start_time
+
+    def report(self):
+        """Log a breakdown of boot time by stage (only once)"""
+        if self.reported:
+            return
+        self.reported = True
+
+        # One record, so the breakdown isn't split by the per-call-site rate limit
+        total = self.total()
+        stages = ", ".join(f"{name} {duration * 1000:.1f} ms ({duration / total * 100 if total > 0 else 0:.1f}%)"
+                           for name, duration in self.stages)
+        log.info("Startup timing: %.0f ms to first frame: %s", total * 1000, stages)
+
+
+# Live values published by subsystems (e.g. the thermal governor), read by name
+_gauges = {}
+
+
+def register_gauge(name, read):
+    """Publish a value; read is called whenever the gauges are read"""
+    _gauges[name] = read
+
+
+def read_gauges():
+    """Get the current value of every registered gauge"""
+    return {name: read() for name, read in _gauges.items()}
+
+
+def report_gauges():
+    """Log the current value of every registered gauge"""
+    log.info("Gauges: %s", "; ".join(f"{name} {value}" for name, value in read_gauges().items()))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# MalinaPet - Input-to-photon latency tracking
+#
+# Each accepted button press is tagged with its GPIO edge time. The tag moves
+# with the frame: the screen update that sees the press, then the next frame
+# handed to Display.update(), and it is closed when that frame has been pushed
+# to the panel (on the presenter thread, if there is one). Latencies are kept
+# as histograms per (screen, button).
+
+import time
+import bisect
+import threading
+from collections import deque
+from src.constants import *
+from src.instrumentation import register_gauge, percentile
+
+
+class LatencyTracker:
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets  # Upper bucket edges in ms; the last bucket counts anything slower
+        self.pending = []  # (button, edge time) accepted by the input, not yet seen by a screen
+        self.frame = []  # (button, edge time, screen) waiting for the next presented frame
+
+        # Presses are closed on the presenter thread
+        self.lock = threading.Lock()
+        self.histograms = {}  # (screen, button) -> count per bucket
+        self.samples = {}  # (screen, button) -> recent latencies in ms
+
+    def press(self, button, edge_time):
+        """Tag a press accepted by the input handler"""
+        self.pending.append((button, edge_time))
+
+    def updated(self, screen):
+        """Attribute the pending presses to the screen whose update() just handled them"""
+        if self.pending:
+            self.frame.extend((button, edge_time, screen) for button, edge_time in self.pending)
+            self.pending = []
+
+    def take_frame(self):
+        """Get the tags that the frame being presented answers"""
+        tags, self.frame = self.frame, []
+        return tags
+
+    def presented(self, tags, when=None):
+        """Record the latency of each tag once its frame is on the panel"""
+        when = time.perf_counter() if when is None else when
+        with self.lock:
+            for button, edge_time, screen in tags:
+                latency = (when - edge_time) * 1000
+                key = (screen, button)
+                counts = self.histograms.setdefault(key, [0] * (len(self.buckets) + 1))
+                counts[bisect.bisect_left(self.buckets, latency)] += 1
+                self.samples.setdefault(key, deque(maxlen=LATENCY_SAMPLES)).append(latency)
+
+    def histogram(self, screen=None, button=None):
+        """Get bucket counts summed over the matching screens and buttons"""
+        total = [0] * (len(self.buckets) + 1)
+        with self.lock:
+            for (key_screen, key_button), counts in self.histograms.items():
+                if screen in (None, key_screen) and button in (None, key_button):
+                    total = [a + b for a, b in zip(total, counts)]
+        return total
+
+    def latencies(self, screen=None, button=None):
+        """Get the recent latencies in ms for the matching screens and buttons"""
+        with self.lock:
+            return [latency for (key_screen, key_button), samples in self.samples.items()
+                    if screen in (None, key_screen) and button in (None, key_button)
+                    for latency in samples]
+
+    def keys(self):
+        with self.lock:
+            return sorted(self.histograms)
+
+    def summary(self, screen=None, button=None):
+        """Get count, p50, p95 and max latency in ms"""
+        values = self.latencies(screen, button)
+        if not values:
+            return {"count": 0}
+        return {
+            "count": len(values),
+            "p50": round(percentile(values, 0.5), 1),
+            "p95": round(percentile(values, 0.95), 1),
+            "max": round(max(values), 1)
+        }
+
+    def state(self):
+        """Get latency summaries per screen and per button for instrumentation"""
+        keys = self.keys()
+        return {
+            "screens": {screen: self.summary(screen=screen) for screen in sorted({s for s, _ in keys})},
+            "buttons": {button: self.summary(button=button) for button in sorted({b for _, b in keys})}
+        }
+
+    def report(self):
+        """Print a histogram row and summary for each screen and button"""
+        edges = [f"<{edge}" for edge in self.buckets] + [f">{self.buckets[-1]}"]
+        print(f"{'screen':<14} {'button':<7} " + " ".join(f"{edge:>5}" for edge in edges) +
+              f" {'p50':>6} {'p95':>6} {'max':>6}")
+        for screen, button in self.keys():
+            summary = self.summary(screen, button)
+            counts = self.histogram(screen, button)
+            print(f"{screen:<14} {button:<7} " + " ".join(f"{count:>5}" for count in counts) +
+                  f" {summary['p50']:>6} {summary['p95']:>6} {summary['max']:>6}")
+
+    def register(self):
+        register_gauge("latency", self.state)
+        return self
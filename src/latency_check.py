@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# MalinaPet - Headless press-to-present latency check against the budgets
+#
+# Plays a scripted session (adopt a pet, then cycle through toolbar actions
+# and the stats screen) through the real game loop on an offscreen display,
+# with each button edge landing at a random point of the previous frame, and
+# fails if any screen's latency is over budget:
+#     python -m src.latency_check --presses 60 --transfer-ms 20 --present-thread
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from src.constants import *
+from src.display import Display
+from src.framebuffer_display import FramebufferDisplay
+from src.headless import ScriptedInput
+from src.ai_backends import AIBackend
+from src.ai_budget import unlimited_budget
+from src.ai_integration import AIHandler
+from src.latency import LatencyTracker
+from src.presenter import FramePresenter
+from src.game import Game
+
+# Buttons pressed on the main screen in turn; "left" opens the stats screen,
+# where "up" flips the page and "right" goes back
+CHECK_CYCLE = ["key1", "key2", "key1", "left", "up", "right"]
+CHECK_PRESS_GAP = 4  # Frames between presses
+CHECK_LOOP_SLEEP = 0.01  # Same pause as the main loop
+
+
+def build_script(presses):
+    """Adopt on the first press, then cycle through CHECK_CYCLE"""
+    script = [(2, "press")]
+    for i in range(presses):
+        script.append((2 + (i + 1) * CHECK_PRESS_GAP, CHECK_CYCLE[i % len(CHECK_CYCLE)]))
+    return script
+
+
+def run_check(presses=60, transfer_ms=0.0, present_thread=False, seed=1):
+    """Run the scripted session and return the latency tracker"""
+    random.seed(seed)
+    fb_path = None
+    if present_thread:
+        # Only the framebuffer display presents off the main thread; a plain
+        # file stands in for the panel
+        fd, fb_path = tempfile.mkstemp(suffix=".fb")
+        os.close(fd)
+        display = FramebufferDisplay(fb_path)
+        display.initialize()
+    else:
+        display = Display()
+        display.initialize_headless()
+    display.fps = FPS
+    tracker = LatencyTracker()
+    display.latency = tracker
+
+    if transfer_ms:
+        present = display.present
+
+        def slow_present(frame):
+            time.sleep(transfer_ms / 1000)  # Stand-in for a slow SPI panel
+            present(frame)
+
+        display.present = slow_present
+
+    presenter = None
+    if present_thread:
+        presenter = FramePresenter(display)
+        presenter.start()
+
+    # Presses land anywhere during the previous frame and its loop pause
+    frame_period = 1.0 / FPS + CHECK_LOOP_SLEEP
+    script = build_script(presses)
+    input_handler = ScriptedInput(script, edge_lead=lambda: random.uniform(0, frame_period))
+    input_handler.latency = tracker
+
+    ai_handler = AIHandler(backend=AIBackend(), budget=unlimited_budget())
+    ai_handler.wait_until_ready()
+    game = Game(display, input_handler, ai_handler)
+
+    try:
+        for _ in range(script[-1][0] + 3):
+            input_handler.update()
+            game.step()
+            time.sleep(CHECK_LOOP_SLEEP)
+    finally:
+        if presenter is not None:
+            presenter.stop()
+        if fb_path is not None:
+            display.cleanup()
+            os.remove(fb_path)
+    return tracker
+
+
+def check_budgets(tracker, budget_p95=LATENCY_BUDGET_P95_MS, budget_max=LATENCY_BUDGET_MAX_MS):
+    """Get a list of budget violations, one line each"""
+    failures = []
+    for screen in sorted({screen for screen, _ in tracker.keys()}):
+        summary = tracker.summary(screen=screen)
+        if summary["p95"] > budget_p95:
+            failures.append(f"{screen}: p95 {summary['p95']} ms over {budget_p95} ms")
+        if summary["max"] > budget_max:
+            failures.append(f"{screen}: max {summary['max']} ms over {budget_max} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check press-to-present latency headlessly")
+    parser.add_argument("--presses", type=int, default=60)
+    parser.add_argument("--transfer-ms", type=float, default=0.0, help="Simulated panel transfer time")
+    parser.add_argument("--present-thread", action="store_true")
+    parser.add_argument("--budget-p95", type=float, default=LATENCY_BUDGET_P95_MS)
+    parser.add_argument("--budget-max", type=float, default=LATENCY_BUDGET_MAX_MS)
+    args = parser.parse_args()
+
+    tracker = run_check(args.presses, args.transfer_ms, args.present_thread)
+    tracker.report()
+
+    expected = args.presses + 1
+    measured = tracker.summary()["count"]
+    failures = check_budgets(tracker, args.budget_p95, args.budget_max)
+    if measured != expected:
+        failures.append(f"{expected - measured} of {expected} presses never reached the panel")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {measured} presses within p95 {args.budget_p95:.0f} ms and max {args.budget_max:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# MalinaPet - Declarative screen layout resolved to rects once per display size
+#
+# A screen describes its layout as a tree of nodes (anchored boxes, rows,
+# columns, grids, text) and asks for the rects when it draws. They are only
+# recomputed when the display size or fonts change:
+#     self.layout = Layout(
+#         Anchor(Text("Choose Your Pet", name="title"), "midtop", margin=10),
+#         Anchor(Grid([Box(75, 30) for _ in range(4)], columns=2, spacing=(10, 15), name="buttons")),
+#     )
+#     rects = self.layout.resolve(self.display)  # {"title": Rect, "buttons": [Rect, ...]}
+
+import pygame
+
+
+class Node:
+    """Layout element; named nodes record their rect in the resolved layout"""
+
+    def __init__(self, name=None):
+        self.name = name
+
+    def measure(self, display):
+        """Get the (width, height) this node needs"""
+        raise NotImplementedError
+
+    def place(self, rect, display, rects):
+        """Position the node (and its children) in rect"""
+        if self.name:
+            rects[self.name] = rect
+
+
+class Box(Node):
+    """Fixed-size element such as a button, icon or stat bar"""
+
+    def __init__(self, width, height, name=None):
+        super().__init__(name)
+        self.size = (width, height)
+
+    def measure(self, display):
+        return self.size
+
+
+class Text(Node):
+    """Single line of text, measured with one of the display fonts"""
+
+    def __init__(self, text, font="font", name=None):
+        super().__init__(name)
+        self.text = text
+        self.font = font  # Display attribute: "font" or "small_font"
+
+    def measure(self, display):
+        return getattr(display, self.font).size(self.text)
+
+
+def align_in(size, rect, align):
+    """Place a size inside rect at one of pygame's Rect anchors ("center", "midleft", ...)"""
+    placed = pygame.Rect((0, 0), size)
+    setattr(placed, align, getattr(rect, align))
+    return placed
+
+
+class Anchor(Node):
+    """Pin a child to a point of its area (usually the screen), inset by a margin"""
+
+    def __init__(self, child, anchor="center", margin=0, name=None):
+        super().__init__(name)
+        self.child = child
+        self.anchor = anchor
+        self.margin = margin if isinstance(margin, tuple) else (margin, margin)
+
+    def measure(self, display):
+        return self.child.measure(display)
+
+    def place(self, rect, display, rects):
+        area = rect.inflate(-2 * self.margin[0], -2 * self.margin[1])
+        placed = align_in(self.child.measure(display), area, self.anchor)
+        super().place(placed, display, rects)
+        self.child.place(placed, display, rects)
+
+
+class Row(Node):
+    """Children side by side, aligned vertically by "top", "center" or "bottom" """
+
+    def __init__(self, children, spacing=0, align="center", name=None):
+        super().__init__(name)
+        self.children = children
+        self.spacing = spacing
+        self.align = align
+
+    def measure(self, display):
+        sizes = [child.measure(display) for child in self.children]
+        return (sum(width for width, _ in sizes) + self.spacing * max(0, len(sizes) - 1),
+                max((height for _, height in sizes), default=0))
+
+    def place(self, rect, display, rects):
+        super().place(rect, display, rects)
+        x = rect.left
+        for child in self.children:
+            width, height = child.measure(display)
+            cell = pygame.Rect(x, rect.top, width, rect.height)
+            anchor = {"top": "midtop", "bottom": "midbottom"}.get(self.align, "center")
+            child.place(align_in((width, height), cell, anchor), display, rects)
+            x += width + self.spacing
+
+
+class Column(Node):
+    """Children stacked top to bottom, aligned by "left", "center" or "right" """
+
+    def __init__(self, children, spacing=0, align="center", name=None):
+        super().__init__(name)
+        self.children = children
+        self.spacing = spacing
+        self.align = align
+
+    def measure(self, display):
+        sizes = [child.measure(display) for child in self.children]
+        return (max((width for width, _ in sizes), default=0),
+                sum(height for _, height in sizes) + self.spacing * max(0, len(sizes) - 1))
+
+    def place(self, rect, display, rects):
+        super().place(rect, display, rects)
+        y = rect.top
+        for child in self.children:
+            width, height = child.measure(display)
+            cell = pygame.Rect(rect.left, y, rect.width, height)
+            anchor = {"left": "midleft", "right": "midright"}.get(self.align, "center")
+            child.place(align_in((width, height), cell, anchor), display, rects)
+            y += height + self.spacing
+
+
+class Grid(Node):
+    """Children in a table, row by row. Each column is as wide as its widest
+    child and each row as tall as its tallest; children sit in their cell at
+    the given Rect anchor. A named grid records the list of cell rects."""
+
+    def __init__(self, children, columns, spacing=(0, 0), align="center", name=None):
+        super().__init__(None)
+        self.grid_name = name
+        self.children = children
+        self.columns = columns
+        self.spacing = spacing
+        self.align = align
+
+    def tracks(self, display):
+        """Get the column widths and row heights"""
+        widths = [0] * self.columns
+        heights = [0] * ((len(self.children) + self.columns - 1) // self.columns)
+        for i, child in enumerate(self.children):
+            width, height = child.measure(display)
+            column, row = i % self.columns, i // self.columns
+            widths[column] = max(widths[column], width)
+            heights[row] = max(heights[row], height)
+        return widths, heights
+
+    def measure(self, display):
+        widths, heights = self.tracks(display)
+        return (sum(widths) + self.spacing[0] * max(0, len(widths) - 1),
+                sum(heights) + self.spacing[1] * max(0, len(heights) - 1))
+
+    def place(self, rect, display, rects):
+        widths, heights = self.tracks(display)
+        lefts = [rect.left + sum(widths[:i]) + self.spacing[0] * i for i in range(len(widths))]
+        tops = [rect.top + sum(heights[:i]) + self.spacing[1] * i for i in range(len(heights))]
+        cells = []
+        for i, child in enumerate(self.children):
+            column, row = i % self.columns, i // self.columns
+            cell = pygame.Rect(lefts[column], tops[row], widths[column], heights[row])
+            placed = align_in(child.measure(display), cell, self.align)
+            child.place(placed, display, rects)
+            cells.append(placed)
+        if self.grid_name:
+            rects[self.grid_name] = cells
+
+
+class Layout:
+    """Top-level nodes, each placed in the whole screen, with the rects cached
+    until the display size or fonts change"""
+
+    def __init__(self, *nodes):
+        self.nodes = nodes
+        self.key = None
+        self.rects = None
+
+    def resolve(self, display):
+        """Get the rects by node name"""
+        key = (display.width, display.height, id(display.font), id(display.small_font))
+        if key != self.key:
+            rects = {}
+            screen = pygame.Rect(0, 0, display.width, display.height)
+            for node in self.nodes:
+                node.place(screen, display, rects)
+            self.rects = rects
+            self.key = key
+        return self.rects
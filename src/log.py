@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# MalinaPet - Non-blocking logging through an in-memory ring buffer
+#
+# A logging call only checks the level and appends a record to a deque; a
+# background thread formats the records and writes them out, so a slow console
+# or journald never stalls a frame. Each call site gets LOG_RATE_BURST records
+# per LOG_RATE_INTERVAL and the rest are counted as suppressed. The most recent
+# LOG_BUFFER_SIZE records stay in memory and are dumped to a file on a crash.
+#     log = get_logger("input")
+#     log.info("Button pressed", button="up")
+
+import sys
+import time
+import atexit
+import threading
+import traceback
+from collections import deque
+from src.constants import *
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+LEVEL_NAMES = {value: name.upper() for name, value in LEVELS.items()}
+
+
+def format_record(record):
+    """Format one (time, level, logger, message, args, fields, traceback) record"""
+    timestamp, level, name, message, args, fields, trace = record
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = f"{message} {args}"
+    if fields:
+        message += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+    stamp = time.strftime("%H:%M:%S", time.localtime(timestamp))
+    line = f"{stamp}.{int(timestamp % 1 * 1000):03d} {LEVEL_NAMES[level]:<7} {name}: {message}\n"
+    return line + trace if trace else line
+
+
+class LogWriter:
+    """Ring buffer of records and the thread that writes them out"""
+
+    def __init__(self, buffer_size=LOG_BUFFER_SIZE, pending_max=LOG_PENDING_MAX):
+        self.history = deque(maxlen=buffer_size)
+        self.pending = deque()
+        self.pending_max = pending_max
+        self.dropped = 0
+        self.path = None  # None writes to stdout
+
+        # Rate limit windows per call site: [window start, records, suppressed]
+        self.sites = {}
+
+        self.lock = threading.Lock()  # One writer at a time (the thread, or a flush)
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def add(self, record):
+        """Queue a record (never blocks on I/O)"""
+        self.history.append(record)
+        if len(self.pending) < self.pending_max:
+            self.pending.append(record)
+        else:
+            self.dropped += 1
+        if self.thread is None:
+            self.start()
+        if record[1] >= WARNING:
+            self.wakeup.set()
+
+    def allow(self, site, timestamp):
+        """Check a call site's rate limit, noting how much it suppressed when a window ends"""
+        window = self.sites.get(site)
+        if window is None or timestamp - window[0] >= LOG_RATE_INTERVAL:
+            self.sites[site] = [timestamp, 1, 0]
+            return window[2] if window is not None else 0
+        if window[1] >= LOG_RATE_BURST:
+            window[2] += 1
+            return None
+        window[1] += 1
+        return 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(LOG_WRITE_INTERVAL)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Write out everything queued so far"""
+        with self.lock:
+            lines = []
+            while self.pending:
+                lines.append(format_record(self.pending.popleft()))
+            if self.dropped:
+                lines.append(f"{self.dropped} log records dropped (writer fell behind)\n")
+                self.dropped = 0
+            if not lines:
+                return
+            try:
+                if self.path:
+                    with open(self.path, 'a') as f:
+                        f.writelines(lines)
+                else:
+                    sys.stdout.writelines(lines)
+                    sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+    def notice(self, line):
+        """Write a line to stderr right away, after the records written so far"""
+        with self.lock:
+            try:
+                sys.stderr.write(line + "\n")
+                sys.stderr.flush()
+            except (OSError, ValueError):
+                pass
+
+    def dump(self, path=LOG_CRASH_PATH):
+        """Write the in-memory history to a file, e.g. after a crash"""
+        try:
+            with open(path, 'w') as f:
+                f.writelines(format_record(record) for record in list(self.history))
+            return True
+        except OSError:
+            return False
+
+
+class Logger:
+    """Named logger with its own level, sharing the writer"""
+
+    def __init__(self, name, writer, level=INFO):
+        self.name = name
+        self.writer = writer
+        self.level = level
+
+    def _log(self, level, message, args, fields, trace=None):
+        # Called through debug() etc., so the call site is two frames up
+        caller = sys._getframe(2)
+        timestamp = time.time()
+        suppressed = self.writer.allow((caller.f_code, caller.f_lineno), timestamp)
+        if suppressed is None:
+            return
+        if suppressed:
+            fields = dict(fields, suppressed=suppressed)
+        self.writer.add((timestamp, level, self.name, message, args, fields, trace))
+
+    def debug(self, message, *args, **fields):
+        if self.level <= DEBUG:
+            self._log(DEBUG, message, args, fields)
+
+    def info(self, message, *args, **fields):
+        if self.level <= INFO:
+            self._log(INFO, message, args, fields)
+
+    def warning(self, message, *args, **fields):
+        if self.level <= WARNING:
+            self._log(WARNING, message, args, fields)
+
+    def error(self, message, *args, **fields):
+        if self.level <= ERROR:
+            self._log(ERROR, message, args, fields)
+
+    def exception(self, message, *args, **fields):
+        """Log an error with the traceback of the exception being handled"""
+        self._log(ERROR, message, args, fields, traceback.format_exc())
+
+
+writer = LogWriter()
+loggers = {}
+default_level = LEVELS[LOG_LEVEL]
+level_overrides = {}
+atexit.register(writer.flush)
+
+
+def get_logger(name):
+    """Get the logger for a part of the game (one per module)"""
+    if name not in loggers:
+        loggers[name] = Logger(name, writer, level_overrides.get(name, default_level))
+    return loggers[name]
+
+
+def parse_level(level):
+    if level not in LEVELS:
+        get_logger("log").warning("Unknown log level %s, using %s", level, LOG_LEVEL)
+        return LEVELS[LOG_LEVEL]
+    return LEVELS[level]
+
+
+def configure_logging(level=LOG_LEVEL, overrides=None, path=None):
+    """Set the default level, per-logger levels ({"input": "debug"}) and output file"""
+    global default_level, level_overrides
+    default_level = parse_level(level)
+    level_overrides = {name: parse_level(value) for name, value in (overrides or {}).items()}
+    for name, logger in loggers.items():
+        logger.level = level_overrides.get(name, default_level)
+    writer.flush()
+    writer.path = path or None
+
+
+def install_crash_handler(path=LOG_CRASH_PATH):
+    """Log and dump the ring buffer when the main thread or a background thread dies"""
+    def crash(exc_type, exc_value, exc_traceback, thread):
+        trace = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+        writer.add((time.time(), ERROR, "crash", "Uncaught exception in thread %s", (thread,), {}, trace))
+        dump_log(path)
+
+    def excepthook(exc_type, exc_value, exc_traceback):
+        # Ctrl+C before the main loop is not a crash
+        if issubclass(exc_type, KeyboardInterrupt):
+            sys.__excepthook__(exc_type, exc_value, exc_traceback)
+            return
+        crash(exc_type, exc_value, exc_traceback, threading.current_thread().name)
+
+    def thread_excepthook(args):
+        thread = args.thread.name if args.thread is not None else "?"
+        crash(args.exc_type, args.exc_value, args.exc_traceback, thread)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+
+def dump_log(path=LOG_CRASH_PATH):
+    """Flush the writer and save the recent records to a file"""
+    writer.flush()
+    if writer.dump(path):
+        writer.notice(f"Recent log written to {path}")
+    else:
+        writer.notice(f"Could not write the recent log to {path}")
+
+
+def flush_log():
+    writer.flush()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# MalinaPet - Remote screen mirroring over a local socket
+#
+# Presented frames are split into tiles, and only tiles that changed since the
+# last sent frame are compressed and streamed, so an idle screen sends nothing.
+# Watch a device (through an SSH tunnel for remote ones) with:
+#     python -m src.mirror --view 127.0.0.1 --scale 4
+#
+# Stream format: a hello (magic, width, height, tile size), then frames made
+# of a header (frame number, tile count) and per tile its column, row,
+# compressed length and zlib-compressed RGB pixels.
+
+import time
+import zlib
+import select
+import socket
+import struct
+import argparse
+import threading
+import pygame
+from src.constants import *
+from src.instrumentation import register_gauge
+from src.log import get_logger
+
+log = get_logger("mirror")
+
+MIRROR_MAGIC = b"MPMR"
+MIRROR_HELLO = struct.Struct("<4sHHH")
+MIRROR_FRAME = struct.Struct("<IH")
+MIRROR_TILE = struct.Struct("<HHI")
+
+
+def split_tiles(pixels, width, height, tile_size):
+    """Split packed RGB pixels into {(column, row): tile bytes}"""
+    pitch = width * 3
+    tiles = {}
+    for top in range(0, height, tile_size):
+        bottom = min(top + tile_size, height)
+        for left in range(0, width, tile_size):
+            start, end = left * 3, min(left + tile_size, width) * 3
+            tiles[(left // tile_size, top // tile_size)] = b"".join(
+                pixels[y * pitch + start:y * pitch + end] for y in range(top, bottom))
+    return tiles
+
+
+class ScreenMirror:
+    def __init__(self, host=MIRROR_HOST, port=MIRROR_PORT, tile_size=MIRROR_TILE_SIZE, max_fps=MIRROR_MAX_FPS):
+        self.host = host
+        self.port = port
+        self.tile_size = tile_size
+        self.min_interval = 1.0 / max_fps
+
+        self.server = None
+        self.clients = []
+        self.joining = []  # Connected viewers that haven't been sent a full frame yet
+        self.lock = threading.Lock()
+        self.running = False
+
+        # Only the newest captured frame is kept; the sender drops the rest
+        self.pending = None
+        self.frame_ready = threading.Condition(self.lock)
+        self.last_capture = 0
+        self.size = None
+
+        # What the viewers have, as tiles, for diffing
+        self.sent_tiles = {}
+        self.frame_number = 0
+        self.bytes_sent = 0
+        self.frames_sent = 0
+
+        register_gauge("mirror", self.state)
+
+    def start(self):
+        """Listen for viewers and start the sender thread"""
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((self.host, self.port))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept_loop, name="mirror-accept", daemon=True).start()
+        threading.Thread(target=self._send_loop, name="mirror-send", daemon=True).start()
+        log.info("Screen mirror listening on %s:%d", self.host, self.port)
+
+    def capture(self, surface):
+        """Frame listener: grab the frame for the sender if a viewer wants one"""
+        # Nothing to do without viewers, and capture at most max_fps frames per second
+        if not self.clients and not self.joining:
+            return
+        now = time.monotonic()
+        if now - self.last_capture < self.min_interval:
+            return
+        self.last_capture = now
+
+        # The copy is the only work done on the game loop's time
+        pixels = pygame.image.tobytes(surface, "RGB")
+        with self.lock:
+            self.pending = (pixels, surface.get_size())
+            self.frame_ready.notify()
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                client, address = self.server.accept()
+            except OSError:
+                break
+            client.settimeout(MIRROR_SEND_TIMEOUT)
+            log.info("Mirror viewer connected from %s", address[0])
+            with self.lock:
+                self.joining.append(client)
+                self.frame_ready.notify()
+
+    def _send_loop(self):
+        latest = None
+        while self.running:
+            with self.lock:
+                while self.running and self.pending is None and not self.joining:
+                    self.frame_ready.wait()
+                if not self.running:
+                    break
+                if self.pending is not None:
+                    latest = self.pending
+                    self.pending = None
+                # Newcomers need every tile, so they trigger a full frame
+                if self.joining:
+                    self.clients.extend(self.joining)
+                    self.joining = []
+                    self.sent_tiles = {}
+                clients = list(self.clients)
+
+            if latest is None:
+                continue
+            full = not self.sent_tiles
+            message = self.encode_frame(*latest, full)
+            if message is None:
+                continue
+            for client in clients:
+                self._send(client, message, full)
+
+    def encode_frame(self, pixels, size, full):
+        """Encode the tiles that changed since the last sent frame, or None if none did"""
+        width, height = size
+        tiles = split_tiles(pixels, width, height, self.tile_size)
+        changed = [(position, data) for position, data in tiles.items()
+                   if full or self.sent_tiles.get(position) != data]
+        if not changed:
+            return None
+
+        self.size = size
+        self.sent_tiles = tiles
+        self.frame_number += 1
+        parts = [MIRROR_FRAME.pack(self.frame_number, len(changed))]
+        for (column, row), data in changed:
+            compressed = zlib.compress(data, 6)
+            parts.append(MIRROR_TILE.pack(column, row, len(compressed)))
+            parts.append(compressed)
+        return b"".join(parts)
+
+    def _send(self, client, message, full):
+        try:
+            if full:
+                client.sendall(MIRROR_HELLO.pack(MIRROR_MAGIC, self.size[0], self.size[1], self.tile_size))
+            client.sendall(message)
+            self.bytes_sent += len(message)
+            self.frames_sent += 1
+        except OSError:
+            log.info("Mirror viewer disconnected")
+            with self.lock:
+                if client in self.clients:
+                    self.clients.remove(client)
+            client.close()
+
+    def state(self):
+        """Get the mirror state for instrumentation"""
+        return {"viewers": len(self.clients), "frames": self.frames_sent, "bytes": self.bytes_sent}
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            self.frame_ready.notify()
+        if self.server is not None:
+            self.server.close()
+        for client in self.clients + self.joining:
+            client.close()
+
+
+def receive_exactly(sock, length):
+    data = b""
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise ConnectionError("Mirror stream closed")
+        data += chunk
+    return data
+
+
+def view(host, port=MIRROR_PORT, scale=4):
+    """Show a mirrored screen in a window"""
+    pygame.init()
+    sock = socket.create_connection((host, port))
+    window = None
+    frame = None
+    tile_size = MIRROR_TILE_SIZE
+    total_bytes = 0
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+
+            # Keep the window responsive while the screen is idle and nothing arrives
+            if not select.select([sock], [], [], 0.1)[0]:
+                continue
+
+            # A hello arrives first and again whenever the server restarts the stream
+            header = receive_exactly(sock, 4)
+            if header == MIRROR_MAGIC:
+                _, width, height, tile_size = MIRROR_HELLO.unpack(header + receive_exactly(sock, MIRROR_HELLO.size - 4))
+                if frame is None or frame.get_size() != (width, height):
+                    frame = pygame.Surface((width, height))
+                    window = pygame.display.set_mode((width * scale, height * scale))
+                header = receive_exactly(sock, 4)
+
+            number, count = MIRROR_FRAME.unpack(header + receive_exactly(sock, MIRROR_FRAME.size - 4))
+            for _ in range(count):
+                column, row, length = MIRROR_TILE.unpack(receive_exactly(sock, MIRROR_TILE.size))
+                data = zlib.decompress(receive_exactly(sock, length))
+                total_bytes += MIRROR_TILE.size + length
+                left, top = column * tile_size, row * tile_size
+                tile_width = min(tile_size, frame.get_width() - left)
+                tile = pygame.image.frombytes(data, (tile_width, len(data) // (tile_width * 3)), "RGB")
+                frame.blit(tile, (left, top))
+
+            pygame.transform.scale(frame, window.get_size(), window)
+            pygame.display.set_caption(f"MalinaPet mirror - frame {number}, {total_bytes // 1024} KB")
+            pygame.display.flip()
+    finally:
+        sock.close()
+        pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="View a MalinaPet screen mirror")
+    parser.add_argument("--view", default=MIRROR_HOST, help="Host to connect to")
+    parser.add_argument("--port", type=int, default=MIRROR_PORT)
+    parser.add_argument("--scale", type=int, default=4)
+    args = parser.parse_args()
+    view(args.view, args.port, args.scale)
+
+
+if __name__ == "__main__":
+    main()
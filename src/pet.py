@@ -3,17 +3,47 @@
 
 import os
 import pygame
-import time
 import random
+import weakref
 from src.constants import *
+from src import clock
+from src.session_recording import next_seed
+from src.asset_bundle import load_asset
+from src.stat_history import StatHistory
+from src.timers import TimerQueue
+from src.log import get_logger
+
+log = get_logger("pet")
+
+TIMER_STATS = "stats"
+TIMER_POOP = "poop"
+TIMER_CONVERSATION = "conversation"
+
+
+class PetEvent:
+    """A change to a pet, passed to its subscribers"""
+
+    def __init__(self, kind, pet, name=None, old=None, new=None):
+        self.kind = kind  # One of the PET_EVENT_* constants
+        self.pet = pet
+        self.name = name  # Stat or need name, mess type
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"PetEvent({self.kind}, {self.name}, {self.old} -> {self.new})"
 
 
 class Pet:
-    def __init__(self, pet_type, name, ai_generated=False):
+    def __init__(self, pet_type, name, ai_generated=False, rng=None):
         self.pet_type = pet_type
         self.name = name
         self.ai_generated = ai_generated
-        self.birth_time = time.time()
+        self.birth_time = clock.now()
+
+        # Random events (poops, mess positions, intervals) use the pet's own
+        # generator, whose seed is recorded so sessions replay exactly
+        self.rng = rng if rng is not None else random.Random(next_seed())
 
         # Initialize stats
         self.stats = {
@@ -26,8 +56,16 @@ class Pet:
         # Pet state
         self.state = STATE_NORMAL
 
-        # Load pet image
-        self.image = self.load_pet_image()
+        # Change listeners as (callback, kinds); bound methods are held weakly
+        # so a screen that is thrown away stops receiving events
+        self.subscribers = []
+
+        # Fixed-memory history of the stats, sampled on every stat decrease
+        self.history = StatHistory(self.stats.keys())
+        self.history.record(self.stats)
+
+        # The image is loaded on first use, so pets can be simulated without a display
+        self._image = None
 
         # Mess properties
         self.mess_positions = []
@@ -35,7 +73,7 @@ class Pet:
         self.max_mess = 3
 
         # Stat decrease timer
-        self.last_stat_decrease = time.time()
+        self.last_stat_decrease = clock.now()
 
         # Need indicators
         self.needs_feeding = False
@@ -43,19 +81,30 @@ class Pet:
         self.needs_conversation = False
 
         # Special event timers
-        self.last_poop_time = time.time()
-        self.last_conversation_time = time.time()
-        self.poop_interval = random.randint(60, 120)  # 1-2 minutes between poops
-        self.conversation_interval = random.randint(120, 240)  # 2-4 minutes between conversation needs
+        self.last_poop_time = clock.now()
+        self.last_conversation_time = clock.now()
+        self.poop_interval = self.rng.randint(60, 120)  # 1-2 minutes between poops
+        self.conversation_interval = self.rng.randint(120, 240)  # 2-4 minutes between conversation needs
+
+        # Deadlines of the timers above, so update() only works when one fires
+        self.timers = TimerQueue()
+        self.timers.schedule(TIMER_STATS, self.stat_due())
+        self.timers.schedule(TIMER_POOP, self.poop_due())
+        self.timers.schedule(TIMER_CONVERSATION, self.conversation_due())
+
+    @property
+    def image(self):
+        if self._image is None:
+            self._image = self.load_pet_image()
+        return self._image
 
     def load_pet_image(self):
         """Load the pet image"""
         try:
             image_path = f"{PETS_PATH}/{self.pet_type}Tami.png"
-            image = pygame.image.load(image_path).convert_alpha()
-            return pygame.transform.scale(image, PET_SIZE)
+            return load_asset(image_path, PET_SIZE, bundled=not self.ai_generated)
         except Exception as e:
-            print(f"Error loading pet image: {e}")
+            log.error("Error loading pet image: %s", e)
             # Create a placeholder
             image = pygame.Surface(PET_SIZE)
             image.fill(GRAY)
@@ -63,34 +112,114 @@ class Pet:
 
     def update(self):
         """Update pet state and stats"""
-        current_time = time.time()
-
-        # Decrease stats over time
-        if current_time - self.last_stat_decrease > STATS_DECREASE_INTERVAL:
-            self.decrease_stats()
-            self.last_stat_decrease = current_time
-
-        # Check for poop generation
-        if current_time - self.last_poop_time > self.poop_interval:
-            self.add_mess("poop")
-            self.last_poop_time = current_time
-            self.poop_interval = random.randint(60, 120)  # Reset interval
-
-        # Check for conversation need
-        if current_time - self.last_conversation_time > self.conversation_interval:
-            self.needs_conversation = True
-
-        # Update need indicators
-        self.needs_feeding = self.stats[STAT_HUNGER] < 30
-        self.needs_healing = self.stats[STAT_HEALTH] < 30
-
-        # Also set needs_conversation based on happiness (in addition to timer)
-        if self.stats[STAT_HAPPINESS] < 80:
-            self.needs_conversation = True
-
-        # If health drops to zero, pet dies
-        if self.stats[STAT_HEALTH] <= 0:
-            self.state = STATE_DEAD
+        # Everything that came due since the last update fires in time order,
+        # so a long gap between updates (e.g. in power-save mode) ends in the
+        # same state as updating every frame would
+        for timer, _ in self.timers.pop_due(clock.now()):
+            if timer == TIMER_STATS:
+                self.fire_stat_timer()
+            elif timer == TIMER_POOP:
+                self.fire_poop_timer()
+            else:
+                self.fire_conversation_timer()
+
+    def next_deadline(self):
+        """Get the time of the next timer, before which update() has nothing to do
+        unless an action changes the pet"""
+        return self.timers.next_deadline()
+
+    def stat_due(self):
+        """Get when the next stat decrease is due"""
+        return self.last_stat_decrease + STATS_DECREASE_INTERVAL
+
+    def poop_due(self):
+        """Get when the next poop is due"""
+        return self.last_poop_time + self.poop_interval
+
+    def conversation_due(self):
+        """Get when the pet next wants to talk"""
+        return self.last_conversation_time + self.conversation_interval
+
+    def fire_stat_timer(self):
+        """Apply the stat decrease that is due"""
+        self.decrease_stats()
+        self.last_stat_decrease = self.stat_due()
+        self.timers.schedule(TIMER_STATS, self.stat_due())
+
+    def fire_poop_timer(self):
+        """Add the poop that is due and pick the next interval"""
+        self.add_mess("poop")
+        self.last_poop_time = self.poop_due()
+        self.poop_interval = self.rng.randint(60, 120)  # Reset interval
+        self.timers.schedule(TIMER_POOP, self.poop_due())
+
+    def fire_conversation_timer(self):
+        """Fires once; playing with the pet starts the timer again"""
+        self.set_need("needs_conversation", True)
+
+    def subscribe(self, callback, kinds=None):
+        """Call callback(event) for changes of the given PET_EVENT_* kinds (all if None)"""
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # Plain functions are kept alive until unsubscribed
+        self.subscribers.append((ref, frozenset(kinds) if kinds is not None else None))
+
+    def unsubscribe(self, callback):
+        self.subscribers = [(ref, kinds) for ref, kinds in self.subscribers
+                            if ref() not in (None, callback)]
+
+    def emit(self, kind, name=None, old=None, new=None):
+        """Send a change event to the subscribers interested in it"""
+        if not self.subscribers:
+            return
+        event = PetEvent(kind, self, name, old, new)
+        dead = False
+        for ref, kinds in list(self.subscribers):
+            callback = ref()
+            if callback is None:
+                dead = True
+            elif kinds is None or kind in kinds:
+                callback(event)
+        if dead:
+            self.subscribers = [(ref, kinds) for ref, kinds in self.subscribers
+                                if ref() is not None]
+
+    def set_stat(self, stat, value):
+        """Change a stat, updating only the indicators that depend on it"""
+        old = self.stats[stat]
+        if value == old:
+            return
+        self.stats[stat] = value
+        self.emit(PET_EVENT_STAT, stat, old, value)
+
+        if stat == STAT_HUNGER:
+            self.set_need("needs_feeding", value < 30)
+        elif stat == STAT_HEALTH:
+            self.set_need("needs_healing", value < 30)
+            # If health drops to zero, pet dies
+            if value <= 0:
+                self.set_state(STATE_DEAD)
+        elif stat == STAT_HAPPINESS and value < 80:
+            # Low happiness makes the pet want to talk (in addition to the timer)
+            self.set_need("needs_conversation", True)
+
+    def set_need(self, need, value):
+        """Turn a need indicator (needs_feeding, needs_healing, needs_conversation) on or off"""
+        old = getattr(self, need)
+        if value != old:
+            setattr(self, need, value)
+            self.emit(PET_EVENT_NEED, need, old, value)
+
+    def set_state(self, state):
+        """Change the pet's state; a pet with no health left stays dead"""
+        old = self.state
+        if state == old or (old == STATE_DEAD and self.stats[STAT_HEALTH] <= 0):
+            return
+        self.state = state
+        self.emit(PET_EVENT_STATE, None, old, state)
+        if state == STATE_DEAD:
+            self.emit(PET_EVENT_DIED)
 
     def decrease_stats(self):
         """Decrease pet stats based on current state"""
@@ -116,66 +245,74 @@ class Pet:
             self.decrease_stat(STAT_HAPPINESS, STAT_DECREASE_AMOUNT)
             self.decrease_stat(STAT_HEALTH, STAT_DECREASE_AMOUNT // 2)
 
+        self.history.record(self.stats)
+
     def decrease_stat(self, stat, amount):
         """Decrease a stat by the given amount"""
-        self.stats[stat] = max(MIN_STAT, self.stats[stat] - amount)
+        self.set_stat(stat, max(MIN_STAT, self.stats[stat] - amount))
 
     def increase_stat(self, stat, amount):
         """Increase a stat by the given amount"""
-        self.stats[stat] = min(MAX_STAT, self.stats[stat] + amount)
+        self.set_stat(stat, min(MAX_STAT, self.stats[stat] + amount))
 
     def eat(self):
         """Feed the pet"""
         if self.state != STATE_SLEEPING:
             self.increase_stat(STAT_HUNGER, 30)
             self.increase_stat(STAT_HAPPINESS, 10)
-            self.state = STATE_EATING
+            self.set_state(STATE_EATING)
             # Chance to generate mess
-            if random.random() < 0.3:
+            if self.rng.random() < 0.3:
                 self.add_mess("can")
 
     def sleep(self):
         """Put the pet to sleep"""
         if self.state != STATE_SLEEPING:
-            self.state = STATE_SLEEPING
+            self.set_state(STATE_SLEEPING)
 
     def wake(self):
         """Wake the pet up"""
         if self.state == STATE_SLEEPING:
-            self.state = STATE_NORMAL
+            self.set_state(STATE_NORMAL)
 
     def play(self):
         """Play with the pet"""
         if self.state != STATE_SLEEPING:
+            # Clear the need first so the flag derived from the new happiness is final
+            self.set_need("needs_conversation", False)
             self.increase_stat(STAT_HAPPINESS, 30)
             self.decrease_stat(STAT_ENERGY, 10)
-            self.needs_conversation = False
-            self.last_conversation_time = time.time()
-            self.conversation_interval = random.randint(120, 240)  # Reset interval
+            self.last_conversation_time = clock.now()
+            self.conversation_interval = self.rng.randint(120, 240)  # Reset interval
+            self.timers.schedule(TIMER_CONVERSATION, self.conversation_due())
 
     def clean(self):
         """Clean up messes"""
         if self.mess_positions:
+            cleared = len(self.mess_positions)
             self.mess_positions = []
             self.mess_types = []
+            self.emit(PET_EVENT_MESS_CLEARED, None, cleared, 0)
             self.increase_stat(STAT_HAPPINESS, 10)
 
     def heal(self):
         """Heal the pet"""
         if self.state != STATE_SLEEPING:
             self.increase_stat(STAT_HEALTH, 30)
-            self.state = STATE_NORMAL
+            self.set_state(STATE_NORMAL)
 
     def add_mess(self, mess_type="poop"):
         """Add a mess at a random position"""
         if len(self.mess_positions) < self.max_mess:
             # Generate a random position that's not too close to the pet
             margin = 20
-            x = random.randint(margin, SCREEN_WIDTH - MESS_SIZE[0] - margin)
-            y = random.randint(margin, SCREEN_HEIGHT - MESS_SIZE[1] - margin)
+            x = self.rng.randint(margin, SCREEN_WIDTH - MESS_SIZE[0] - margin)
+            y = self.rng.randint(margin, SCREEN_HEIGHT - MESS_SIZE[1] - margin)
 
             self.mess_positions.append((x, y))
             self.mess_types.append(mess_type)
+            count = len(self.mess_positions)
+            self.emit(PET_EVENT_MESS_ADDED, mess_type, count - 1, count)
 
     def draw(self, screen, x, y):
         """Draw the pet at the specified position"""
@@ -195,7 +332,7 @@ class Pet:
 
     def get_age(self):
         """Get the pet's age in hours or days"""
-        age_seconds = time.time() - self.birth_time
+        age_seconds = clock.now() - self.birth_time
         age_hours = age_seconds / 3600
 
         if age_hours < 24:
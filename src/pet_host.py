@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# MalinaPet - Display-free host running many pets in one asyncio event loop
+#
+# Each pet sits in one priority queue at its next timer deadline (stat
+# decrease, poop, conversation need), so the loop sleeps until the earliest
+# one is due instead of polling each pet. Pets are queried and cared for with
+# newline-delimited JSON over TCP:
+#     python -m src.pet_host --pets 1000
+#     {"op": "create", "type": "Cat", "name": "Tom"}  -> {"ok": true, "id": 1001}
+#     {"op": "get", "id": 1001}
+#     {"op": "act", "id": 1001, "action": "eat"}
+#     {"op": "remove", "id": 1001}
+#     {"op": "status"}
+
+import json
+import random
+import asyncio
+import argparse
+import itertools
+import threading
+from collections import deque
+from src.constants import *
+from src import clock
+from src.pet import Pet
+from src.timers import TimerQueue
+from src.instrumentation import percentile
+from src.log import get_logger
+
+log = get_logger("host")
+
+
+class PetHost:
+    def __init__(self, speed=1.0):
+        self.speed = speed  # Game seconds per real second
+        self.pets = {}
+        self.ids = itertools.count(1)
+
+        # Pets by their next timer deadline
+        self.timers = TimerQueue()
+        self.wakeup = None
+
+        self.port = None
+        self.started = threading.Event()
+        self.timers_fired = 0
+        self.requests = 0
+        self.timer_lag = deque(maxlen=4096)  # How late timers fired, in game seconds
+
+    def add_pet(self, pet_type, name):
+        """Create a pet and schedule its timers; return its id"""
+        pet_id = next(self.ids)
+        pet = Pet(pet_type, name)
+        self.pets[pet_id] = pet
+        self.schedule(pet_id)
+        return pet_id
+
+    def remove_pet(self, pet_id):
+        """Remove a pet along with its timers"""
+        del self.pets[pet_id]
+        self.timers.cancel(pet_id)
+
+    def schedule(self, pet_id):
+        """Queue a pet at its next deadline (dead pets have nothing left to do)"""
+        pet = self.pets[pet_id]
+        if not pet.is_alive():
+            self.timers.cancel(pet_id)
+            return
+        due = pet.next_deadline()
+        earliest = self.timers.next_deadline()
+        self.timers.schedule(pet_id, due)
+        if self.wakeup is not None and (earliest is None or due < earliest):
+            self.wakeup.set()
+
+    def fire_due(self, now):
+        """Update every pet with a timer that is due"""
+        for pet_id, due in self.timers.pop_due(now):
+            self.pets[pet_id].update()
+            self.timers_fired += 1
+            self.timer_lag.append(now - due)
+            self.schedule(pet_id)
+
+    async def run_timers(self):
+        """Fire timers as they come due, sleeping until the earliest one otherwise"""
+        self.wakeup = asyncio.Event()
+        while True:
+            now = clock.now()
+            self.fire_due(now)
+            deadline = self.timers.next_deadline()
+            delay = (deadline - now) / self.speed if deadline is not None else None
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def act(self, pet_id, action):
+        """Apply a care action to a pet"""
+        if action not in PET_HOST_ACTIONS:
+            raise ValueError(f"Unknown action {action}")
+        pet = self.pets[pet_id]
+        if not pet.is_alive():
+            raise ValueError(f"Pet {pet_id} has died")
+        getattr(pet, action)()
+        self.schedule(pet_id)
+
+    def pet_state(self, pet_id):
+        """Get a pet as a JSON-friendly dict"""
+        pet = self.pets[pet_id]
+        return {
+            "id": pet_id,
+            "type": pet.pet_type,
+            "name": pet.name,
+            "state": pet.state,
+            "stats": pet.stats,
+            "messes": len(pet.mess_positions),
+            "needs_feeding": pet.needs_feeding,
+            "needs_healing": pet.needs_healing,
+            "needs_conversation": pet.needs_conversation,
+            "age": pet.get_age()
+        }
+
+    def status(self):
+        """Get host-wide counters"""
+        lag = list(self.timer_lag)
+        return {
+            "pets": len(self.pets),
+            "alive": sum(1 for pet in self.pets.values() if pet.is_alive()),
+            "queued_timers": len(self.timers),
+            "timers_fired": self.timers_fired,
+            "requests": self.requests,
+            "timer_lag_p50": round(percentile(lag, 0.5), 3) if lag else 0,
+            "timer_lag_p99": round(percentile(lag, 0.99), 3) if lag else 0
+        }
+
+    def handle_request(self, request):
+        """Answer one API request"""
+        op = request.get("op")
+        if op == "create":
+            pet_id = self.add_pet(request.get("type", random.choice(PET_TYPES)), request.get("name", "Tami"))
+            return {"ok": True, "id": pet_id}
+        elif op == "get":
+            return {"ok": True, "pet": self.pet_state(request["id"])}
+        elif op == "act":
+            self.act(request["id"], request["action"])
+            return {"ok": True, "pet": self.pet_state(request["id"])}
+        elif op == "remove":
+            self.remove_pet(request["id"])
+            return {"ok": True}
+        elif op == "list":
+            return {"ok": True, "ids": list(self.pets)}
+        elif op == "status":
+            return {"ok": True, "status": self.status()}
+        raise ValueError(f"Unknown op {op}")
+
+    async def handle_client(self, reader, writer):
+        """Serve newline-delimited JSON requests from one connection"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    response = self.handle_request(json.loads(line))
+                except KeyError as e:
+                    response = {"ok": False, "error": f"No such pet or field: {e}"}
+                except (ValueError, TypeError, AttributeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=PET_HOST_HOST, port=PET_HOST_PORT):
+        """Run the timers and the API until cancelled"""
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.started.set()
+        log.info("Pet host serving %d pets on %s:%d", len(self.pets), host, self.port)
+        async with server:
+            await asyncio.gather(self.run_timers(), server.serve_forever())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many pets without a display")
+    parser.add_argument("--host", default=PET_HOST_HOST)
+    parser.add_argument("--port", type=int, default=PET_HOST_PORT)
+    parser.add_argument("--pets", type=int, default=0, help="Pets to create at startup")
+    parser.add_argument("--speed", type=float, default=1.0, help="Game seconds per real second")
+    args = parser.parse_args()
+
+    if args.speed != 1.0:
+        clock.set_source(clock.ScaledClock(args.speed))
+
+    host = PetHost(args.speed)
+    for i in range(args.pets):
+        host.add_pet(random.choice(PET_TYPES), f"Tami{i}")
+
+    try:
+        asyncio.run(host.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"Pet host stopped: {host.status()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# MalinaPet - Load benchmark for the multi-pet host
+#
+# Starts a host (or uses a running one with --port), creates N pets and sends
+# M requests per second over several connections while time runs fast:
+#     python -m src.pet_host_bench --pets 10000 --ops 2000 --speed 60
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import resource
+import threading
+from src.constants import *
+from src import clock
+from src.pet_host import PetHost
+from src.instrumentation import percentile
+
+
+async def request(reader, writer, message):
+    """Send one request and wait for its response"""
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def create_pets(host, port, count):
+    """Create pets over one connection; return their ids"""
+    reader, writer = await asyncio.open_connection(host, port)
+    ids = []
+    for i in range(count):
+        response = await request(reader, writer, {"op": "create", "type": random.choice(PET_TYPES), "name": f"Tami{i}"})
+        ids.append(response["id"])
+    writer.close()
+    return ids
+
+
+async def client(host, port, ids, rate, duration, latencies, errors):
+    """Send requests at a fixed rate (open loop) and record their latencies"""
+    reader, writer = await asyncio.open_connection(host, port)
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    next_send = start
+    while next_send - start < duration:
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        next_send += interval
+
+        # Mostly reads, some care actions
+        pet_id = random.choice(ids)
+        if random.random() < 0.7:
+            message = {"op": "get", "id": pet_id}
+        else:
+            message = {"op": "act", "id": pet_id, "action": random.choice(PET_HOST_ACTIONS)}
+
+        # Latency is counted from when the request should have gone out, so a
+        # host that falls behind can't hide it by slowing the client down
+        scheduled = next_send - interval
+        response = await request(reader, writer, message)
+        latencies.append(time.perf_counter() - scheduled)
+        if not response["ok"]:
+            errors.append(response["error"])
+    writer.close()
+
+
+async def run_benchmark(host, port, pets, ops, duration, connections):
+    start = time.perf_counter()
+    ids = await create_pets(host, port, pets)
+    create_time = time.perf_counter() - start
+    print(f"Created {pets} pets in {create_time:.2f} s ({pets / create_time:.0f}/s)")
+
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, ids, ops / connections, duration, latencies, errors)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    status = (await request(reader, writer, {"op": "status"}))["status"]
+    writer.close()
+    return latencies, errors, elapsed, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-pet host")
+    parser.add_argument("--pets", type=int, default=1000)
+    parser.add_argument("--ops", type=float, default=500, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--speed", type=float, default=60.0, help="Game seconds per real second")
+    parser.add_argument("--port", type=int, default=0, help="Use a host already running on this port")
+    args = parser.parse_args()
+
+    port = args.port
+    if not port:
+        # Run the host on its own thread and event loop, as a separate process would
+        clock.set_source(clock.ScaledClock(args.speed))
+        host = PetHost(args.speed)
+        threading.Thread(target=asyncio.run, args=(host.serve(PET_HOST_HOST, 0),), daemon=True).start()
+        host.started.wait()
+        port = host.port
+
+    latencies, errors, elapsed, status = asyncio.run(
+        run_benchmark(PET_HOST_HOST, port, args.pets, args.ops, args.duration, args.connections))
+
+    print(f"Requests: {len(latencies)} in {elapsed:.1f} s ({len(latencies) / elapsed:.0f}/s, "
+          f"target {args.ops:.0f}/s), errors: {len(errors)}")
+    print(f"Latency p50 {percentile(latencies, 0.5) * 1000:.2f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:.2f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms  "
+          f"max {max(latencies) * 1000:.2f} ms")
+    print(f"Timers fired: {status['timers_fired']} ({status['timers_fired'] / elapsed:.0f}/s), "
+          f"lag p50 {status['timer_lag_p50']} s  p99 {status['timer_lag_p99']} s (game time)")
+    print(f"Pets alive: {status['alive']}/{status['pets']}, queued timers: {status['queued_timers']}")
+    print(f"Peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# MalinaPet - Background sync of pet state changes to a collector
+#
+# The agent collects a pet's change events as they happen and the game loop
+# turns them into a delta at most once per SYNC_CAPTURE_INTERVAL. A background
+# thread batches the deltas, gzips each batch into a queue directory on disk
+# and posts queued batches oldest first, backing off while the network is
+# down, so nothing is lost across outages or restarts.
+
+import os
+import json
+import gzip
+import time
+import random
+import socket
+import threading
+import urllib.request
+from src.constants import *
+from src import clock
+from src.log import get_logger
+
+log = get_logger("sync")
+
+
+def pet_key(pet):
+    """Identify a pet across batches and devices"""
+    return f"{pet.pet_type}/{pet.name}/{int(pet.birth_time)}"
+
+
+def pet_snapshot(pet):
+    """Get the synced fields of a pet"""
+    snapshot = dict(pet.stats)
+    snapshot["state"] = pet.state
+    snapshot["messes"] = len(pet.mess_positions)
+    snapshot["needs_feeding"] = pet.needs_feeding
+    snapshot["needs_healing"] = pet.needs_healing
+    snapshot["needs_conversation"] = pet.needs_conversation
+    return snapshot
+
+
+class PetSyncAgent:
+    def __init__(self, url, queue_path=SYNC_QUEUE_PATH, batch_size=SYNC_BATCH_SIZE,
+                 flush_interval=SYNC_FLUSH_INTERVAL, device=None):
+        self.url = url
+        self.queue_path = queue_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.device = device or socket.gethostname()
+
+        self.lock = threading.Lock()  # Guards deltas, changes and the batch numbering
+        self.wakeup = threading.Event()
+        self.deltas = []
+        self.changes = {}  # Fields changed since the last capture, per pet key
+        self.last_capture = 0
+        self.running = False
+        self.thread = None
+
+        os.makedirs(queue_path, exist_ok=True)
+        self.batch_number = self.last_queued_number()
+        self.backoff = 0
+        self.next_attempt = 0
+
+        # Counters for tests and the throughput check
+        self.batches_sent = 0
+        self.bytes_sent = 0
+        self.send_failures = 0
+
+    def last_queued_number(self):
+        """Continue numbering after batches left in the queue by an earlier run"""
+        return max((int(name.split(".")[0]) for name in self.queued_batches()), default=0)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="pet-sync", daemon=True)
+        self.thread.start()
+
+    def capture(self, pet):
+        """Record what changed on a pet since the last capture (cheap; call every frame)"""
+        key = pet_key(pet)
+        if key not in self.changes:
+            # First sight of this pet: send everything, then follow its events
+            changes = pet_snapshot(pet)
+            changes["type"] = pet.pet_type
+            changes["name"] = pet.name
+            self.changes[key] = changes
+            pet.subscribe(self.on_pet_event)
+
+        now = clock.now()
+        if now - self.last_capture < SYNC_CAPTURE_INTERVAL:
+            return
+        self.last_capture = now
+        self.take_changes(now)
+
+    def take_changes(self, timestamp):
+        """Turn the changes collected since the last capture into deltas"""
+        with self.lock:
+            for key, changes in self.changes.items():
+                if changes:
+                    self.deltas.append({"pet": key, "t": timestamp, "changes": changes})
+                    self.changes[key] = {}
+            if len(self.deltas) >= self.batch_size:
+                self.wakeup.set()
+
+    def on_pet_event(self, event):
+        """Note the synced field a pet event changed"""
+        pet = event.pet
+        changes = self.changes.setdefault(pet_key(pet), {})
+        if event.kind in (PET_EVENT_STAT, PET_EVENT_NEED):
+            changes[event.name] = event.new
+        elif event.kind == PET_EVENT_STATE:
+            changes["state"] = event.new
+        elif event.kind in (PET_EVENT_MESS_ADDED, PET_EVENT_MESS_CLEARED):
+            changes["messes"] = len(pet.mess_positions)
+
+    def add_delta(self, key, changes, timestamp):
+        """Queue one change record for the next batch"""
+        with self.lock:
+            self.deltas.append({"pet": key, "t": timestamp, "changes": changes})
+            if len(self.deltas) >= self.batch_size:
+                self.wakeup.set()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while self.running:
+            self.wakeup.wait(min(self.flush_interval, 1.0))
+            self.wakeup.clear()
+            now = time.monotonic()
+            with self.lock:
+                due = (len(self.deltas) >= self.batch_size or
+                       (self.deltas and now - last_flush >= self.flush_interval))
+            if due:
+                self.flush()
+                last_flush = now
+            self.send_queued()
+
+    def flush(self):
+        """Write pending deltas to the disk queue as compressed batches"""
+        # Held throughout, so the sync thread and stop() never write the same batch number
+        with self.lock:
+            deltas, self.deltas = self.deltas, []
+            for start in range(0, len(deltas), self.batch_size):
+                self.batch_number += 1
+                batch = {"device": self.device, "batch": self.batch_number,
+                         "deltas": deltas[start:start + self.batch_size]}
+                path = os.path.join(self.queue_path, f"{self.batch_number:010d}.json.gz")
+                try:
+                    with open(path + ".tmp", 'wb') as f:
+                        f.write(gzip.compress(json.dumps(batch, separators=(",", ":")).encode("utf-8")))
+                    os.replace(path + ".tmp", path)
+                except OSError as e:
+                    log.error("Error queueing sync batch: %s", e)
+            self.trim_queue()
+
+    def trim_queue(self):
+        """Drop the oldest batches if the device has been offline for very long"""
+        queued = self.queued_batches()
+        for name in queued[:max(0, len(queued) - SYNC_QUEUE_MAX_BATCHES)]:
+            os.remove(os.path.join(self.queue_path, name))
+
+    def queued_batches(self):
+        return sorted(name for name in os.listdir(self.queue_path) if name.endswith(".json.gz"))
+
+    def send_queued(self, ignore_backoff=False):
+        """Post queued batches in order until one fails, then back off"""
+        if not ignore_backoff and time.monotonic() < self.next_attempt:
+            return
+        for name in self.queued_batches():
+            if not self.running and not ignore_backoff:
+                return  # Stopping: the rest stays queued for the next run
+            path = os.path.join(self.queue_path, name)
+            try:
+                with open(path, 'rb') as f:
+                    body = f.read()
+            except OSError:
+                continue  # Trimmed while we were sending
+            try:
+                request = urllib.request.Request(self.url, data=body, method="POST", headers={
+                    "Content-Type": "application/json",
+                    "Content-Encoding": "gzip"
+                })
+                with urllib.request.urlopen(request, timeout=SYNC_TIMEOUT) as response:
+                    response.read()
+            except Exception as e:
+                # Exponential backoff with jitter so many devices don't retry in step
+                self.send_failures += 1
+                self.backoff = min(SYNC_BACKOFF_MAX, max(SYNC_BACKOFF_MIN, self.backoff * 2))
+                self.next_attempt = time.monotonic() + self.backoff * random.uniform(0.5, 1.0)
+                log.warning("Pet sync failed (%s), retrying in about %.0f s", e, self.backoff)
+                return
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.backoff = 0
+            self.batches_sent += 1
+            self.bytes_sent += len(body)
+
+    def stop(self):
+        """Stop the agent, keeping unsent changes in the disk queue"""
+        # Queue everything on disk first: the thread is a daemon and may not
+        # outlive a send that is still in flight
+        self.take_changes(clock.now())
+        self.flush()
+        self.running = False
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=SYNC_STOP_TIMEOUT)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# MalinaPet - Idle power saving (backlight dimming and sleeping until a button press)
+
+import RPi.GPIO as GPIO
+from src.constants import *
+from src import clock
+from src.log import get_logger
+
+log = get_logger("power")
+
+
+class Backlight:
+    """LCD backlight on a PWM-capable GPIO pin"""
+
+    def __init__(self, pin=BACKLIGHT_PIN):
+        self.pin = pin
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.OUT)
+        self.pwm = GPIO.PWM(pin, BACKLIGHT_PWM_FREQUENCY)
+        self.pwm.start(100)
+        self.brightness = 100
+
+    def set_brightness(self, percent):
+        """Set the backlight duty cycle (0 turns it off)"""
+        if percent != self.brightness:
+            self.pwm.ChangeDutyCycle(percent)
+            self.brightness = percent
+
+    def cleanup(self):
+        self.pwm.stop()
+
+
+class PowerManager:
+    """Idle state machine: active -> dim -> off, back to active on any button"""
+
+    def __init__(self, display, input_handler, backlight=None,
+                 dim_timeout=IDLE_DIM_TIMEOUT, off_timeout=IDLE_OFF_TIMEOUT):
+        self.display = display
+        self.input = input_handler
+        self.backlight = backlight
+        self.dim_timeout = dim_timeout
+        self.off_timeout = off_timeout
+
+        self.state = POWER_ACTIVE
+        self.last_activity = clock.now()
+
+    def update(self):
+        """Track input activity and step through the idle states"""
+        now = clock.now()
+        if any(self.input.get_input_state().values()):
+            self.last_activity = now
+            if self.state != POWER_ACTIVE:
+                self.set_state(POWER_ACTIVE)
+            return
+
+        idle = now - self.last_activity
+        if self.state == POWER_ACTIVE and idle > self.dim_timeout:
+            self.set_state(POWER_DIM)
+        elif self.state == POWER_DIM and idle > self.off_timeout:
+            self.set_state(POWER_OFF)
+
+    def set_state(self, state):
+        """Switch power state, adjusting the backlight and frame rate"""
+        log.info("Power state: %s -> %s", self.state, state)
+        self.state = state
+        if state == POWER_ACTIVE:
+            brightness, fps = 100, FPS
+        elif state == POWER_DIM:
+            brightness, fps = IDLE_DIM_BRIGHTNESS, IDLE_DIM_FPS
+        else:
+            brightness, fps = 0, IDLE_DIM_FPS
+        self.display.fps = fps
+        if self.backlight is not None:
+            self.backlight.set_brightness(brightness)
+
+    def is_off(self):
+        return self.state == POWER_OFF
+
+    def sleep(self, deadline=None):
+        """Block until a button is pressed or the deadline (or next simulation tick) is due"""
+        timeout = POWER_SAVE_TICK if deadline is None else max(POWER_MIN_SLEEP, deadline - clock.now())
+        if self.input.wait_for_press(timeout):
+            self.wake()
+
+    def wake(self):
+        """Turn the screen back on; the waking press isn't passed on to the screens"""
+        self.input.ignore_current_presses()
+        self.last_activity = clock.now()
+        self.set_state(POWER_ACTIVE)
+
+    def cleanup(self):
+        if self.backlight is not None:
+            self.backlight.set_brightness(100)
+            self.backlight.cleanup()
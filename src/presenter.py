@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# MalinaPet - Present frames from a dedicated thread while the next one is built
+#
+# The game loop draws into display.screen (the back buffer). Display.update()
+# hands it to the presenter, which swaps in a free buffer so drawing can carry
+# on while the presenter thread pushes the frame to the panel (the RGB565
+# framebuffer transfer; SDL has to flip on the main thread, so SDL displays
+# present synchronously). Only the newest frame waits to be presented: if the
+# panel is still busy when another frame arrives, the waiting one is dropped
+# rather than queued, so a slow panel never adds latency.
+#     python -m src.presenter --transfer-ms 30 --work-ms 20
+
+import os
+import time
+import argparse
+import tempfile
+import threading
+from collections import deque
+from src.constants import *
+from src.instrumentation import register_gauge, percentile
+
+
+class FramePresenter:
+    def __init__(self, display):
+        if not display.present_thread_safe:
+            raise ValueError("Frames can only be presented from a thread with the framebuffer display")
+        self.display = display
+
+        # Three offscreen buffers: the one being drawn (display.screen), the
+        # newest finished frame waiting for the panel, and the one being presented
+        self.free = [display.screen.copy(), display.screen.copy()]
+        self.pending = None
+        self.pending_tags = []  # Latency tags of the presses the pending frame answers
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+        self.submitted = 0
+        self.presented = 0
+        self.dropped = 0
+        self.present_times = deque(maxlen=PRESENTER_SAMPLES)  # Seconds per panel transfer
+        register_gauge("presenter", self.state)
+
+    def start(self):
+        self.running = True
+        self.display.presenter = self
+        self.thread = threading.Thread(target=self._run, name="frame-presenter", daemon=True)
+        self.thread.start()
+
+    def submit(self, tags=None):
+        """Hand over the frame in display.screen and give the game loop a buffer to draw the next one"""
+        with self.condition:
+            self.submitted += 1
+            if self.pending is not None:
+                # The panel hasn't taken the last frame yet: replace it (this
+                # frame also answers the presses the dropped one did)
+                self.dropped += 1
+                self.pending, self.display.screen = self.display.screen, self.pending
+            else:
+                self.pending, self.display.screen = self.display.screen, self.free.pop()
+            if tags:
+                self.pending_tags.extend(tags)
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                frame, self.pending = self.pending, None
+                tags, self.pending_tags = self.pending_tags, []
+
+            start = time.perf_counter()
+            try:
+                self.display.present(frame)
+                if tags and self.display.latency is not None:
+                    self.display.latency.presented(tags)
+            finally:
+                self.present_times.append(time.perf_counter() - start)
+                with self.condition:
+                    self.free.append(frame)
+                    self.presented += 1
+
+    def state(self):
+        """Get presenter counters for instrumentation"""
+        times = list(self.present_times)
+        return {
+            "submitted": self.submitted,
+            "presented": self.presented,
+            "dropped": self.dropped,
+            "present_ms_p50": round(percentile(times, 0.5) * 1000, 2) if times else None,
+            "present_ms_p95": round(percentile(times, 0.95) * 1000, 2) if times else None
+        }
+
+    def stop(self):
+        """Present the last waiting frame, then stop the thread and draw directly again"""
+        with self.condition:
+            frame, self.pending = self.pending, None
+            tags, self.pending_tags = self.pending_tags, []
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        if frame is not None:
+            self.display.present(frame)
+            if tags and self.display.latency is not None:
+                self.display.latency.presented(tags)
+        self.display.presenter = None
+
+
+def benchmark(frames=120, transfer_ms=30.0, work_ms=20.0):
+    """Compare frame rates with and without the presenter against a simulated slow panel"""
+    from src.framebuffer_display import FramebufferDisplay
+
+    # A plain file stands in for the panel's framebuffer
+    fd, path = tempfile.mkstemp(suffix=".fb")
+    os.close(fd)
+    display = FramebufferDisplay(path)
+    display.initialize()
+    display.fps = 0
+    present = display.present
+
+    def slow_present(frame):
+        time.sleep(transfer_ms / 1000)  # Stand-in for an SPI transfer that releases the GIL
+        present(frame)
+
+    display.present = slow_present
+    print(f"Panel transfer {transfer_ms:.0f} ms, frame work {work_ms:.0f} ms")
+    for threaded in (False, True):
+        presenter = FramePresenter(display) if threaded else None
+        if presenter is not None:
+            presenter.start()
+        start = time.perf_counter()
+        for i in range(frames):
+            # Input, simulation and drawing
+            busy_until = time.perf_counter() + work_ms / 1000
+            while time.perf_counter() < busy_until:
+                pass
+            display.screen.fill((i % 256, 0, 0))
+            display.update()
+        elapsed = time.perf_counter() - start
+        label = "present thread" if threaded else "synchronous"
+        print(f"{label:<15} {frames / elapsed:6.1f} frames/s")
+        if presenter is not None:
+            presenter.stop()
+            print(f"{'':<15} {presenter.state()}")
+    display.cleanup()
+    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the asynchronous frame presenter")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--transfer-ms", type=float, default=30.0, help="Simulated panel transfer time")
+    parser.add_argument("--work-ms", type=float, default=20.0, help="Simulated input, update and draw time")
+    args = parser.parse_args()
+    benchmark(args.frames, args.transfer_ms, args.work_ms)
+
+
+if __name__ == "__main__":
+    main()
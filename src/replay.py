@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# MalinaPet - Deterministic headless replay of a recorded session
+#
+# Record with "record_session" set to a file path in config.json, then:
+#     python -m src.replay session.rec --csv frames.csv
+
+import csv
+import time
+import random
+import argparse
+from collections import deque
+from src import clock
+from src.display import Display
+from src.ai_backends import AIBackend
+from src.ai_budget import unlimited_budget
+from src.ai_integration import AIHandler
+from src.instrumentation import percentile
+from src.game import Game
+from src.session_recording import load_session, set_seed_hook, ReplayInput, AI_RESULT_KINDS
+
+
+class ReplayTextStream:
+    """Stands in for TextStream, showing conversation text on the frames it was recorded"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.text = ""
+        self.start_time = time.time()
+        self.first_chunk_time = None
+
+    def read(self):
+        new_text = ''.join(self.chunks)
+        self.chunks.clear()
+        if new_text and self.first_chunk_time is None:
+            self.first_chunk_time = time.time()
+        self.text += new_text
+        return new_text
+
+    def cancel(self):
+        pass
+
+
+class ReplayAIHandler(AIHandler):
+    """Stands in for AIHandler, feeding back the AI availability and results recorded.
+
+    Replays never talk to the AI service; a result missing from the recording
+    falls back to the offline content.
+    """
+
+    def __init__(self):
+        super().__init__(backend=AIBackend(), budget=unlimited_budget())
+        self.wait_until_ready()
+        self.replayed_available = False
+        self.results = {kind: deque() for kind in AI_RESULT_KINDS}
+
+    def apply(self, events):
+        """Apply the AI events recorded for a frame"""
+        for kind, value in events:
+            if kind == "available":
+                self.replayed_available = value
+            else:
+                self.results[kind].append(value)
+
+    def available(self):
+        return self.replayed_available
+
+    def generate_pet_name(self, pet_type):
+        if self.results["name"]:
+            return self.results["name"].popleft()
+        return super().generate_pet_name(pet_type)
+
+    def generate_random_pet(self):
+        if self.results["pet"]:
+            return self.results["pet"].popleft()
+        return super().generate_random_pet()
+
+    def stream_fun_fact(self, pet_type, pet_name):
+        return ReplayTextStream(self.results["text"])
+
+
+def replay_session(path):
+    """Replay a recording frame by frame, returning each frame's duration"""
+    seed, start_time, frames, seeds = load_session(path)
+    print(f"Replaying {len(frames)} frames, seed {seed}")
+
+    # Same global random state, same pet generators and same virtual time
+    random.seed(seed)
+    pending_seeds = list(reversed(seeds))
+    set_seed_hook(lambda: pending_seeds.pop() if pending_seeds else random.getrandbits(64))
+    virtual = clock.VirtualClock(start_time)
+    clock.set_source(virtual)
+
+    display = Display()
+    display.initialize_headless()
+
+    ai_handler = ReplayAIHandler()
+
+    input_handler = ReplayInput()
+    game = Game(display, input_handler, ai_handler)
+
+    frame_times = []
+    try:
+        for delta, buttons, ai_events in frames:
+            virtual.advance(delta)
+            input_handler.apply(buttons)
+            ai_handler.apply(ai_events)
+            if not input_handler.update():
+                break
+
+            start = time.perf_counter()
+            game.step()
+            frame_times.append(time.perf_counter() - start)
+    finally:
+        clock.set_source(None)
+        set_seed_hook(None)
+
+    return frame_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded MalinaPet session headlessly")
+    parser.add_argument("session")
+    parser.add_argument("--csv", help="Write per-frame durations to this CSV file")
+    args = parser.parse_args()
+
+    frame_times = replay_session(args.session)
+    if not frame_times:
+        print("No frames replayed")
+        return
+
+    print(f"Frames: {len(frame_times)}  "
+          f"p50 {percentile(frame_times, 0.5) * 1000:.1f} ms  "
+          f"p95 {percentile(frame_times, 0.95) * 1000:.1f} ms  "
+          f"max {max(frame_times) * 1000:.1f} ms")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "ms"])
+            for i, t in enumerate(frame_times):
+                writer.writerow([i, f"{t * 1000:.3f}"])
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 # MalinaPet - Adoption screen
 
 import os
+import random
 import pygame
 from src.constants import *
 from src.screens import ScreenType
 from src.pet import Pet
+from src.layout import Layout, Anchor, Column, Grid, Box, Text
 
 class AdoptionScreen:
     def __init__(self, display, input_handler, ai_handler):
@@ -20,82 +22,59 @@ class AdoptionScreen:
         # Define the allowed pet types for offline mode
         self.offline_pet_types = ["Cat", "Rat", "Raccoon"]
 
-        # Button positions and sizes - larger buttons
+        # Button sizes - larger buttons
         self.button_width = 75  # Slightly wider to fit "Raccoon"
         self.button_height = 30  # Taller buttons for better visibility
         self.ai_button_width = 118
         self.ai_button_height = 20
-
-        # Calculate button positions - 2x2 grid layout
         self.buttons_per_row = 2
-        button_spacing_x = 10  # Horizontal spacing between buttons
-        button_spacing_y = 15  # Vertical spacing between buttons
-
-        # Calculate total width needed for buttons in a row
-        total_row_width = (self.button_width * self.buttons_per_row) + (button_spacing_x * (self.buttons_per_row - 1))
-
-        # Calculate starting position to center the buttons
-        start_x = (self.display.width - total_row_width) // 2
-        start_y = 45  # Add more space below the title
-
-        # Define button positions and data - only for offline pet types plus random
-        self.buttons = []
-
-        # Add Cat and Rat buttons (first row)
-        self.buttons.append({
-            "rect": pygame.Rect(start_x, start_y, self.button_width, self.button_height),
-            "text": "Cat",
-            "type": "Cat",
-            "ai": False
-        })
-
-        self.buttons.append({
-            "rect": pygame.Rect(start_x + self.button_width + button_spacing_x, start_y,
-                                self.button_width, self.button_height),
-            "text": "Rat",
-            "type": "Rat",
-            "ai": False
-        })
-
-        # Add Raccoon and ? buttons (second row)
-        self.buttons.append({
-            "rect": pygame.Rect(start_x, start_y + self.button_height + button_spacing_y,
-                                self.button_width, self.button_height),
-            "text": "Raccoon",
-            "type": "Raccoon",
-            "ai": False
-        })
-
-        self.buttons.append({
-            "rect": pygame.Rect(start_x + self.button_width + button_spacing_x,
-                                start_y + self.button_height + button_spacing_y,
-                                self.button_width, self.button_height),
-            "text": "?",
-            "type": "random",
-            "ai": False
-        })
-
-        # Add AI generated pet button at the bottom if available (for online mode)
-        if self.ai_handler.is_available:
-            ai_y = start_y + (self.button_height + button_spacing_y) * 2 + 10
-            self.buttons.append({
-                "rect": pygame.Rect(
-                    (self.display.width - self.ai_button_width) // 2,  # Center horizontally
-                    ai_y,
-                    self.ai_button_width,
-                    self.ai_button_height
-                ),
-                "text": "AI Generated Pet",
-                "type": "ai",
-                "ai": True
-            })
+
+        # Offline pet types plus random, then the AI generated pet button
+        # (for online mode) once the AI handler is available
+        self.buttons = [
+            {"text": "Cat", "type": "Cat", "ai": False},
+            {"text": "Rat", "type": "Rat", "ai": False},
+            {"text": "Raccoon", "type": "Raccoon", "ai": False},
+            {"text": "?", "type": "random", "ai": False}
+        ]
+        self.pet_button_count = len(self.buttons)
 
         # Selected button
         self.selected_button_index = 0
 
-        # Title text
+        # Title text and instructions (two lines for better visibility)
         self.title_text = "Choose Your Pet"
-        
+        self.instructions = ["Use joystick to select", "press to adopt"]
+
+        # Title, a 2x2 grid of pet buttons and the AI button below it, with the
+        # instructions at the bottom of the screen
+        self.layout = Layout(
+            Anchor(Column([
+                Text(self.title_text, name="title"),
+                Column([
+                    Grid([Box(self.button_width, self.button_height) for _ in self.buttons],
+                         self.buttons_per_row, spacing=(10, 15), name="pet_buttons"),
+                    Box(self.ai_button_width, self.ai_button_height, name="ai_button")
+                ], spacing=25)
+            ], spacing=22), "midtop", margin=10),
+            Anchor(Column([Text(line, "small_font") for line in self.instructions], spacing=2,
+                          name="instructions"), "midbottom", margin=2)
+        )
+
+        # The API check runs in the background, so the AI button may appear later
+        self.add_ai_button()
+
+    def add_ai_button(self):
+        """Add the AI generated pet button once the AI handler is available"""
+        if not self.ai_handler.available() or len(self.buttons) > self.pet_button_count:
+            return
+        self.buttons.append({"text": "AI Generated Pet", "type": "ai", "ai": True})
+
+    def button_rects(self):
+        """Get the rects of the buttons shown"""
+        rects = self.layout.resolve(self.display)
+        return (rects["pet_buttons"] + [rects["ai_button"]])[:len(self.buttons)]
+
     # def load_pet_images(self):
     #     """Load pet preview images"""
     #     for pet_type in PET_TYPES:
@@ -113,31 +92,35 @@ class AdoptionScreen:
 
     def update(self):
         """Update the adoption screen"""
-        # Handle joystick input for button selection - direct mapping for 2x2 grid
+        # Pick up the AI button if the background API check has finished
+        self.add_ai_button()
+
+        # Handle joystick input for button selection in the pet button grid
+        columns = self.buttons_per_row
+        index = self.selected_button_index
+        on_ai_button = index >= self.pet_button_count
         if self.input.is_pressed("up"):
-            # If in bottom row, move up
-            if self.selected_button_index >= 2:
-                self.selected_button_index -= 2
+            # Move up a row (from the AI button to the start of the last row)
+            if on_ai_button:
+                self.selected_button_index = self.pet_button_count - columns
+            elif index >= columns:
+                self.selected_button_index -= columns
         elif self.input.is_pressed("down"):
-            # If in top row, move down
-            if self.selected_button_index < 2:
-                self.selected_button_index += 2
-            # If AI button is available and we're in bottom row, select it
-            elif self.ai_handler.is_available and len(self.buttons) > 4:
-                self.selected_button_index = 4
+            # Move down a row, or onto the AI button from the last row
+            if not on_ai_button and index + columns < self.pet_button_count:
+                self.selected_button_index += columns
+            elif not on_ai_button and len(self.buttons) > self.pet_button_count:
+                self.selected_button_index = self.pet_button_count
         elif self.input.is_pressed("left"):
-            # If in right column, move left
-            if self.selected_button_index % 2 == 1:
+            # If in right column, move left; from the AI button, to the bottom-right button
+            if on_ai_button:
+                self.selected_button_index = self.pet_button_count - 1
+            elif index % columns > 0:
                 self.selected_button_index -= 1
-            # If on AI button, move to bottom-right button
-            elif self.selected_button_index >= 4:
-                self.selected_button_index = 3
         elif self.input.is_pressed("right"):
-            # If in left column, move right
-            if self.selected_button_index % 2 == 0 and self.selected_button_index < len(self.buttons) - 1:
-                # Don't go right if we're on the right edge
-                if self.selected_button_index < 3 or (self.selected_button_index == 2 and len(self.buttons) > 4):
-                    self.selected_button_index += 1
+            # Don't go right if we're on the right edge
+            if not on_ai_button and index % columns < columns - 1 and index + 1 < self.pet_button_count:
+                self.selected_button_index += 1
 
         # Check for selection
         if self.input.is_pressed("press") or self.input.is_pressed("key1"):
@@ -147,7 +130,7 @@ class AdoptionScreen:
             # Handle different pet types
             if pet_type == "random":
                 # Choose a random pet type
-                pet_type = self.offline_pet_types[pygame.time.get_ticks() % len(self.offline_pet_types)]
+                pet_type = random.choice(self.offline_pet_types)
             elif pet_type == "ai":
                 # Generate a random pet with AI
                 pet_type = self.ai_handler.generate_random_pet()
@@ -165,43 +148,32 @@ class AdoptionScreen:
         # Clear the screen
         self.display.clear()
 
+        rects = self.layout.resolve(self.display)
+
         # Draw title
         title_surface = self.display.render_text(self.title_text, WHITE)
-        title_x = (self.display.width - title_surface.get_width()) // 2
-        self.display.screen.blit(title_surface, (title_x, 10))
+        self.display.screen.blit(title_surface, rects["title"])
 
         # Draw buttons
-        for i, button in enumerate(self.buttons):
+        for i, (button, rect) in enumerate(zip(self.buttons, self.button_rects())):
             # Draw button background
             color = BLUE if i == self.selected_button_index else DARK_GRAY
-            pygame.draw.rect(self.display.screen, color, button["rect"])
+            pygame.draw.rect(self.display.screen, color, rect)
 
             # Draw button border
             border_color = WHITE if i == self.selected_button_index else LIGHT_GRAY
-            pygame.draw.rect(self.display.screen, border_color, button["rect"], 1)
+            pygame.draw.rect(self.display.screen, border_color, rect, 1)
 
             # Draw button text
             text_surface = self.display.render_text(button["text"], WHITE, self.display.small_font)
-            text_x = button["rect"].x + (button["rect"].width - text_surface.get_width()) // 2
-            text_y = button["rect"].y + (button["rect"].height - text_surface.get_height()) // 2
-            self.display.screen.blit(text_surface, (text_x, text_y))
-
-        # Show instructions at the bottom - break into two lines for better visibility
-        line1 = "Use joystick to select"
-        line2 = "press to adopt"
-
-        line1_surface = self.display.render_text(line1, WHITE, self.display.small_font)
-        line2_surface = self.display.render_text(line2, WHITE, self.display.small_font)
-
-        line1_x = (self.display.width - line1_surface.get_width()) // 2
-        line2_x = (self.display.width - line2_surface.get_width()) // 2
-
-        # Position near bottom but leave enough space
-        line1_y = self.display.height - line1_surface.get_height() - line2_surface.get_height() - 4
-        line2_y = self.display.height - line2_surface.get_height() - 2
-
-        self.display.screen.blit(line1_surface, (line1_x, line1_y))
-        self.display.screen.blit(line2_surface, (line2_x, line2_y))
+            self.display.screen.blit(text_surface, text_surface.get_rect(center=rect.center))
+
+        # Show instructions at the bottom
+        y = rects["instructions"].top
+        for line in self.instructions:
+            line_surface = self.display.render_text(line, WHITE, self.display.small_font)
+            self.display.screen.blit(line_surface, line_surface.get_rect(midtop=(rects["instructions"].centerx, y)))
+            y += line_surface.get_height() + 2
 
         # Update the display
         self.display.update()
@@ -2,9 +2,14 @@
 # MalinaPet - Conversation screen
 
 import pygame
-import time
 from src.constants import *
+from src import clock
+from src.asset_bundle import load_asset
 from src.screens import ScreenType
+from src.incremental_text import IncrementalText
+from src.log import get_logger
+
+log = get_logger("screens")
 
 
 class ConversationScreen:
@@ -32,23 +37,31 @@ class ConversationScreen:
         # Load down arrow
         self.down_arrow = self.load_down_arrow()
 
-        # Generate conversation text
-        self.conversation_text = self.ai_handler.generate_fun_fact(
+        # Text area slightly smaller than bubble (5px padding on each side)
+        self.text_width = self.bubble_width - 10
+        self.text_pos = (self.bubble_pos[0] + 5, self.bubble_pos[1] + 5)
+
+        # Stream the conversation text in the background and lay it out as it arrives
+        self.conversation_text = ""
+        self.text_layout = IncrementalText(self.display.small_font, WHITE, self.text_width)
+        self.text_stream = self.ai_handler.stream_fun_fact(
             self.pet.pet_type,
             self.pet.name
         )
 
+        # Talking is playing with the pet, once per conversation
+        self.pet.play()
+
         # Remember the time we started
-        self.start_time = time.time()
+        self.start_time = clock.now()
 
     def load_down_arrow(self):
         """Load down arrow indicator"""
         try:
             arrow_path = f"{INDICATORS_PATH}/down_arrow.png"
-            image = pygame.image.load(arrow_path).convert_alpha()
-            return pygame.transform.scale(image, ARROW_SIZE)
+            return load_asset(arrow_path, ARROW_SIZE)
         except Exception as e:
-            print(f"Error loading down arrow: {e}")
+            log.error("Error loading down arrow: %s", e)
             # Create a placeholder
             arrow = pygame.Surface(ARROW_SIZE)
             arrow.fill(YELLOW)
@@ -56,20 +69,28 @@ class ConversationScreen:
 
     def update(self):
         """Update the conversation screen"""
-        # Check if pet is playing
-        self.pet.play()
+        # Add any text that has streamed in since the last frame
+        new_text = self.text_stream.read()
+        if new_text:
+            self.conversation_text += new_text
+            self.text_layout.append(new_text)
 
         # Handle joystick input
         if self.input.is_pressed("down") or self.input.is_pressed("key1"):
             # Return to main screen
-            return (ScreenType.MAIN, None)
+            return self.leave()
 
         # Check if conversation should time out
-        if time.time() - self.start_time > 30:  # 30 seconds timeout for enough time to read the message
-            return (ScreenType.MAIN, None)
+        if clock.now() - self.start_time > 30:  # 30 seconds timeout for enough time to read the message
+            return self.leave()
 
         return None
 
+    def leave(self):
+        """Go back to the main screen, ending a reply that is still streaming in"""
+        self.text_stream.cancel()
+        return (ScreenType.MAIN, None)
+
     def draw(self):
         """Draw the conversation screen"""
         # Clear the screen
@@ -84,22 +105,8 @@ class ConversationScreen:
             1  # border width
         )
 
-        # Calculate text area slightly smaller than bubble
-        text_width = self.bubble_width - 10  # 5px padding on each side
-        text_height = self.bubble_height - 10  # 5px padding on each side
-        text_x = self.bubble_pos[0] + 5
-        text_y = self.bubble_pos[1] + 5
-
-        # Render text with wrapping
-        text_surface = self.display.render_text(
-            self.conversation_text,
-            WHITE,
-            self.display.small_font,
-            max_width=text_width
-        )
-
-        # Blit text to screen
-        self.display.screen.blit(text_surface, (text_x, text_y))
+        # Draw the text received so far
+        self.text_layout.draw(self.display.screen, self.text_pos)
 
         # Draw pet
         self.pet.draw(self.display.screen, self.pet_pos[0], self.pet_pos[1])
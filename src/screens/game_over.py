@@ -4,7 +4,11 @@
 import pygame
 import os
 from src.constants import *
+from src.asset_bundle import load_asset
 from src.screens import ScreenType
+from src.log import get_logger
+
+log = get_logger("screens")
 
 class GameOverScreen:
     def __init__(self, display, input_handler, pet):
@@ -30,10 +34,9 @@ class GameOverScreen:
         """Load grave image"""
         try:
             grave_path = f"{GAME_OVER_PATH}/grave.png"
-            image = pygame.image.load(grave_path).convert_alpha()
-            return pygame.transform.scale(image, PET_SIZE)
+            return load_asset(grave_path, PET_SIZE)
         except Exception as e:
-            print(f"Error loading grave image: {e}")
+            log.error("Error loading grave image: %s", e)
             # Create a placeholder
             image = pygame.Surface(PET_SIZE)
             image.fill(GRAY)
@@ -44,10 +47,9 @@ class GameOverScreen:
         """Load left arrow indicator"""
         try:
             arrow_path = f"{INDICATORS_PATH}/left_arrow.png"
-            image = pygame.image.load(arrow_path).convert_alpha()
-            return pygame.transform.scale(image, ARROW_SIZE)
+            return load_asset(arrow_path, ARROW_SIZE)
         except Exception as e:
-            print(f"Error loading left arrow: {e}")
+            log.error("Error loading left arrow: %s", e)
             # Create a placeholder
             arrow = pygame.Surface(ARROW_SIZE)
             arrow.fill(YELLOW)
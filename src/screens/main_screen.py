@@ -6,7 +6,12 @@ import pygame
 import time
 import random
 from src.constants import *
+from src.asset_bundle import load_asset
 from src.screens import ScreenType
+from src.compositor import LayerCompositor
+from src.log import get_logger
+
+log = get_logger("screens")
 
 class MainScreen:
     def __init__(self, display, input_handler, pet):
@@ -55,11 +60,38 @@ class MainScreen:
 
         # Indicator flags
         self.show_left_arrow = True  # Always show stats arrow
-        self.show_up_arrow = False  # Only show when conversation available
+        self.show_up_arrow = self.pet.needs_conversation  # Only show when conversation available
 
         # Happiness threshold for conversation
         self.conversation_threshold = 80
 
+        # Pre-render the fixed status texts
+        self.hungry_text = self.display.render_text("Hungry!", RED, self.display.small_font)
+        self.sick_text = self.display.render_text("Sick!", RED, self.display.small_font)
+        self.sleep_text = self.display.render_text("Zzz...", BLUE, self.display.small_font)
+        need_y = self.height - 15
+        self.hungry_pos = (5, need_y)
+        self.sick_pos = (self.width - self.sick_text.get_width() - 5, need_y)
+        self.sleep_pos = (self.pet_pos[0] + PET_SIZE[0] - self.sleep_text.get_width() // 2,
+                          self.pet_pos[1] - self.sleep_text.get_height() - 5)
+
+        # Toolbar and arrows only change with the selection or conversation need,
+        # so they are baked into cached layers drawn above the pet and messes
+        self.compositor = LayerCompositor((self.width, self.height))
+        self.compositor.add_layer("toolbar", self.draw_toolbar,
+                                  key=lambda: (self.active_icon_index, self.pet.needs_conversation),
+                                  above_sprites=True)
+        self.compositor.add_layer("arrows", self.draw_arrows,
+                                  key=lambda: (self.show_left_arrow, self.show_up_arrow),
+                                  above_sprites=True)
+
+        # The up arrow follows the conversation need as it changes
+        self.pet.subscribe(self.on_need_changed, kinds=(PET_EVENT_NEED,))
+
+    def on_need_changed(self, event):
+        if event.name == "needs_conversation":
+            self.show_up_arrow = event.new
+
     def load_icons(self):
         """Load toolbar icons"""
         # We'll load the regular icons first, then conversation icon separately
@@ -71,11 +103,10 @@ class MainScreen:
         for file in regular_icon_files:
             path = os.path.join(ICONS_PATH, file)
             try:
-                image = pygame.image.load(path).convert_alpha()
-                image = pygame.transform.scale(image, ICON_SIZE)
+                image = load_asset(path, ICON_SIZE)
                 icons.append(image)
             except Exception as e:
-                print(f"Error loading icon {path}: {e}")
+                log.error("Error loading icon %s: %s", path, e)
                 # Create a placeholder
                 image = pygame.Surface(ICON_SIZE)
                 image.fill(RED)  # Red for error
@@ -84,11 +115,10 @@ class MainScreen:
         # Load conversation icon
         path = os.path.join(ICONS_PATH, conversation_icon_file)
         try:
-            conversation_image = pygame.image.load(path).convert_alpha()
-            conversation_image = pygame.transform.scale(conversation_image, ICON_SIZE)
+            conversation_image = load_asset(path, ICON_SIZE)
             self.conversation_icon = conversation_image
         except Exception as e:
-            print(f"Error loading conversation icon {path}: {e}")
+            log.error("Error loading conversation icon %s: %s", path, e)
             # Create a placeholder
             self.conversation_icon = pygame.Surface(ICON_SIZE)
             self.conversation_icon.fill(YELLOW)  # Yellow for conversation
@@ -104,11 +134,10 @@ class MainScreen:
             direction = file.split("_")[0]
             path = os.path.join(INDICATORS_PATH, file)
             try:
-                image = pygame.image.load(path).convert_alpha()
-                image = pygame.transform.scale(image, ARROW_SIZE)
+                image = load_asset(path, ARROW_SIZE)
                 arrows[direction] = image
             except Exception as e:
-                print(f"Error loading arrow {path}: {e}")
+                log.error("Error loading arrow %s: %s", path, e)
                 # Create a placeholder
                 image = pygame.Surface(ARROW_SIZE)
                 image.fill(YELLOW)  # Yellow for arrows
@@ -124,11 +153,10 @@ class MainScreen:
         for mess_type, file in mess_files.items():
             path = os.path.join(MESS_PATH, file)
             try:
-                image = pygame.image.load(path).convert_alpha()
-                image = pygame.transform.scale(image, MESS_SIZE)
+                image = load_asset(path, MESS_SIZE)
                 mess_images[mess_type] = image
             except Exception as e:
-                print(f"Error loading mess image {path}: {e}")
+                log.error("Error loading mess image %s: %s", path, e)
                 # Create a placeholder
                 image = pygame.Surface(MESS_SIZE)
                 image.fill(BROWN if mess_type == "poop" else GRAY)
@@ -137,17 +165,11 @@ class MainScreen:
         return mess_images
 
     def update(self):
-        """Update the main screen"""
-        # Update pet
-        self.pet.update()
-
+        """Update the main screen (Game.step has already updated the pet)"""
         # Check if pet is dead
         if not self.pet.is_alive():
             return (ScreenType.GAME_OVER, None)
 
-        # Update conversation status and arrow visibility
-        self.show_up_arrow = self.pet.needs_conversation
-
         # Handle screen transitions with directional joystick
         if self.input.is_pressed("left"):
             # Go to stats screen
@@ -155,96 +177,88 @@ class MainScreen:
 
         elif self.input.is_pressed("up") and self.pet.needs_conversation:
             # Go to conversation screen if needed
-            print("Going to conversation screen")
+            log.debug("Going to conversation screen")
             return (ScreenType.CONVERSATION, None)
 
         # Handle toolbar navigation with buttons instead of joystick
         if self.input.is_pressed("key1"):
             # Move selection to next icon
             self.active_icon_index = (self.active_icon_index + 1) % self.regular_icons
-            print(f"Toolbar selection: {self.active_icon_index}")
+            log.debug("Toolbar selection: %d", self.active_icon_index)
 
         # Handle icon activation with Key2
         if self.input.is_pressed("key2"):
             # Activate the current icon
             if self.active_icon_index == 0:  # Eat
                 self.pet.eat()
-                print("Action: Feed pet")
+                log.debug("Action: Feed pet")
             elif self.active_icon_index == 1:  # Sleep
                 if self.pet.state == STATE_SLEEPING:
                     self.pet.wake()
-                    print("Action: Wake pet")
+                    log.debug("Action: Wake pet")
                 else:
                     self.pet.sleep()
-                    print("Action: Pet sleeps")
+                    log.debug("Action: Pet sleeps")
             elif self.active_icon_index == 2:  # Clean
                 self.pet.clean()
-                print("Action: Clean messes")
+                log.debug("Action: Clean messes")
             elif self.active_icon_index == 3:  # Heal
                 self.pet.heal()
-                print("Action: Heal pet")
+                log.debug("Action: Heal pet")
 
         return None
 
-    def draw(self):
-        """Draw the main screen"""
-        # Clear the screen
-        self.display.clear()
-
-        # Draw pet
-        self.pet.draw(self.display.screen, self.pet_pos[0], self.pet_pos[1])
-
-        # Draw messes
-        for i, (x, y) in enumerate(self.pet.mess_positions):
-            mess_type = self.pet.mess_types[i]
-            mess_image = self.mess_images.get(mess_type, self.mess_images["poop"])  # Default to poop if type not found
-            self.display.screen.blit(mess_image, (x, y))
-
+    def draw_toolbar(self, surface):
+        """Draw the toolbar icons onto a layer surface"""
         # Draw toolbar icons (spread across the top)
         for i, (x, y) in enumerate(self.icon_positions):
             # Draw icon
-            self.display.screen.blit(self.icons[i], (x, y))
+            surface.blit(self.icons[i], (x, y))
 
             # Draw highlight around active icon
             if i == self.active_icon_index:
-                pygame.draw.rect(self.display.screen, WHITE,
+                pygame.draw.rect(surface, WHITE,
                                  (x - 2, y - 2, ICON_SIZE[0] + 4, ICON_SIZE[1] + 4), 1)
 
         # Draw conversation icon if happiness is low enough
         if self.pet.needs_conversation:
-            self.display.screen.blit(self.conversation_icon, self.conversation_icon_pos)
+            surface.blit(self.conversation_icon, self.conversation_icon_pos)
 
-        # Draw indicators
+    def draw_arrows(self, surface):
+        """Draw the arrow indicators onto a layer surface"""
         if self.show_left_arrow and "left" in self.arrows:
             arrow_x = 5
             arrow_y = self.height // 2 - ARROW_SIZE[1] // 2
-            self.display.screen.blit(self.arrows["left"], (arrow_x, arrow_y))
+            surface.blit(self.arrows["left"], (arrow_x, arrow_y))
 
         if self.show_up_arrow and "up" in self.arrows:
             arrow_x = self.width // 2 - ARROW_SIZE[0] // 2
             arrow_y = self.conversation_icon_pos[1] + ICON_SIZE[1] + 5  # Below conversation icon
-            self.display.screen.blit(self.arrows["up"], (arrow_x, arrow_y))
+            surface.blit(self.arrows["up"], (arrow_x, arrow_y))
+
+    def draw(self):
+        """Draw the main screen"""
+        # Dynamic sprites: pet, messes and status texts
+        sprites = [(self.pet.image, self.pet_pos)]
+
+        for i, (x, y) in enumerate(self.pet.mess_positions):
+            mess_type = self.pet.mess_types[i]
+            mess_image = self.mess_images.get(mess_type, self.mess_images["poop"])  # Default to poop if type not found
+            sprites.append((mess_image, (x, y)))
 
         # Draw pet needs indicators
-        need_y = self.height - 15
         if self.pet.needs_feeding:
-            text = "Hungry!"
-            text_surface = self.display.render_text(text, RED, self.display.small_font)
-            self.display.screen.blit(text_surface, (5, need_y))
+            sprites.append((self.hungry_text, self.hungry_pos))
 
         if self.pet.needs_healing:
-            text = "Sick!"
-            text_surface = self.display.render_text(text, RED, self.display.small_font)
-            text_x = self.width - text_surface.get_width() - 5
-            self.display.screen.blit(text_surface, (text_x, need_y))
+            sprites.append((self.sick_text, self.sick_pos))
 
         # Draw pet state indicators if needed
         if self.pet.state == STATE_SLEEPING:
-            text = "Zzz..."
-            text_surface = self.display.render_text(text, BLUE, self.display.small_font)
-            text_x = self.pet_pos[0] + PET_SIZE[0] - text_surface.get_width() // 2
-            text_y = self.pet_pos[1] - text_surface.get_height() - 5
-            self.display.screen.blit(text_surface, (text_x, text_y))
+            sprites.append((self.sleep_text, self.sleep_pos))
+
+        # Background, one batch of sprites, then the cached toolbar and arrows
+        self.compositor.draw(self.display.screen, sprites)
 
         # Update the display
         self.display.update()
@@ -3,7 +3,12 @@
 
 import pygame
 from src.constants import *
+from src.asset_bundle import load_asset
 from src.screens import ScreenType
+from src.layout import Layout, Anchor, Column, Grid, Box, Text
+from src.log import get_logger
+
+log = get_logger("screens")
 
 
 class StatsScreen:
@@ -19,14 +24,43 @@ class StatsScreen:
         # Load right arrow indicator
         self.right_arrow = self.load_right_arrow()
 
+        # Pages: current stat bars, or sparklines from the stat history
+        self.page = STATS_PAGE_BARS
+        self.history_level = 0
+
+        # Sparkline page surface, cached until new samples arrive
+        self.graph_surface = None
+        self.graph_key = None
+
+        # Bars page surface, cached until a stat changes or the age ticks over
+        self.bars_surface = None
+        self.bars_key = None
+        self.stats_version = 0
+        self.pet.subscribe(self.on_stat_changed, kinds=(PET_EVENT_STAT,))
+
+        # Name and age at the top, then a table of stat names and bars below
+        stat_cells = []
+        for stat_name in self.pet.stats:
+            stat_cells.append(Text(self.stat_label(stat_name), "small_font", name=f"label:{stat_name}"))
+            stat_cells.append(Box(STATS_BAR_WIDTH, STATS_BAR_HEIGHT, name=f"bar:{stat_name}"))
+        self.bars_layout = Layout(
+            Anchor(Column([
+                Column([Text(f"Name: {self.pet.name}", name="name"),
+                        Text("Age: 0 hours", "small_font", name="age")], spacing=2),
+                Grid(stat_cells, columns=2, spacing=(10, STATS_BAR_SPACING), align="midleft")
+            ], spacing=8), "midtop", margin=6)
+        )
+
+    def on_stat_changed(self, event):
+        self.stats_version += 1
+
     def load_right_arrow(self):
         """Load right arrow indicator"""
         try:
             arrow_path = f"{INDICATORS_PATH}/right_arrow.png"
-            image = pygame.image.load(arrow_path).convert_alpha()
-            return pygame.transform.scale(image, ARROW_SIZE)
+            return load_asset(arrow_path, ARROW_SIZE)
         except Exception as e:
-            print(f"Error loading right arrow: {e}")
+            log.error("Error loading right arrow: %s", e)
             # Create a placeholder
             arrow = pygame.Surface(ARROW_SIZE)
             arrow.fill(YELLOW)
@@ -43,75 +77,74 @@ class StatsScreen:
             # Return to main screen
             return (ScreenType.MAIN, None)
 
+        # Flip between the bars and the history graphs
+        if self.input.is_pressed("up") or self.input.is_pressed("down"):
+            self.page = STATS_PAGE_GRAPHS if self.page == STATS_PAGE_BARS else STATS_PAGE_BARS
+
+        # Cycle the history resolution on the graphs page
+        if self.page == STATS_PAGE_GRAPHS and self.input.is_pressed("key2"):
+            self.history_level = (self.history_level + 1) % len(STAT_HISTORY_LEVELS)
+
         return None
 
+    def get_graph_surface(self):
+        """Get the sparkline page, re-rendering it only when the history changed"""
+        key = (self.pet.history.version, self.history_level)
+        if self.graph_surface is None or key != self.graph_key:
+            self.graph_surface = self.render_graphs()
+            self.graph_key = key
+        return self.graph_surface
+
+    def render_graphs(self):
+        """Render a sparkline of each stat's history"""
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(BLACK)
+
+        title = self.display.render_text(f"History {STAT_HISTORY_LABELS[self.history_level]}",
+                                         WHITE, self.display.small_font)
+        surface.blit(title, ((self.width - title.get_width()) // 2, 2))
+
+        stat_names = self.pet.history.stat_names
+        top = title.get_height() + 6
+        row_height = (self.height - top) // len(stat_names)
+        graph_x = 5
+        graph_width = self.width - ARROW_SIZE[0] - 15
+        graph_height = row_height - 12
+
+        for i, stat_name in enumerate(stat_names):
+            row_y = top + i * row_height
+
+            # Stat name above its graph
+            display_name = "Happy" if stat_name == "Happiness" else stat_name
+            label = self.display.render_text(display_name, LIGHT_GRAY, self.display.small_font)
+            surface.blit(label, (graph_x, row_y))
+            graph_y = row_y + 10
+
+            pygame.draw.rect(surface, DARK_GRAY, (graph_x, graph_y, graph_width, graph_height), 1)
+
+            # One pixel per point, newest on the right
+            values = self.pet.history.series(stat_name, self.history_level, graph_width - 2)
+            if not values:
+                continue
+            start_x = graph_x + graph_width - 1 - len(values)
+            points = [(start_x + j, graph_y + graph_height - 2 - value * (graph_height - 3) // MAX_STAT)
+                      for j, value in enumerate(values)]
+            if len(points) > 1:
+                pygame.draw.lines(surface, GREEN, False, points)
+            else:
+                surface.set_at(points[0], GREEN)
+
+        return surface.convert()
+
     def draw(self):
         """Draw the stats screen"""
         # Clear the screen
         self.display.clear()
 
-        # Draw pet name and age
-        name_text = f"Name: {self.pet.name}"
-        name_surface = self.display.render_text(name_text, WHITE)
-        name_x = (self.width - name_surface.get_width()) // 2
-        name_y = 10
-        self.display.screen.blit(name_surface, (name_x, name_y))
-
-        # Draw pet age (smaller font)
-        age_text = f"Age: {self.pet.get_age()}"
-        age_surface = self.display.render_text(age_text, WHITE, self.display.small_font)
-        age_x = (self.width - age_surface.get_width()) // 2
-        age_y = name_y + name_surface.get_height() + 2
-        self.display.screen.blit(age_surface, (age_x, age_y))
-
-        # Draw stat bars
-        stats = self.pet.get_stats()
-
-        # Calculate positions
-        bar_width = 70  # Increased bar width
-        bar_height = 12  # Slightly taller bar
-
-        # Determine the maximum width of stat name labels for centering
-        stat_labels = []
-        for stat_name in stats.keys():
-            display_name = "Happy" if stat_name == "Happiness" else stat_name
-            stat_labels.append(f"{display_name}:")
-
-        # Render stat names and get their widths
-        max_label_width = max(
-            self.display.render_text(label, WHITE, self.display.small_font).get_width()
-            for label in stat_labels
-        )
-
-        # Calculate total height of stats area
-        stat_bar_spacing = 20  # Increased spacing between stats
-        total_stats_height = len(stats) * bar_height + (len(stats) - 1) * stat_bar_spacing
-
-        # Calculate starting vertical position to center stats
-        stat_bar_y_start = (self.height - total_stats_height) // 2
-
-        # Calculate starting horizontal positions
-        stat_name_x = (self.width - (max_label_width + 10 + bar_width)) // 2
-        stat_bar_x = stat_name_x + max_label_width + 10
-
-        for i, (stat_name, stat_value) in enumerate(stats.items()):
-            # Shorten "Happiness" if it doesn't fit
-            display_name = "Happy" if stat_name == "Happiness" else stat_name
-
-            # Draw stat name
-            stat_surface = self.display.render_text(f"{display_name}:", WHITE, self.display.small_font)
-            stat_y = stat_bar_y_start + i * (bar_height + stat_bar_spacing)
-            self.display.screen.blit(stat_surface, (stat_name_x, stat_y))
-
-            # Draw stat bar with more visible segments
-            self.display.draw_stat_bar(
-                stat_bar_x,
-                stat_y,
-                stat_value,
-                MAX_STAT,
-                bar_width,
-                bar_height
-            )
+        if self.page == STATS_PAGE_GRAPHS:
+            self.display.screen.blit(self.get_graph_surface(), (0, 0))
+        else:
+            self.display.screen.blit(self.get_bars_surface(), (0, 0))
 
         # Draw right arrow indicator
         if self.right_arrow:
@@ -120,4 +153,39 @@ class StatsScreen:
             self.display.screen.blit(self.right_arrow, (arrow_x, arrow_y))
 
         # Update the display
-        self.display.update()  # !/usr/bin/env python3
\ No newline at end of file
+        self.display.update()
+
+    def get_bars_surface(self):
+        """Get the bars page, re-rendering it only when a stat or the age text changed"""
+        key = (self.stats_version, self.pet.get_age())
+        if self.bars_surface is None or key != self.bars_key:
+            self.bars_surface = self.render_bars(key[1])
+            self.bars_key = key
+        return self.bars_surface
+
+    def render_bars(self, age):
+        """Render the name, age and current stat bars"""
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(BLACK)
+        rects = self.bars_layout.resolve(self.display)
+
+        # Draw pet name and age (smaller font)
+        name_surface = self.display.render_text(f"Name: {self.pet.name}", WHITE)
+        surface.blit(name_surface, rects["name"])
+        age_surface = self.display.render_text(f"Age: {age}", WHITE, self.display.small_font)
+        surface.blit(age_surface, age_surface.get_rect(midtop=rects["age"].midtop))
+
+        # Draw stat names and bars with more visible segments
+        for stat_name, stat_value in self.pet.stats.items():
+            stat_surface = self.display.render_text(self.stat_label(stat_name), WHITE, self.display.small_font)
+            surface.blit(stat_surface, rects[f"label:{stat_name}"])
+            bar = rects[f"bar:{stat_name}"]
+            self.display.draw_stat_bar(bar.x, bar.y, stat_value, MAX_STAT, bar.width, bar.height,
+                                       surface=surface)
+
+        return surface.convert()
+
+    def stat_label(self, stat_name):
+        # Shorten "Happiness" so it fits
+        display_name = "Happy" if stat_name == "Happiness" else stat_name
+        return f"{display_name}:"
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# MalinaPet - Compact binary recording of input and RNG seeds for replays
+#
+# File layout: a header, then records of a one byte type and a payload:
+#     F  frame run   <HH  frame interval in ms, number of frames
+#     G  long frame  <I   interval in ms of a single frame too long for a run
+#     P  press       <B   button index (applies to the latest frame)
+#     R  release     <B   button index (applies to the latest frame)
+#     S  seed        <Q   seed handed to a new random generator (e.g. a Pet's)
+#     A  AI state    <B   AI availability as the UI saw it (from the latest frame)
+#     T  AI result   <BH  result kind index and length, then the UTF-8 text
+
+import random
+import struct
+from src import clock
+
+SESSION_MAGIC = b"MPREC\0"
+SESSION_VERSION = 2
+SESSION_HEADER = struct.Struct("<6sHQd")  # magic, version, global seed, start time
+FRAME_RUN = struct.Struct("<HH")
+LONG_FRAME = struct.Struct("<I")
+BUTTON = struct.Struct("<B")
+SEED = struct.Struct("<Q")
+FLAG = struct.Struct("<B")
+AI_RESULT = struct.Struct("<BH")
+
+BUTTON_NAMES = ["up", "down", "left", "right", "press", "key1", "key2", "key3"]
+BUTTON_INDEX = {name: i for i, name in enumerate(BUTTON_NAMES)}
+
+# AI results a replay can't reproduce: pet names, AI pet types and conversation text
+AI_RESULT_KINDS = ["name", "pet", "text"]
+AI_RESULT_INDEX = {kind: i for i, kind in enumerate(AI_RESULT_KINDS)}
+
+_seed_hook = None
+
+
+def next_seed():
+    """Get a seed for a new random generator, recorded or replayed if a session is active"""
+    if _seed_hook is not None:
+        return _seed_hook()
+    return random.getrandbits(64)
+
+
+def set_seed_hook(hook):
+    global _seed_hook
+    _seed_hook = hook
+
+
+class SessionRecorder:
+    def __init__(self, path, seed=None):
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        random.seed(self.seed)
+
+        self.file = open(path, 'wb')
+        self.file.write(SESSION_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, self.seed, clock.now()))
+
+        # Frames with the same interval are run-length encoded
+        self.last_time = None
+        self.run_delta = 0
+        self.run_count = 0
+
+        self.ai_was_available = None
+
+        set_seed_hook(self.record_seed)
+
+    def frame(self, now):
+        """Record the start of a frame"""
+        delta = 0 if self.last_time is None else max(0, round((now - self.last_time) * 1000))
+        self.last_time = now
+        if delta > 65535:
+            # e.g. a frame that slept with the backlight off
+            self.flush_run()
+            self.file.write(b"G" + LONG_FRAME.pack(min(delta, 0xFFFFFFFF)))
+        elif self.run_count and delta == self.run_delta and self.run_count < 65535:
+            self.run_count += 1
+        else:
+            self.flush_run()
+            self.run_delta = delta
+            self.run_count = 1
+
+    def flush_run(self):
+        if self.run_count:
+            self.file.write(b"F" + FRAME_RUN.pack(self.run_delta, self.run_count))
+            self.run_count = 0
+
+    def button(self, name, pressed):
+        """Record a button press or release on the current frame"""
+        # Close the run so the event is attached to the frame it happened in
+        self.flush_run()
+        self.file.write((b"P" if pressed else b"R") + BUTTON.pack(BUTTON_INDEX[name]))
+
+    def ai_available(self, available):
+        """Record the AI availability the UI saw on the current frame, when it changes"""
+        if available == self.ai_was_available:
+            return
+        self.ai_was_available = available
+        self.flush_run()
+        self.file.write(b"A" + FLAG.pack(available))
+
+    def ai_result(self, kind, text):
+        """Record an AI result handed to the game on the current frame"""
+        data = text.encode('utf-8')[:65535]
+        self.flush_run()
+        self.file.write(b"T" + AI_RESULT.pack(AI_RESULT_INDEX[kind], len(data)) + data)
+
+    def record_seed(self):
+        seed = random.getrandbits(64)
+        self.flush_run()
+        self.file.write(b"S" + SEED.pack(seed))
+        return seed
+
+    def close(self):
+        self.flush_run()
+        self.file.close()
+        set_seed_hook(None)
+
+
+def load_session(path):
+    """Read a recording into (global seed, start time, frames, seeds).
+
+    Each frame is (interval in seconds, [(button, pressed), ...], AI events),
+    where AI events are ("available", flag) or (result kind, text).
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, seed, start_time = SESSION_HEADER.unpack_from(data, 0)
+    if magic != SESSION_MAGIC or version != SESSION_VERSION:
+        raise ValueError(f"{path} is not a MalinaPet session recording")
+
+    frames = []
+    seeds = []
+    offset = SESSION_HEADER.size
+    while offset < len(data):
+        kind = data[offset:offset + 1]
+        offset += 1
+        if kind == b"F":
+            delta, count = FRAME_RUN.unpack_from(data, offset)
+            offset += FRAME_RUN.size
+            frames.extend((delta / 1000, [], []) for _ in range(count))
+        elif kind == b"G":
+            (delta,) = LONG_FRAME.unpack_from(data, offset)
+            offset += LONG_FRAME.size
+            frames.append((delta / 1000, [], []))
+        elif kind in (b"P", b"R"):
+            (index,) = BUTTON.unpack_from(data, offset)
+            offset += BUTTON.size
+            if frames:
+                frames[-1][1].append((BUTTON_NAMES[index], kind == b"P"))
+        elif kind == b"S":
+            (pet_seed,) = SEED.unpack_from(data, offset)
+            offset += SEED.size
+            seeds.append(pet_seed)
+        elif kind == b"A":
+            (available,) = FLAG.unpack_from(data, offset)
+            offset += FLAG.size
+            if frames:
+                frames[-1][2].append(("available", bool(available)))
+        elif kind == b"T":
+            index, length = AI_RESULT.unpack_from(data, offset)
+            offset += AI_RESULT.size
+            text = data[offset:offset + length].decode('utf-8', 'ignore')
+            offset += length
+            if frames:
+                frames[-1][2].append((AI_RESULT_KINDS[index], text))
+        else:
+            raise ValueError(f"Unknown record type {kind!r} in {path}")
+
+    return seed, start_time, frames, seeds
+
+
+class ReplayInput:
+    """Stands in for InputHandler, reproducing recorded button states"""
+
+    def __init__(self):
+        self.button_states = {button: False for button in BUTTON_NAMES}
+
+    def apply(self, events):
+        """Apply the presses and releases recorded for a frame"""
+        for button, pressed in events:
+            self.button_states[button] = pressed
+
+    def update(self):
+        return not self.button_states["key3"]
+
+    def is_pressed(self, button):
+        return self.button_states.get(button, False)
+
+    def get_input_state(self):
+        return self.button_states.copy()
+
+    def cleanup(self):
+        pass
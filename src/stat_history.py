@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# MalinaPet - Fixed-memory stat history (round-robin archive)
+
+from array import array
+from src.constants import *
+
+
+class RingBuffer:
+    """Preallocated ring of byte-sized samples (stats are 0-100)"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = array('B', bytes(capacity))
+        self.head = 0  # Next slot to write
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self, limit=None):
+        """Get up to limit of the newest samples, oldest first"""
+        count = self.count if limit is None else min(limit, self.count)
+        start = (self.head - count) % self.capacity
+        if start + count <= self.capacity:
+            return self.data[start:start + count].tolist()
+        return (self.data[start:] + self.data[:self.head]).tolist()
+
+    def __len__(self):
+        return self.count
+
+
+class StatHistory:
+    """Time series of each stat, sampled on every stat decrease tick.
+
+    Like a round-robin database, each archive level keeps a fixed number of
+    points, and coarser levels store the average of several raw samples. With
+    the default STAT_HISTORY_LEVELS a week of history takes under 3 KB.
+    """
+
+    def __init__(self, stat_names, levels=STAT_HISTORY_LEVELS):
+        self.stat_names = list(stat_names)
+        self.levels = levels  # (samples per point, number of points) per level
+        self.buffers = {stat: [RingBuffer(points) for _, points in levels] for stat in self.stat_names}
+        self.sums = {stat: [0] * len(levels) for stat in self.stat_names}
+        self.samples = 0
+        self.version = 0  # Changes whenever new samples are recorded
+
+    def record(self, stats):
+        """Add one sample of every stat and roll it up into the coarser levels"""
+        self.samples += 1
+        for stat in self.stat_names:
+            value = int(stats[stat])
+            buffers = self.buffers[stat]
+            sums = self.sums[stat]
+            for level, (step, _) in enumerate(self.levels):
+                sums[level] += value
+                if self.samples % step == 0:
+                    buffers[level].append(round(sums[level] / step))
+                    sums[level] = 0
+        self.version += 1
+
+    def series(self, stat, level=0, limit=None):
+        """Get the newest points of a stat at one archive level, oldest first"""
+        return self.buffers[stat][level].values(limit)
+
+    def span_seconds(self, level):
+        """Get how much time a full level covers"""
+        step, points = self.levels[level]
+        return step * points * STATS_DECREASE_INTERVAL
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# MalinaPet - Local stand-in for the pet state collector
+#
+# Accepts gzipped batches from PetSyncAgent and counts what arrived:
+#     python -m src.sync_collector --port 8768 --error-rate 0.2
+# Compare batch sizes for throughput, bytes on the wire and delivery latency:
+#     python -m src.sync_collector --tradeoff --rate 200 --duration 5
+
+import json
+import gzip
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.constants import *
+from src.instrumentation import percentile
+from src.pet_sync import PetSyncAgent
+
+
+class CollectorStats:
+    def __init__(self, error_rate=0.0):
+        self.error_rate = error_rate  # Fraction of posts rejected, like a flaky link
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.deltas = 0
+        self.bytes = 0
+        self.rejected = 0
+        self.latencies = []  # Capture to arrival, per delta
+        self.pets = {}  # Latest known state per pet
+
+    def summary(self):
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "deltas": self.deltas,
+                "bytes": self.bytes,
+                "rejected": self.rejected,
+                "pets": len(self.pets),
+                "latency_p50": round(percentile(self.latencies, 0.5), 3) if self.latencies else None,
+                "latency_p95": round(percentile(self.latencies, 0.95), 3) if self.latencies else None
+            }
+
+
+class CollectorRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(200, self.server.stats.summary())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        stats = self.server.stats
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if random.random() < stats.error_rate:
+            with stats.lock:
+                stats.rejected += 1
+            self.send_json(503, {"error": "collector unavailable"})
+            return
+
+        try:
+            if self.headers.get("Content-Encoding") == "gzip":
+                data = gzip.decompress(body)
+            else:
+                data = body
+            batch = json.loads(data)
+        except (OSError, ValueError):
+            self.send_json(400, {"error": "bad batch"})
+            return
+
+        now = time.time()
+        with stats.lock:
+            stats.batches += 1
+            stats.bytes += len(body)
+            for delta in batch["deltas"]:
+                stats.deltas += 1
+                stats.latencies.append(now - delta["t"])
+                stats.pets.setdefault((batch["device"], delta["pet"]), {}).update(delta["changes"])
+        self.send_json(200, {"ok": True})
+
+
+def start_collector(stats, host=SYNC_COLLECTOR_HOST, port=SYNC_COLLECTOR_PORT):
+    """Run a collector on a background thread (port 0 picks a free port)"""
+    server = ThreadingHTTPServer((host, port), CollectorRequestHandler)
+    server.daemon_threads = True
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, name="sync-collector", daemon=True).start()
+    return server
+
+
+def run_tradeoff(batch_sizes, rate, duration, error_rate=0.0, flush_interval=SYNC_FLUSH_INTERVAL):
+    """Feed synthetic deltas through agents with different batch sizes"""
+    print(f"{'batch':>6} {'deltas':>7} {'posts':>6} {'bytes':>8} {'B/delta':>8} {'p50 s':>7} {'p95 s':>7}")
+    for batch_size in batch_sizes:
+        stats = CollectorStats(error_rate)
+        server = start_collector(stats, port=0)
+        queue_path = tempfile.mkdtemp(prefix="malinapet-sync-")
+        agent = PetSyncAgent(f"http://{SYNC_COLLECTOR_HOST}:{server.server_address[1]}/batches",
+                             queue_path, batch_size, flush_interval, device="bench")
+        agent.start()
+
+        # Deltas like a busy pet's: a stat or two changing at a time
+        start = time.time()
+        sent = 0
+        while time.time() - start < duration:
+            stat = random.choice([STAT_HUNGER, STAT_HAPPINESS, STAT_ENERGY, STAT_HEALTH])
+            agent.add_delta(f"Cat/Tami{sent % 20}/0", {stat: random.randint(0, MAX_STAT)}, time.time())
+            sent += 1
+            time.sleep(max(0.0, start + sent / rate - time.time()))
+
+        agent.stop()
+        agent.send_queued(ignore_backoff=True)
+        server.shutdown()
+        shutil.rmtree(queue_path, ignore_errors=True)
+
+        summary = stats.summary()
+        per_delta = summary["bytes"] / max(1, summary["deltas"])
+        print(f"{batch_size:>6} {summary['deltas']:>7} {summary['batches']:>6} {summary['bytes']:>8} "
+              f"{per_delta:>8.1f} {summary['latency_p50']!s:>7} {summary['latency_p95']!s:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local pet state collector")
+    parser.add_argument("--host", default=SYNC_COLLECTOR_HOST)
+    parser.add_argument("--port", type=int, default=SYNC_COLLECTOR_PORT)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tradeoff", action="store_true", help="Compare batch sizes instead of serving")
+    parser.add_argument("--batch-sizes", default="1,10,50,200")
+    parser.add_argument("--rate", type=float, default=100, help="Deltas per second for --tradeoff")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--flush-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.tradeoff:
+        run_tradeoff([int(size) for size in args.batch_sizes.split(",")], args.rate, args.duration,
+                     args.error_rate, args.flush_interval)
+        return
+
+    stats = CollectorStats(args.error_rate)
+    server = start_collector(stats, args.host, args.port)
+    print(f"Collector listening on {args.host}:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"Collector: {stats.summary()}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
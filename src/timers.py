@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# MalinaPet - Priority queue of named deadlines
+
+import heapq
+import itertools
+
+
+class TimerQueue:
+    """Heap of (due, key) deadlines where each key has at most one live deadline.
+
+    Rescheduling or cancelling a key leaves its old heap entry behind as stale;
+    stale entries are skipped when they reach the top, so no operation has to
+    search the heap.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.due = {}
+        self.sequence = itertools.count()
+
+    def schedule(self, key, due):
+        """Set when a key is due, replacing any earlier deadline for it"""
+        self.due[key] = due
+        heapq.heappush(self.heap, (due, next(self.sequence), key))
+
+    def cancel(self, key):
+        self.due.pop(key, None)
+
+    def _drop_stale(self):
+        while self.heap and self.due.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def next_deadline(self):
+        """Get the earliest deadline, or None if nothing is scheduled"""
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        """Remove and yield (key, due) for each deadline before now, earliest first.
+
+        Keys rescheduled while iterating are yielded again if they are still due.
+        """
+        while True:
+            self._drop_stale()
+            if not self.heap or self.heap[0][0] >= now:
+                return
+            due, _, key = heapq.heappop(self.heap)
+            del self.due[key]
+            yield key, due
+
+    def __len__(self):
+        return len(self.due)